@@ -1,23 +1,143 @@
-import os
+import time
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import APIRouter, HTTPException, status
-from fastapi import Request, File, Form, UploadFile
-from fastapi.responses import JSONResponse
-from typing import Optional
+from fastapi import Depends, Request, Response, File, Form, UploadFile
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, StreamingResponse
+from typing import Iterator, Optional
 from pathlib import Path
 from app.services.chatbot import   get_agent
-# from app.services.resume import extract_resume_info
-from app.utils.file import extract_file_content
+from app.services.agent_runner import AgentRunner, AgentBusyError
+from app.services.llm_handler import get_settings, llm_handler
+from app.services.session import Session, SessionStore, SESSION_COOKIE, SESSION_HEADER, use_session
+from app.services.compiler import CompileJob, CompileQueueFullError, DONE, get_compile_service
+from app.services.resume import resume_to_latex
+from app.services.streaming import StreamingCallbackHandler, format_sse
+from app.services.pipeline import optimize_resume
+from app.services.command_router import command_router
+from app.services.uploads import UploadTooLargeError, find_upload, save_upload
+from app.services.document_parser import get_document_parser
+from app.services.ingestion import RESUME_SUFFIXES, ResumeIngestionError, ingest_resume
+from app.services.extraction_cache import get_extraction_cache
+from app.services.llm_cache import get_analysis_cache
+from app.services.pdf_cache import get_pdf_cache
+from app.services.metrics import metrics
+from app.services.tracing import AgentMetricsHandler, logger, span
+from app.services.warmup import WarmupState, run_warmup
 
 
 
-router = APIRouter(tags=["api"])
+settings = get_settings()
+session_store = SessionStore(
+    agent_factory=get_agent,
+    history_factory=llm_handler.new_history,
+    ttl_seconds=settings.session_ttl_seconds,
+    max_sessions=settings.session_max_count,
+    max_bytes=settings.session_max_bytes,
+    max_resume_versions=settings.session_max_resume_versions
+)
+agent_runner = AgentRunner(
+    max_concurrency=settings.agent_max_concurrency,
+    max_queue=settings.agent_max_queue,
+    retry_after=settings.agent_retry_after_seconds
+)
 
 
-agent = get_agent()
+compile_service = get_compile_service()
+warmup_state = WarmupState()
+
+
+# Components that keep their own counters are read when /api/metrics is scraped
+metrics.register_stats("pdf_cache", "Rendered PDF cache", lambda: get_pdf_cache().stats())
+metrics.register_stats("llm_cache", "Job analysis response cache", lambda: get_analysis_cache() and get_analysis_cache().stats())
+metrics.register_stats("extraction_cache", "Document text extraction cache", lambda: get_extraction_cache().stats())
+metrics.register_stats("router", "Fast-path command router", command_router.get_stats)
+metrics.register_stats("parser", "Document parser pool", lambda: get_document_parser().stats())
+metrics.register_stats("sessions", "Session store", lambda: {"active": len(session_store), "bytes": session_store.total_bytes})
+metrics.register_stats("warmup", "Startup warm-up", warmup_state.stats)
+metrics.register_stats("agent_runner", "Agent runner", lambda: {"pending": agent_runner.pending, "queued": agent_runner.queued})
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await compile_service.start()
+    warmup = None
+    if settings.warmup_enabled:
+        # Warm up in the background: /api/health answers now, /api/ready once this is done
+        warmup = asyncio.create_task(run_warmup(warmup_state))
+    else:
+        warmup_state.started_at = warmup_state.finished_at = time.time()
+    yield
+    if warmup is not None:
+        warmup.cancel()
+        # Wait for the cancellation to land so nothing is left unretrieved
+        await asyncio.gather(warmup, return_exceptions=True)
+    await compile_service.stop()
+    agent_runner.shutdown()
+    get_document_parser().shutdown()
+
+
+router = APIRouter(tags=["api"], lifespan=lifespan)
+
+
+def get_session(request: Request, response: Response) -> Iterator[Session]:
+    """
+    Resolve the caller's session from the session header or cookie, creating one if needed.
+    Its size is re-measured once the endpoint is done with it.
+    """
+    session_id = request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE)
+    session = session_store.get_or_create(session_id)
+    _attach_session(response, session)
+    try:
+        yield session
+    finally:
+        session_store.update_size(session)
+
+
+def _attach_session(response: Response, session: Session) -> Response:
+    # Responses returned directly from an endpoint don't inherit get_session's headers
+    response.headers[SESSION_HEADER] = session.session_id
+    response.set_cookie(SESSION_COOKIE, session.session_id, httponly=True, samesite="lax")
+    return response
+
+
+def _run_agent(session: Session, user_message: str, callbacks: Optional[list] = None) -> str:
+    # One agent run per session at a time keeps its resume and memory consistent
+    with session.lock, span("agent_run"):
+        return session.agent.run({"input": user_message}, callbacks=[AgentMetricsHandler(), *(callbacks or [])])
+
+
+async def _run_serialized(session: Session, func, *args):
+    # A session's runs queue here rather than on session.lock inside a runner thread,
+    # so one busy session can't tie up several workers that only wait on its lock
+    async with session.agent_lock:
+        return await agent_runner.run(func, session, *args)
+
+
+def _run_fast_path(session: Session, user_message: str) -> Optional[str]:
+    with session.lock:
+        response = command_router.dispatch(user_message, session.resume)
+        if response is not None and session.memory is not None:
+            # Keep the agent's memory aware of edits that bypassed it
+            session.memory.save_context({"input": user_message}, {"output": response})
+        return response
+
+
+def _run_optimization(session: Session, job_description: str):
+    with session.lock:
+        return optimize_resume(session, job_description)
+
+
+def _busy_response(retry_after: int) -> JSONResponse:
+    return JSONResponse(
+        {"error": "Agent is busy, please retry later"},
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": str(retry_after)}
+    )
 
 # Create uploads directory if it doesn't exist
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+UPLOAD_DIR = Path(settings.upload_dir)
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 
 
@@ -29,57 +149,296 @@ async def health_check():
     return {"status": "ok"}
 
 
+@router.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe: 503 until the startup warm-up has finished, so load balancers
+    only route traffic to warm workers. A worker whose warm-up steps failed or timed
+    out still takes traffic but reports "degraded". /api/health stays a plain liveness
+    check.
+    """
+    body = {"status": warmup_state.status, "warmup": warmup_state.to_dict()}
+    if not warmup_state.ready:
+        return JSONResponse(body, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return body
+
+
 @router.post("/chat")
-async def chat_endpoint(request: Request):
+async def chat_endpoint(request: Request, session: Session = Depends(get_session)):
     data = await request.json()
     user_message = data.get("message", "").strip()
     if not user_message:
         return JSONResponse({"error": "Empty message"}, status_code=400)
-    # Send user message to agent and get response
-    response = agent.run({"input": user_message})
+    with use_session(session):
+        # Simple edit commands skip the agent entirely
+        response = await asyncio.to_thread(_run_fast_path, session, user_message)
+    if response is not None:
+        return {"response": response}
+
+    # Send user message to agent off the event loop and get response
+    try:
+        with use_session(session):
+            response = await _run_serialized(session, _run_agent, user_message)
+    except AgentBusyError as e:
+        return _busy_response(e.retry_after)
 
     return {"response": response}
 
 
+@router.post("/chat/stream")
+async def chat_stream_endpoint(request: Request, session: Session = Depends(get_session)):
+    """
+    Chat with the agent, streaming progress as Server-Sent Events.
+
+    Emits `status`, `tool` and `token` events while the agent works, then a single
+    `final` event with the full response (or an `error` event).
+    """
+    data = await request.json()
+    user_message = data.get("message", "").strip()
+    if not user_message:
+        return JSONResponse({"error": "Empty message"}, status_code=400)
+
+    with use_session(session):
+        # Simple edit commands skip the agent entirely
+        fast_response = await asyncio.to_thread(_run_fast_path, session, user_message)
+    if fast_response is not None:
+        async def fast_stream():
+            yield format_sse("final", {"response": fast_response})
+        return _attach_session(StreamingResponse(fast_stream(), media_type="text/event-stream"), session)
+
+    if agent_runner.full:
+        return _busy_response(agent_runner.retry_after)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    handler = StreamingCallbackHandler(asyncio.get_running_loop(), queue)
+    with use_session(session):
+        run = asyncio.ensure_future(_run_serialized(session, _run_agent, user_message, [handler]))
+
+    async def event_stream():
+        yield format_sse("status", "Thinking...")
+        while not run.done():
+            next_event = asyncio.ensure_future(queue.get())
+            await asyncio.wait({next_event, run}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event.done():
+                yield format_sse(*next_event.result())
+            else:
+                next_event.cancel()
+        while not queue.empty():
+            yield format_sse(*queue.get_nowait())
+
+        try:
+            yield format_sse("final", {"response": run.result()})
+        except AgentBusyError as e:
+            yield format_sse("error", {"error": str(e), "retry_after": e.retry_after})
+        except Exception as e:
+            yield format_sse("error", {"error": f"Agent failed: {e}"})
+        finally:
+            # The agent ran after get_session was done with the session
+            session_store.update_size(session)
+
+    return _attach_session(StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    ), session)
+
+
 @router.post("/upload")
 async def upload_file(
     file: UploadFile = File(...),
     message: Optional[str] = Form(""),
+    as_resume: bool = Form(True),
+    session: Session = Depends(get_session),
 ):
     """
-    Upload a file and optionally process it with the LLM.
+    Upload a file. Resumes (.tex, PDF, Word) are parsed and become the session's resume
+    unless `as_resume` is false.
     """
     try:
-        # Get or create a chat session
-
-        
-        # Save the file
-        file_id = f"{file.filename}"
-        file_path = UPLOAD_DIR / file_id
-        
-        # Write file content
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-            await file.seek(0)  # Reset file pointer for potential reuse
-        
-        # Add file reference to the chat session
-        file_message = f"Uploaded file: {file.filename}"
-        print(file_message)
-        
-
-
-        return {"message": "File uploaded successfully"}
+        stored = await save_upload(file, UPLOAD_DIR, settings.upload_max_bytes, settings.upload_chunk_size)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing file: {str(e)}"
         )
+
+    logger.info("Uploaded file: %s as %s", stored.filename, stored.path.name)
+    result = {
+        "message": "File uploaded successfully",
+        "file_id": stored.file_id,
+        "filename": stored.filename,
+        "size": stored.size,
+        "deduplicated": stored.deduplicated,
+    }
+    if not as_resume or stored.path.suffix not in RESUME_SUFFIXES:
+        return result
+
+    try:
+        ingested = await ingest_resume(stored.path, content_hash=stored.file_id)
+    except Exception as e:
+        # The upload itself succeeded; keep the current resume
+        result["resume_error"] = str(e)
+        return result
+    # A plain commit: ResumeStore takes its own lock, and session.lock may be held by
+    # an agent run for as long as the LLM takes
+    session.resume = ingested.resume
+    result["resume"] = {"source": ingested.source, "cached": ingested.cached}
+    return result
+
+
+@router.post("/optimize")
+async def optimize_endpoint(request: Request, session: Session = Depends(get_session)):
+    """
+    Review the session's resume against a job description and optimize it in one step.
+
+    Returns the match score, missing skills, recommendations, the applied changes and
+    the render job for the updated PDF.
+    """
+    data = await request.json()
+    job_description = data.get("job_description", "").strip()
+    if not job_description:
+        return JSONResponse({"error": "Empty job description"}, status_code=400)
+
+    try:
+        with use_session(session):
+            optimization, changes = await _run_serialized(session, _run_optimization, job_description)
+    except AgentBusyError as e:
+        return _busy_response(e.retry_after)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Error optimizing resume: {str(e)}"
+        )
+
+    result = {
+        "score": optimization.score,
+        "missingSkills": optimization.missingSkills,
+        "recommendations": optimization.recommendations,
+        "changes": [change.model_dump() for change in changes],
+    }
+    try:
+        job = await compile_service.submit(resume_to_latex(session.resume), owner=session.session_id)
+    except CompileQueueFullError as e:
+        result["render"] = {"status": "failed", "error": str(e)}
+        return result
+
+    await compile_service.wait(job, timeout=compile_service.timeout + 5)
+    result["render"] = job.to_dict()
+    result["pdf_url"] = f"/api/render/{job.job_id}/pdf"
+    return result
+
+
+@router.get("/router/stats")
+async def router_stats():
+    """
+    Counters for messages handled by the fast-path command router vs. the agent.
+    """
+    return command_router.get_stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """
+    Latency histograms and counters for requests, agent steps, tools, LLM calls and
+    rendering, plus cache, router and parser counters, in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.get("/session/usage")
+async def session_usage(session: Session = Depends(get_session)):
+    """
+    Tokens this session has spent on LLM calls, and how much of its conversation is
+    kept verbatim, summarized or dropped.
+    """
+    memory = session.memory
+    return {
+        "session_id": session.session_id,
+        "usage": session.usage.to_dict(),
+        "analysis_history": session.analysis_history.stats(),
+        "agent_memory": None if memory is None else {
+            "messages": len(memory.chat_memory.messages),
+            "dropped_turns": getattr(memory, "dropped_turns", 0),
+        },
+    }
+
+
+@router.get("/parser/stats")
+async def parser_stats():
+    """
+    Document parse counts, failures, timeouts and durations.
+    """
+    return get_document_parser().stats()
+
+
+def _get_render_job(job_id: str, session: Session) -> CompileJob:
+    job = compile_service.get(job_id)
+    if job is None or job.owner != session.session_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Render job not found")
+    return job
+
+
+@router.post("/render", status_code=status.HTTP_202_ACCEPTED)
+async def submit_render(session: Session = Depends(get_session)):
+    """
+    Queue a PDF render of the session's current resume.
+    """
+    latex = resume_to_latex(session.resume)
+    try:
+        job = await compile_service.submit(latex, owner=session.session_id)
+    except CompileQueueFullError as e:
+        return JSONResponse(
+            {"error": str(e)},
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(settings.agent_retry_after_seconds)}
+        )
+    return job.to_dict()
+
+
+@router.get("/render/{job_id}")
+async def render_status(job_id: str, session: Session = Depends(get_session)):
+    """
+    Report the status of a render job.
+    """
+    return _get_render_job(job_id, session).to_dict()
+
+
+@router.get("/render/{job_id}/pdf")
+async def render_download(job_id: str, session: Session = Depends(get_session)):
+    """
+    Download the PDF of a render job, waiting for it to finish if it is still running.
+    """
+    job = _get_render_job(job_id, session)
+    # Allow for the compile itself plus a little queueing before giving up
+    await compile_service.wait(job, timeout=compile_service.timeout + 5)
+    if job.status != DONE:
+        return JSONResponse(
+            job.to_dict(),
+            status_code=status.HTTP_409_CONFLICT if not job.finished else status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    return FileResponse(job.output_path, media_type="application/pdf", filename="resume.pdf")
     
 
-# @router.get("/resume_info")
-# def resume_info():
-#     resume_content = extract_file_content(os.path.join("app/uploads", "main.tex"))
+@router.get("/resume_info")
+async def resume_info(file_id: Optional[str] = None, session: Session = Depends(get_session)):
+    """
+    Return the session's current resume, or the resume parsed from an uploaded file.
+    """
+    if file_id is None:
+        return session.resume.model_dump()
 
-#     resume_info = extract_resume_info(resume_content)
-#     return resume_info
\ No newline at end of file
+    path = await asyncio.to_thread(find_upload, UPLOAD_DIR, file_id)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    try:
+        ingested = await ingest_resume(path, content_hash=file_id)
+    except ResumeIngestionError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Error extracting resume: {str(e)}"
+        )
+    return ingested.resume.model_dump()
@@ -0,0 +1,55 @@
+"""
+ASGI middleware for the HTTP layer.
+"""
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+
+from app.services.uploads import UploadTooLargeError
+
+# Room for multipart boundaries, part headers and small form fields around the file
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+class RequestSizeLimitMiddleware:
+    """
+    Rejects request bodies over `max_bytes` on `paths` before the app parses them.
+
+    Starlette spools a multipart upload in full before the endpoint runs, so the limit
+    must apply to the raw body: a declared Content-Length is checked up front, and the
+    streamed body is counted for chunked requests.
+    """
+    def __init__(self, app, paths: set[str], max_bytes: int):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse(
+                {"detail": str(UploadTooLargeError(self.max_bytes))},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI re-raises HTTPExceptions from body parsing as they are
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=str(UploadTooLargeError(self.max_bytes))
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -1,11 +1,46 @@
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
-from app.api.app import router as app_router
+from app.services.tracing import TRACE_HEADER, configure_logging, logger, new_trace_id, use_trace_id
+
+# Before the app modules are imported, so what they log at import time is shown too
+configure_logging()
 
+from app.api.app import router as app_router
+from app.api.middleware import FORM_OVERHEAD_BYTES, RequestSizeLimitMiddleware
+from app.services.llm_handler import get_settings
+from app.services.metrics import metrics
 
+http_requests = metrics.counter("http_requests_total", "HTTP requests, by route and status", ["method", "route", "status"])
+http_duration = metrics.histogram("http_request_duration_seconds", "HTTP request duration until the response starts", ["method", "route"])
 
 
 app = FastAPI()
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    paths={"/api/upload"},
+    max_bytes=get_settings().upload_max_bytes + FORM_OVERHEAD_BYTES
+)
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """
+    Bind a trace id (the caller's X-Trace-Id, or a new one) for the whole request, echo
+    it on the response, and record request counts and latency per route.
+    """
+    trace_id = request.headers.get(TRACE_HEADER) or new_trace_id()
+    start = time.perf_counter()
+    with use_trace_id(trace_id):
+        response = await call_next(request)
+        # Label by route template, not raw path, so job ids don't explode the label set
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        duration = time.perf_counter() - start
+        http_requests.inc(method=request.method, route=route, status=response.status_code)
+        http_duration.observe(duration, method=request.method, route=route)
+        logger.info("%s %s -> %d in %.1f ms", request.method, request.url.path, response.status_code, duration * 1000)
+    response.headers[TRACE_HEADER] = trace_id
+    return response
 
 
 # Include routers
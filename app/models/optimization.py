@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+from app.models.resume import TechnicalSkillEntry
+
+class ExperienceUpdate(BaseModel):
+    company: str = Field(description="Company name exactly as it appears in the resume")
+    description: List[str] = Field(default_factory=list, description="Full replacement list of bullet points")
+
+class ResumeOptimization(BaseModel):
+    score: int = Field(description="How well the current resume matches the job description, 0-100")
+    missingSkills: List[str] = Field(default_factory=list, description="Key skills in the job description missing from the resume")
+    recommendations: List[str] = Field(default_factory=list, description="Specific, actionable resume improvements")
+    technicalSkills: List[TechnicalSkillEntry] = Field(default_factory=list, description="Skill categories to add or replace; omit unchanged ones")
+    experience: List[ExperienceUpdate] = Field(default_factory=list, description="Experience entries whose bullets should be rewritten; omit unchanged ones")
+
+class ResumeChange(BaseModel):
+    section: str
+    key: str
+    before: List[str] = Field(default_factory=list)
+    after: List[str] = Field(default_factory=list)
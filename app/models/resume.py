@@ -1,41 +1,48 @@
-from pydantic import BaseModel, Field
-from typing import List
+from pydantic import BaseModel, ConfigDict
+from typing import Tuple
 
-class EducationEntry(BaseModel):
+
+class _FrozenModel(BaseModel):
+    # Resumes are shared between versions and sessions (see resume_store): edits build new
+    # ones. Sequences are tuples so nothing nested can be changed in place either; note
+    # that model_copy(update=...) doesn't validate, so updates must pass tuples too.
+    model_config = ConfigDict(frozen=True)
+
+class EducationEntry(_FrozenModel):
     degree: str = ""
     school: str = ""
     startDate: str = ""
     endDate: str = ""
     gpa: str = ""
 
-class ExperienceEntry(BaseModel):
+class ExperienceEntry(_FrozenModel):
     company: str = ""
     position: str = ""
     location: str = ""
     title: str = ""
     startDate: str = ""
     endDate: str = ""
-    description: List[str] = Field(default_factory=list)
+    description: Tuple[str, ...] = ()
 
-class ProjectEntry(BaseModel):
+class ProjectEntry(_FrozenModel):
     name: str = ""
     startDate: str = ""
     endDate: str = ""
     tech: str = ""
-    description: List[str] = Field(default_factory=list)    
+    description: Tuple[str, ...] = ()
 
-class TechnicalSkillEntry(BaseModel):
+class TechnicalSkillEntry(_FrozenModel):
     category: str = ""
-    items: List[str] = Field(default_factory=list)
+    items: Tuple[str, ...] = ()
 
-class Resume(BaseModel):
+class Resume(_FrozenModel):
     name: str = ""
     location: str = ""
     phone: str = ""
     email: str = ""
     linkedinUrl: str = ""
     githubUrl: str = ""
-    education: List[EducationEntry] = Field(default_factory=list)
-    experience: List[ExperienceEntry] = Field(default_factory=list)
-    projects: List[ProjectEntry] = Field(default_factory=list)
-    technicalSkills: List[TechnicalSkillEntry] = Field(default_factory=list)
+    education: Tuple[EducationEntry, ...] = ()
+    experience: Tuple[ExperienceEntry, ...] = ()
+    projects: Tuple[ProjectEntry, ...] = ()
+    technicalSkills: Tuple[TechnicalSkillEntry, ...] = ()
@@ -0,0 +1,32 @@
+"""
+Bounded conversation memory for the LangChain agent.
+
+Kept apart from app.services.memory because it subclasses langchain.memory classes,
+which are slow to import; get_agent imports it on first use.
+"""
+
+from langchain.memory import ConversationBufferMemory
+
+from app.utils.tokens import count_message_tokens
+
+
+class WindowedChatMemory(ConversationBufferMemory):
+    """
+    The agent's conversation memory, bounded to the last `max_turns` exchanges and
+    `max_tokens` tokens. The agent's prompt doesn't include chat_history, so older
+    exchanges are dropped rather than summarized: a summary nothing reads would only
+    add LLM cost.
+    """
+    max_turns: int = 10
+    max_tokens: int = 4000
+    dropped_turns: int = 0
+
+    def save_context(self, inputs, outputs):
+        super().save_context(inputs, outputs)
+        messages = self.chat_memory.messages
+        while len(messages) > 2 and (
+            len(messages) > 2 * self.max_turns
+            or count_message_tokens((message.type, message.content) for message in messages) > self.max_tokens
+        ):
+            del messages[:2]
+            self.dropped_turns += 1
@@ -0,0 +1,93 @@
+"""
+Bounded, non-blocking execution of the LangChain agent.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class AgentBusyError(Exception):
+    """Raised when the agent runner has no free slot or queue space left."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Agent is busy, please retry later")
+        self.retry_after = retry_after
+
+
+class AgentRunner:
+    """
+    Runs the synchronous agent on a dedicated thread pool so the event loop stays free.
+
+    At most `max_concurrency` agent runs execute at once, up to `max_queue` more may
+    wait for a slot, and anything beyond that is rejected with AgentBusyError.
+    """
+    def __init__(self, max_concurrency: int, max_queue: int, retry_after: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="agent"
+        )
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of agent runs either executing or waiting for a slot."""
+        return self._pending
+
+    @property
+    def queued(self) -> int:
+        """Number of agent runs waiting for a free slot."""
+        return max(0, self._pending - self.max_concurrency)
+
+    @property
+    def full(self) -> bool:
+        """True when another run would be rejected."""
+        return self._pending >= self.max_concurrency + self.max_queue
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run `func(*args)` on the agent thread pool and await its result.
+
+        The caller's context variables are copied into the worker thread. The run keeps
+        its slot until the worker thread is done with it, even if the caller is
+        cancelled first (e.g. the client disconnected).
+        """
+        if self.full:
+            raise AgentBusyError(self.retry_after)
+
+        self._pending += 1
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            self._pending -= 1
+            raise
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(contextvars.copy_context().run, func, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release_threadsafe(loop))
+        return await asyncio.wrap_future(future)
+
+    def _release(self):
+        self._pending -= 1
+        self._slots.release()
+
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop):
+        # Called from the worker thread (or from shutdown) once the run is over
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # The loop is closed; nothing is waiting for the slot any more
+            pass
+
+    def shutdown(self):
+        """Stop accepting work and release the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
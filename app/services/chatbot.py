@@ -1,10 +1,6 @@
-import json
-from langchain.agents import initialize_agent
-from langchain.memory import ConversationBufferMemory
 from dotenv import load_dotenv
-from app.services.llm_handler import LLMHandler
+from app.services.llm_handler import get_chat_model, get_settings
 from app.services.prompt import get_system_prompt
-from app.services.resume import get_default_resume_content
 from app.services.tools import ALL_TOOLS
 
 load_dotenv()
@@ -12,9 +8,21 @@ load_dotenv()
 def get_agent():
     """
     Initialize and return a LangChain agent with all resume editing tools.
+
+    langchain.agents is slow to import, so it is loaded when the first session's agent
+    is built rather than at startup.
     """
-    llm = LLMHandler().model
-    memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+    from langchain.agents import initialize_agent
+    from app.services.agent_memory import WindowedChatMemory
+
+    settings = get_settings()
+    llm = get_chat_model()
+    memory = WindowedChatMemory(
+        memory_key="chat_history",
+        return_messages=True,
+        max_turns=settings.agent_memory_max_turns,
+        max_tokens=settings.memory_max_tokens
+    )
     
     # Use the dedicated agent prompt from prompt.py
     system_message = get_system_prompt("agent")
@@ -0,0 +1,183 @@
+"""
+Deterministic fast path for simple edit commands.
+
+Messages like "change my email to x@y.com" or "delete Java from Programming Languages"
+map one-to-one onto a tool input, so they are parsed locally and dispatched straight to
+the tool instead of paying for a ReAct round-trip. Anything not matched with confidence
+falls through to the agent.
+"""
+
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from app.models.resume import Resume
+from app.services.tools import (
+    tool_change_email, tool_change_name, tool_change_location, tool_change_technical_skills,
+    tool_delete_technical_skills, tool_get_updated_resume
+)
+from app.services.tracing import logger
+
+_PREFIX = r"^\s*(?:please\s+)?(?:can you\s+|could you\s+)?"
+_SUFFIX = r"\s*(?:please)?[.!]?\s*$"
+_EDIT = r"(?:change|update|set|replace)"
+_REMOVE = r"(?:delete|remove|drop|take out)"
+
+# A value containing another edit ("... and update Frontend to React") is a compound request
+_SECOND_EDIT = re.compile(r"\b(?:and|then|also)\s+(?:\w+\s+)?(?:change|update|set|replace|delete|remove|drop|add|make|include)\b"
+                          r"|\b(?:change|update|set|replace|delete|remove|drop)\b", re.IGNORECASE)
+
+# Words that start an instruction rather than a skill list ("to include Vue", "to match the job")
+_NOT_A_SKILL_LIST = {
+    "include", "including", "add", "adding", "also", "match", "matching", "reflect", "fit", "align",
+    "contain", "have", "be", "use", "mention", "highlight", "emphasize", "show", "keep", "remove",
+    "something", "whatever", "anything", "everything", "more", "better", "some", "the", "a", "an",
+    "what", "only", "just", "my", "our", "its", "their", "this", "that", "these", "those",
+}
+_MAX_ITEM_WORDS = 4
+
+
+@dataclass
+class RoutedCommand:
+    """A message resolved to a tool call."""
+    tool: object
+    tool_input: str
+
+    @property
+    def tool_name(self) -> str:
+        return self.tool.name
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[^a-z0-9+#/]+", " ", name.lower()).strip()
+
+
+def _find_category(resume: Resume, name: str) -> Optional[str]:
+    """Return the resume's skill category matching `name`, if exactly one does."""
+    wanted = _normalize(name)
+    if not wanted:
+        return None
+    categories = [skill.category for skill in resume.technicalSkills]
+    exact = [category for category in categories if _normalize(category) == wanted]
+    if exact:
+        return exact[0]
+    partial = [
+        category for category in categories
+        if wanted in _normalize(category) or _normalize(category) in wanted
+    ]
+    return partial[0] if len(partial) == 1 else None
+
+
+def _split_items(text: str) -> list[str]:
+    parts = re.split(r"\s*(?:,|;|\band\b|&)\s*", text)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _is_single_edit(value: str) -> bool:
+    return not _SECOND_EDIT.search(value)
+
+
+def _skill_list(text: str) -> Optional[list[str]]:
+    """
+    The items of a plain comma/"and"-separated list of skills, or None if `text` reads
+    like an instruction ("include Vue", "match the job description").
+    """
+    if not _is_single_edit(text):
+        return None
+    items = _split_items(text)
+    if not items:
+        return None
+    for item in items:
+        words = item.split()
+        if len(words) > _MAX_ITEM_WORDS or words[0].lower() in _NOT_A_SKILL_LIST:
+            return None
+    return items
+
+
+def _strip_category_words(text: str) -> str:
+    return re.sub(r"\s+(?:skills?|category|section|list)$", "", text.strip(), flags=re.IGNORECASE)
+
+
+class CommandRouter:
+    """
+    Parses structured edit commands and dispatches them directly to resume tools.
+    """
+    def __init__(self):
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        self._rules: list[tuple[re.Pattern, Callable[[re.Match, Resume], Optional[RoutedCommand]]]] = [
+            (re.compile(_PREFIX + _EDIT + r"\s+(?:my\s+|the\s+)?e-?mail(?:\s+(?:address|id))?\s+(?:to|as|with)\s+(?P<value>[^\s@]+@[^\s@]+\.[a-z]{2,})" + _SUFFIX, re.IGNORECASE),
+             lambda m, _: RoutedCommand(tool_change_email, m["value"])),
+            (re.compile(_PREFIX + _EDIT + r"\s+(?:my\s+|the\s+)?name\s+(?:to|as|with)\s+(?P<value>[^\d@]{2,80}?)" + _SUFFIX, re.IGNORECASE),
+             lambda m, _: RoutedCommand(tool_change_name, m["value"].strip()) if _is_single_edit(m["value"]) else None),
+            (re.compile(_PREFIX + _EDIT + r"\s+(?:my\s+|the\s+)?location\s+(?:to|as|with)\s+(?P<value>.{2,80}?)" + _SUFFIX, re.IGNORECASE),
+             lambda m, _: RoutedCommand(tool_change_location, m["value"].strip()) if _is_single_edit(m["value"]) else None),
+            (re.compile(_PREFIX + r"(?:get|generate|create|build|show|download|give me)\s+(?:me\s+)?(?:the\s+|my\s+)?(?:updated\s+|latest\s+|new\s+)?(?:resume|cv|pdf)(?:\s+pdf)?" + _SUFFIX, re.IGNORECASE),
+             lambda m, _: RoutedCommand(tool_get_updated_resume, "")),
+            (re.compile(_PREFIX + _REMOVE + r"\s+(?:the\s+)?(?:(?:entire|whole)\s+)?(?:category\s+(?P<a>.+?)|(?P<b>.+?)\s+(?:skills?\s+)?(?:category|section))" + _SUFFIX, re.IGNORECASE),
+             self._delete_category),
+            (re.compile(_PREFIX + _REMOVE + r"\s+(?P<item>.+?)\s+from\s+(?:the\s+|my\s+)?(?P<category>.+?)" + _SUFFIX, re.IGNORECASE),
+             self._delete_item),
+            (re.compile(_PREFIX + _EDIT + r"\s+(?:my\s+|the\s+)?(?P<category>.+?)(?:\s+skills?)?\s+(?:to|as|with)\s*:?\s+(?P<items>.+?)" + _SUFFIX, re.IGNORECASE),
+             self._set_skills),
+        ]
+
+    @staticmethod
+    def _delete_category(match: re.Match, resume: Resume) -> Optional[RoutedCommand]:
+        category = _find_category(resume, _strip_category_words(match["a"] or match["b"]))
+        if category is None:
+            return None
+        return RoutedCommand(tool_delete_technical_skills, f"CATEGORY|{category}")
+
+    @staticmethod
+    def _delete_item(match: re.Match, resume: Resume) -> Optional[RoutedCommand]:
+        category = _find_category(resume, _strip_category_words(match["category"]))
+        if category is None or not _is_single_edit(match["item"]):
+            return None
+        return RoutedCommand(tool_delete_technical_skills, f"ITEM|{category}|{match['item'].strip()}")
+
+    @staticmethod
+    def _set_skills(match: re.Match, resume: Resume) -> Optional[RoutedCommand]:
+        category = _find_category(resume, _strip_category_words(match["category"]))
+        # Replacing a category outright is only safe for an explicit list of skills
+        items = _skill_list(match["items"])
+        if category is None or not items:
+            return None
+        return RoutedCommand(tool_change_technical_skills, f"{category}|{','.join(items)}")
+
+    def route(self, message: str, resume: Resume) -> Optional[RoutedCommand]:
+        """Resolve `message` to a tool call, or None if it needs the agent."""
+        if "\n" in message.strip() or len(message) > 300:
+            return None
+        for pattern, build in self._rules:
+            match = pattern.match(message)
+            if match:
+                command = build(match, resume)
+                if command is not None:
+                    return command
+        return None
+
+    def dispatch(self, message: str, resume: Resume) -> Optional[str]:
+        """
+        Run `message` directly if it is a recognized command; returns the tool's
+        response, or None when the message should go to the agent.
+        """
+        command = self.route(message, resume)
+        with self._lock:
+            if command is None:
+                self.stats["agent_path"] += 1
+                return None
+            self.stats["fast_path"] += 1
+            self.stats[f"fast_path:{command.tool_name}"] += 1
+        logger.info("Fast path: %s <- %r", command.tool_name, command.tool_input)
+        return command.tool.run(command.tool_input)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+
+
+# Create a singleton instance
+command_router = CommandRouter()
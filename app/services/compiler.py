@@ -0,0 +1,265 @@
+"""
+Asynchronous LaTeX compile service: a bounded pool of pdflatex workers fed by a job queue.
+"""
+
+import asyncio
+import os
+import shutil
+import signal
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.services.llm_handler import get_settings
+from app.services.pdf_cache import PdfCache, get_pdf_cache
+from app.services.resume import get_template_version
+from app.services.latex_format import get_format_cache, plan_compile, prepare_attempt
+from app.services.metrics import metrics
+from app.services.tracing import get_trace_id, logger, span, use_trace_id
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+queue_wait = metrics.histogram("compile_queue_wait_seconds", "Time compile jobs spend queued before a worker picks them up")
+compile_jobs = metrics.counter("compile_jobs_total", "Finished compile jobs, by status and cache hit", ["status", "cache_hit"])
+
+
+class CompileQueueFullError(Exception):
+    """Raised when the compile queue cannot accept another job."""
+
+
+@dataclass
+class CompileJob:
+    """A single LaTeX to PDF compile request and its outcome."""
+    job_id: str
+    latex: str = field(repr=False)
+    output_path: Path
+    owner: Optional[str] = None
+    trace_id: Optional[str] = None
+    status: str = QUEUED
+    error: Optional[str] = None
+    cache_hit: bool = False
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "error": self.error,
+            "cache_hit": self.cache_hit,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class CompileService:
+    """
+    Runs pdflatex jobs on `workers` concurrent workers.
+
+    Every job writes to its own output file, and a compile that exceeds `timeout`
+    seconds is killed so it cannot hold a worker forever.
+    """
+    def __init__(self, workers: int, queue_size: int, timeout: float, output_dir: str, max_jobs: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.output_dir = Path(output_dir)
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, CompileJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        """Start the worker tasks on the running event loop."""
+        if self.running:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"pdflatex-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Cancel the workers; running pdflatex processes are killed."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    async def submit(self, latex: str, owner: Optional[str] = None, trace_id: Optional[str] = None) -> CompileJob:
+        """
+        Queue `latex` for compilation and return the job without waiting for it.
+        The job is traced under `trace_id`, or the caller's current trace id.
+        """
+        if not self.running:
+            raise RuntimeError("Compile service is not running")
+        job_id = uuid.uuid4().hex
+        job = CompileJob(
+            job_id=job_id,
+            latex=latex,
+            output_path=self.output_dir / f"{job_id}.pdf",
+            owner=owner,
+            trace_id=trace_id or get_trace_id()
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise CompileQueueFullError("Too many resumes are being rendered, please retry later")
+        self._jobs[job_id] = job
+        stale_pdfs = self._trim_jobs()
+        if stale_pdfs:
+            await asyncio.to_thread(_unlink_all, stale_pdfs)
+        return job
+
+    def submit_threadsafe(self, latex: str, owner: Optional[str] = None) -> CompileJob:
+        """Submit a job from a thread other than the event loop's, e.g. an agent tool."""
+        if self._loop is None:
+            raise RuntimeError("Compile service is not running")
+        # The coroutine runs in the loop's context, so carry this thread's trace id over explicitly
+        future = asyncio.run_coroutine_threadsafe(self.submit(latex, owner, get_trace_id()), self._loop)
+        return future.result()
+
+    def get(self, job_id: str) -> Optional[CompileJob]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: CompileJob, timeout: Optional[float] = None) -> CompileJob:
+        """Wait until `job` has finished, or until `timeout` seconds have passed."""
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    def _trim_jobs(self) -> list[Path]:
+        # Forget the oldest finished jobs beyond max_jobs and return their PDFs to delete
+        stale_pdfs = []
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            job = self._jobs[job_id]
+            if job.finished:
+                del self._jobs[job_id]
+                stale_pdfs.append(job.output_path)
+        return stale_pdfs
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            job.started_at = time.time()
+            queue_wait.observe(job.started_at - job.created_at)
+            try:
+                with use_trace_id(job.trace_id), span("compile"):
+                    await self._compile(job)
+                job.status = DONE
+            except asyncio.CancelledError:
+                job.status = FAILED
+                job.error = "Compile service stopped"
+                raise
+            except Exception as e:
+                job.status = FAILED
+                job.error = str(e)
+                with use_trace_id(job.trace_id):
+                    logger.warning("Compile job %s failed: %s", job.job_id, e)
+            finally:
+                job.finished_at = time.time()
+                compile_jobs.inc(status=job.status, cache_hit=str(job.cache_hit).lower())
+                job.done.set()
+                self._queue.task_done()
+
+    async def _compile(self, job: CompileJob):
+        # Every file operation below runs in a thread to keep it off the event loop
+        cache = await asyncio.to_thread(get_pdf_cache)
+        cache_key = PdfCache.make_key(job.latex, await asyncio.to_thread(get_template_version))
+        if await asyncio.to_thread(cache.copy_to, cache_key, job.output_path):
+            job.cache_hit = True
+            return
+
+        attempts = await asyncio.to_thread(plan_compile, job.latex)
+        temp_dir = await asyncio.to_thread(tempfile.mkdtemp)
+        try:
+            for attempt in attempts:
+                await asyncio.to_thread(prepare_attempt, attempt, temp_dir)
+                returncode, output = await self._run_pdflatex(attempt.command, temp_dir)
+                if returncode == 0 or attempt.format_path is None:
+                    break
+                logger.warning("Compile against %s failed, retrying without it", attempt.format_path.name)
+                await asyncio.to_thread(get_format_cache().discard, attempt.format_path)
+
+            generated_pdf = os.path.join(temp_dir, "document.pdf")
+            if returncode != 0 or not await asyncio.to_thread(os.path.exists, generated_pdf):
+                log_tail = output.decode(errors="ignore")[-2000:]
+                logger.error("LaTeX compilation failed:\n%s", log_tail)
+                raise RuntimeError("LaTeX compilation failed.")
+
+            await asyncio.to_thread(cache.put, cache_key, generated_pdf)
+            await asyncio.to_thread(shutil.move, generated_pdf, job.output_path)
+        finally:
+            await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
+
+    async def _run_pdflatex(self, command: list[str], cwd: str) -> tuple[int, bytes]:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=cwd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            # Own process group, so helpers pdflatex spawns (e.g. mktexpk) die with it
+            start_new_session=True
+        )
+        try:
+            output, _ = await asyncio.wait_for(process.communicate(), self.timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            _kill_process_group(process)
+            await process.wait()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise RuntimeError(f"LaTeX compilation timed out after {self.timeout:g}s")
+        return process.returncode, output
+
+
+def _unlink_all(paths: list[Path]):
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+def _kill_process_group(process: asyncio.subprocess.Process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+@lru_cache()
+def get_compile_service() -> CompileService:
+    """Create and cache the process-wide compile service."""
+    settings = get_settings()
+    return CompileService(
+        workers=settings.compile_workers,
+        queue_size=settings.compile_queue_size,
+        timeout=settings.compile_timeout_seconds,
+        output_dir=settings.compile_output_dir,
+        max_jobs=settings.compile_max_jobs
+    )
@@ -0,0 +1,272 @@
+"""
+CPU-bound document parsing in a bounded pool of worker processes.
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.utils.documents import DOCUMENT_READERS, detect_file_kind
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Extra time the pool waits past the in-worker timeout before giving up on a worker
+_TIMEOUT_GRACE_SECONDS = 2.0
+
+# In a worker: where it reports (job id, pid) as it starts each parse
+_started_queue = None
+
+
+class DocumentParseError(Exception):
+    """Raised when a document could not be parsed."""
+
+
+class DocumentParseTimeoutError(DocumentParseError):
+    """Raised when parsing a document exceeds the per-document timeout."""
+
+
+@dataclass
+class ParseResult:
+    """Text extracted by a parser worker and how long it took."""
+    text: str
+    complete: bool
+    duration: float
+
+
+def _init_worker(max_memory_bytes: int, started_queue):
+    global _started_queue
+    _started_queue = started_queue
+    # Cap how much memory a worker may allocate on top of what it started with
+    if resource is None or max_memory_bytes <= 0:
+        return
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        current = 0
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = current + max_memory_bytes
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _on_timeout(signum, frame):
+    raise DocumentParseTimeoutError("Document parsing timed out")
+
+
+def _parse_in_worker(job_id: int, kind: str, file_path: str, max_length: int, max_pages: Optional[int], timeout: float) -> tuple[str, bool, float]:
+    if _started_queue is not None:
+        # Lets the parent kill just this worker if it gets stuck
+        _started_queue.put((job_id, os.getpid()))
+    reader, _ = DOCUMENT_READERS[kind]
+    use_alarm = hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    start = time.perf_counter()
+    try:
+        text, complete = reader(file_path, max_length, max_pages)
+    except DocumentParseError:
+        raise
+    except MemoryError:
+        raise DocumentParseError("Document parsing exceeded the memory limit")
+    except Exception as e:
+        # Parser exceptions may not survive pickling back to the parent process
+        raise DocumentParseError(str(e) or type(e).__name__) from None
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return text, complete, time.perf_counter() - start
+
+
+class DocumentParser:
+    """
+    Parses PDF, Word and CSV documents in a pool of `workers` processes.
+
+    Each document gets `timeout` seconds, workers may allocate at most `max_memory_bytes`,
+    and PDFs are read up to `max_pages` pages. A worker that stops responding retires its
+    pool: new documents go to a fresh pool, the other documents in flight on the old one
+    finish there, and only then is the stuck worker killed. A worker that dies breaks
+    its pool, failing every document in flight on it.
+    """
+    def __init__(self, workers: int, timeout: float, max_memory_bytes: int, max_pages: Optional[int]):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_memory_bytes = max_memory_bytes
+        self.max_pages = max_pages
+        self.parsed = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.durations: deque = deque(maxlen=1000)
+        self._context = multiprocessing.get_context("spawn")
+        self._started = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._job_ids = itertools.count()
+        self._inflight: dict[int, tuple[ProcessPoolExecutor, Future]] = {}
+        self._pids: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                if self._started is None:
+                    self._started = self._context.Queue()
+                # Spawned workers import only the document readers, not the whole app
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=self._context,
+                    initializer=_init_worker,
+                    initargs=(self.max_memory_bytes, self._started)
+                )
+            return self._executor
+
+    def _collect_pids(self):
+        # Called with the lock held
+        while self._started is not None:
+            try:
+                job_id, pid = self._started.get_nowait()
+            except queue.Empty:
+                return
+            if job_id in self._inflight:
+                self._pids[job_id] = pid
+
+    def _detach(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _retire(self, executor: ProcessPoolExecutor, stuck_job_id: int):
+        """Send new work to a fresh pool and kill the stuck worker once its neighbours are done."""
+        with self._lock:
+            self._collect_pids()
+            pid = self._pids.get(stuck_job_id)
+            stuck = self._inflight[stuck_job_id][1]
+            others = [
+                future for job_id, (job_executor, future) in self._inflight.items()
+                if job_executor is executor and job_id != stuck_job_id
+            ]
+        self._detach(executor)
+        if pid is None:
+            return
+        threading.Thread(target=self._reap, args=(pid, stuck, others), name="parser-reaper", daemon=True).start()
+
+    def _reap(self, pid: int, stuck: Future, others: list[Future]):
+        # Killing a worker breaks its pool, so let the other documents finish first;
+        # any still running after their own deadline are stuck too
+        wait(others, timeout=self.timeout + _TIMEOUT_GRACE_SECONDS)
+        if stuck.done():
+            return
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    async def parse(self, file_path: str, max_length: int = 10000) -> ParseResult:
+        """
+        Extract up to `max_length` characters from a PDF, Word or CSV document.
+
+        Raises:
+            DocumentParseTimeoutError: Parsing took longer than the per-document timeout
+            DocumentParseError: The document is unsupported, malformed or too large to parse
+        """
+        file_path = Path(file_path)
+        kind, _ = detect_file_kind(file_path)
+        if kind not in DOCUMENT_READERS:
+            raise DocumentParseError(f"Unsupported document type: {file_path.name}")
+
+        executor = self._get_executor()
+        job_id = next(self._job_ids)
+        future = executor.submit(_parse_in_worker, job_id, kind, str(file_path), max_length, self.max_pages, self.timeout)
+        with self._lock:
+            self._inflight[job_id] = (executor, future)
+        try:
+            text, complete, duration = await asyncio.wait_for(
+                asyncio.wrap_future(future), self.timeout + _TIMEOUT_GRACE_SECONDS
+            )
+        except asyncio.TimeoutError:
+            # The worker did not honour its alarm, e.g. stuck in native code
+            self._retire(executor, job_id)
+            self.timeouts += 1
+            raise DocumentParseTimeoutError("Document parsing timed out")
+        except DocumentParseTimeoutError:
+            self.timeouts += 1
+            raise
+        except BrokenProcessPool:
+            self._detach(executor)
+            self.failures += 1
+            raise DocumentParseError("Document parser worker crashed")
+        except DocumentParseError:
+            self.failures += 1
+            raise
+        except Exception as e:
+            self.failures += 1
+            raise DocumentParseError(str(e)) from e
+        finally:
+            with self._lock:
+                self._collect_pids()
+                self._inflight.pop(job_id, None)
+                self._pids.pop(job_id, None)
+
+        # Imported here so worker processes loading this module skip the LLM stack
+        from app.services.tracing import logger
+
+        self.parsed += 1
+        self.durations.append(duration)
+        logger.info("Parsed %s (%s) in %.1f ms", file_path.name, kind, duration * 1000)
+        return ParseResult(text=text, complete=complete, duration=duration)
+
+    def stats(self) -> dict:
+        durations = sorted(self.durations)
+
+        def percentile(p: float) -> float:
+            if not durations:
+                return 0.0
+            return durations[min(len(durations) - 1, int(p * len(durations)))] * 1000
+
+        return {
+            "parsed": self.parsed,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "max_ms": durations[-1] * 1000 if durations else 0.0,
+        }
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache()
+def get_document_parser() -> DocumentParser:
+    """Create and cache the process-wide document parser."""
+    # Imported here so worker processes loading this module skip the LLM stack
+    from app.services.llm_handler import get_settings
+
+    settings = get_settings()
+    return DocumentParser(
+        workers=settings.parse_workers,
+        timeout=settings.parse_timeout_seconds,
+        max_memory_bytes=settings.parse_max_memory_mb * 1024 * 1024,
+        max_pages=settings.parse_max_pages or None
+    )
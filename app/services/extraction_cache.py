@@ -0,0 +1,140 @@
+"""
+On-disk cache of text extracted from uploaded documents.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.services.llm_handler import get_settings
+
+
+class ExtractionCache:
+    """
+    Stores extracted text under the SHA-256 of the source file's content.
+
+    File hashes are remembered per path along with the file's mtime and size, so an
+    unchanged file is not re-hashed and a modified one is picked up on the next read.
+    Entries are evicted least-recently-used first once the store exceeds `max_bytes`.
+    """
+    def __init__(self, cache_dir: str, max_bytes: int = 64 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._fingerprints: dict[str, tuple[int, int, str]] = {}
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def _load_index(self):
+        # Rebuild LRU order from what is already on disk, oldest access first
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def content_hash(self, file_path: Path) -> str:
+        """SHA-256 of the file's content, re-computed only when its mtime or size changes."""
+        stat = file_path.stat()
+        key = str(file_path.resolve())
+        with self._lock:
+            cached = self._fingerprints.get(key)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()
+        with self._lock:
+            self._fingerprints[key] = (stat.st_mtime_ns, stat.st_size, content_hash)
+        return content_hash
+
+    def _path(self, content_hash: str) -> Path:
+        return self.cache_dir / f"{content_hash}.json"
+
+    def get(self, content_hash: str, max_length: int) -> Optional[str]:
+        """
+        Return cached text for the document, or None if nothing usable is cached.
+
+        A cached prefix only satisfies requests that it covers in full.
+        """
+        path = self._path(content_hash)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                # Another worker may have evicted it; forget it here too
+                self._total_bytes -= self._entries.pop(content_hash, 0)
+                self.misses += 1
+            return None
+        if not entry["complete"] and len(entry["text"]) < max_length:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            if content_hash in self._entries:
+                self._entries.move_to_end(content_hash)
+            self.hits += 1
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return entry["text"][:max_length]
+
+    def put(self, content_hash: str, text: str, complete: bool):
+        """Store extracted text; `complete` is False when extraction stopped early."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"text": text, "complete": complete}, f)
+        path = self._path(content_hash)
+        os.replace(tmp_path, path)
+        size = path.stat().st_size
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(content_hash, 0)
+            self._entries[content_hash] = size
+            self._evict()
+
+    def _evict(self):
+        while self._entries and self._total_bytes > self.max_bytes:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            entries, total_bytes = len(self._entries), self._total_bytes
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "entries": entries,
+            "bytes": total_bytes,
+        }
+
+
+@lru_cache()
+def get_extraction_cache() -> ExtractionCache:
+    """Create and cache the process-wide extraction cache."""
+    settings = get_settings()
+    return ExtractionCache(settings.extraction_cache_dir, settings.extraction_cache_max_bytes)
@@ -0,0 +1,255 @@
+"""
+Ingestion of uploaded resumes (.tex, PDF or Word) into a validated Resume.
+
+LaTeX produced from our own main.tex template is parsed deterministically; anything
+else costs a single structured-output LLM call. Results are cached on disk by the
+file's content hash, so the same document is never parsed or paid for twice.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.models.resume import Resume
+from app.services.document_parser import DocumentParseError
+from app.services.extraction_cache import get_extraction_cache
+from app.services.llm_handler import get_settings, llm_handler
+from app.services.prompt import EXTRACTION_PROMPT
+from app.services.prompt_builder import build_prompt, fit_document
+from app.services.tracing import logger
+from app.utils.documents import detect_file_kind
+from app.utils.file import extract_file_content_async
+from app.utils.util import unescape_data
+
+# Bump when the parser or extraction prompt changes to invalidate cached results
+INGESTION_VERSION = "2"
+
+RESUME_SUFFIXES = ['.tex', '.pdf', '.doc', '.docx']
+
+_TEMPLATE_MARKERS = (r"\Huge \scshape", r"\resumeSubheading")
+
+
+class ResumeIngestionError(Exception):
+    """Raised when an uploaded file cannot be turned into a resume."""
+
+
+@dataclass
+class IngestedResume:
+    """A parsed resume and how it was produced ("template" or "llm")."""
+    resume: Resume
+    source: str
+    cached: bool = False
+
+
+def _read_group(text: str, pos: int) -> tuple[Optional[str], int]:
+    """Read the balanced {...} group starting at `pos`, skipping leading whitespace."""
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    if pos >= len(text) or text[pos] != "{":
+        return None, pos
+    depth = 0
+    start = pos + 1
+    while pos < len(text):
+        char = text[pos]
+        if char == "\\":
+            pos += 2
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:pos], pos + 1
+        pos += 1
+    return None, pos
+
+
+def _read_groups(text: str, pos: int, count: int) -> tuple[list[str], int]:
+    groups = []
+    for _ in range(count):
+        group, pos = _read_group(text, pos)
+        groups.append(group.strip() if group else "")
+    return groups, pos
+
+
+def _section(latex: str, title: str) -> str:
+    match = re.search(r"\\section\*\{" + re.escape(title) + r"\}(.*?)(?=\\section\*\{|\\end\{document\})", latex, re.DOTALL)
+    return match.group(1) if match else ""
+
+
+def _split_dates(dates: str) -> tuple[str, str]:
+    start, _, end = dates.partition(" - ")
+    return start.strip(), end.strip()
+
+
+def _subheadings(section: str) -> list[tuple[list[str], list[str]]]:
+    """Each \\resumeSubheading's four arguments and the \\resumeItem bullets under it."""
+    entries = []
+    starts = [match.end() for match in re.finditer(r"\\resumeSubheading\b", section)]
+    for index, start in enumerate(starts):
+        args, pos = _read_groups(section, start, 4)
+        end = starts[index + 1] if index + 1 < len(starts) else len(section)
+        bullets = []
+        for match in re.finditer(r"\\resumeItem\b", section[pos:end]):
+            bullet, _ = _read_group(section, pos + match.end())
+            if bullet is not None:
+                bullets.append(bullet.strip())
+        entries.append((args, bullets))
+    return entries
+
+
+def parse_template_latex(latex: str) -> Optional[Resume]:
+    """
+    Parse LaTeX rendered from our main.tex template back into a Resume.
+
+    Returns None for LaTeX in any other format. Field values are unescaped back to the
+    raw text the template was rendered from.
+    """
+    if r"\VAR{" in latex or not all(marker in latex for marker in _TEMPLATE_MARKERS):
+        return None
+
+    name_match = re.search(r"\{\\Huge \\scshape\s+(.*?)\}\s*\\\\", latex)
+    contact_start = latex.find(r"{\small", name_match.end()) if name_match else -1
+    if not name_match or contact_start < 0:
+        return None
+    contact, _ = _read_group(latex, contact_start)
+    parts = [part.strip() for part in (contact or "")[len(r"\small"):].split(r"\textbar\:")]
+    parts += [""] * (5 - len(parts))
+
+    def underlined(part: str) -> str:
+        match = re.search(r"\\underline\{(.*?)\}\}", part)
+        return match.group(1) if match else part
+
+    data = {
+        "name": name_match.group(1).strip(),
+        "location": parts[0],
+        "phone": parts[1],
+        "email": underlined(parts[2]),
+        "linkedinUrl": underlined(parts[3]),
+        "githubUrl": underlined(parts[4]),
+        "technicalSkills": [
+            {"category": category.strip(), "items": [item.strip() for item in items.split(", ") if item.strip()]}
+            for category, items in re.findall(r"\\textbf\{(.+?)\}\{:\}\s*(.*?)\s*\\\\\s*$", _section(latex, "Technical Skills"), re.MULTILINE)
+        ],
+        "education": [],
+        "experience": [],
+        "projects": [],
+    }
+    for (school, dates, degree, _), _ in _subheadings(_section(latex, "Education")):
+        start_date, end_date = _split_dates(dates)
+        data["education"].append({"school": school, "degree": degree, "startDate": start_date, "endDate": end_date})
+    for (company, dates, title, location), bullets in _subheadings(_section(latex, "Experience")):
+        start_date, end_date = _split_dates(dates)
+        data["experience"].append({
+            "company": company, "position": title, "title": title, "location": location,
+            "startDate": start_date, "endDate": end_date, "description": bullets
+        })
+    for (name, dates, tech, _), bullets in _subheadings(_section(latex, "Projects")):
+        start_date, end_date = _split_dates(dates)
+        data["projects"].append({"name": name, "tech": tech, "startDate": start_date, "endDate": end_date, "description": bullets})
+
+    return Resume.model_validate(unescape_data(data))
+
+
+class IngestionCache:
+    """
+    Parsed resumes stored on disk under the content hash of their source file.
+    """
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, content_hash: str) -> Path:
+        key = hashlib.sha256(f"{INGESTION_VERSION}\0{content_hash}".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, content_hash: str) -> Optional[IngestedResume]:
+        try:
+            with open(self._path(content_hash), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return IngestedResume(resume=Resume.model_validate(entry["resume"]), source=entry["source"], cached=True)
+
+    def put(self, content_hash: str, ingested: IngestedResume):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"source": ingested.source, "resume": ingested.resume.model_dump()}, f)
+        os.replace(tmp_path, self._path(content_hash))
+
+
+@lru_cache()
+def get_ingestion_cache() -> IngestionCache:
+    """Create and cache the process-wide ingestion cache."""
+    return IngestionCache(get_settings().resume_cache_dir)
+
+
+async def _extract_with_llm(text: str) -> Resume:
+    prompt = build_prompt(
+        "extract",
+        EXTRACTION_PROMPT,
+        {"resume": fit_document(text, get_settings().ingest_max_tokens)},
+        originals={"resume": text}
+    )
+    structured_model = llm_handler.model.with_structured_output(Resume)
+    logger.info("Resume extraction LLM call invoked")
+    extracted = await structured_model.ainvoke([
+        ("system", "You are an information extraction assistant."),
+        ("user", prompt.text)
+    ])
+    logger.info("Resume extraction LLM call completed")
+    return extracted
+
+
+async def ingest_resume(file_path: str, content_hash: Optional[str] = None) -> IngestedResume:
+    """
+    Turn an uploaded .tex, PDF or Word file into a Resume.
+
+    Args:
+        file_path: Path to the uploaded file
+        content_hash: SHA-256 of the file, if already known (e.g. the upload's file id)
+
+    Returns:
+        The parsed resume, where it came from, and whether it was served from cache
+    """
+    file_path = Path(file_path)
+    if file_path.suffix.lower() not in RESUME_SUFFIXES:
+        raise ResumeIngestionError(f"Unsupported resume format: {file_path.name}")
+
+    cache = get_ingestion_cache()
+    if content_hash is None:
+        content_hash = await asyncio.to_thread(get_extraction_cache().content_hash, file_path)
+    cached = cache.get(content_hash)
+    if cached is not None:
+        return cached
+
+    kind, _ = detect_file_kind(file_path)
+    max_chars = get_settings().ingest_max_chars
+    if kind == 'text':
+        text = await asyncio.to_thread(file_path.read_text, errors="ignore")
+        resume = parse_template_latex(text)
+        if resume is not None:
+            ingested = IngestedResume(resume=resume, source="template")
+            cache.put(content_hash, ingested)
+            return ingested
+        text = text[:max_chars]
+    else:
+        try:
+            # Through the extraction cache, so the agent's later reads of this upload skip parsing
+            text = await extract_file_content_async(file_path, max_chars, content_hash=content_hash)
+        except DocumentParseError as e:
+            raise ResumeIngestionError(f"Could not read the document: {e}") from e
+
+    if not text.strip():
+        raise ResumeIngestionError("No text could be extracted from the document")
+
+    ingested = IngestedResume(resume=await _extract_with_llm(text), source="llm")
+    cache.put(content_hash, ingested)
+    return ingested
@@ -0,0 +1,174 @@
+"""
+Precompiled LaTeX preambles.
+
+The resume template's preamble is identical for every user, so it is dumped once into a
+pdflatex format file (`pdflatex -ini ... \\dump`) and each render only compiles the
+document body against it. Formats are keyed by the preamble text and the pdflatex binary,
+so editing the template or upgrading TeX builds a fresh one.
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.services.llm_handler import get_settings
+from app.services.tracing import logger
+
+PDFLATEX_COMMAND = ['pdflatex', '-interaction=nonstopmode']
+BEGIN_DOCUMENT = '\\begin{document}'
+
+
+@dataclass
+class CompileAttempt:
+    """One way of compiling a document: the .tex source to write and the command to run."""
+    source: str
+    command: list[str]
+    format_path: Optional[Path] = None
+
+
+def split_preamble(latex: str) -> Optional[tuple[str, str]]:
+    """
+    Split a document into (preamble, body) at `\\begin{document}`.
+    Returns None if the document has no body marker.
+    """
+    index = latex.find(BEGIN_DOCUMENT)
+    if index == -1:
+        return None
+    return latex[:index], latex[index:]
+
+
+def _engine_fingerprint() -> str:
+    # Formats are only valid for the exact binary that dumped them
+    engine = shutil.which(PDFLATEX_COMMAND[0])
+    if engine is None:
+        return ''
+    stat = os.stat(engine)
+    return f"{os.path.realpath(engine)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class FormatCache:
+    """
+    Builds and stores pdflatex format files for document preambles.
+    """
+    def __init__(self, cache_dir: str, timeout: float):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self._failed: set[str] = set()
+        self._lock = threading.Lock()
+
+    def make_key(self, preamble: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(_engine_fingerprint().encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(preamble.encode('utf-8'))
+        return f"resume-{digest.hexdigest()[:24]}"
+
+    def format_for(self, preamble: str) -> Optional[Path]:
+        """
+        Return the format file for `preamble`, building it on first use.
+        Returns None if the preamble cannot be dumped.
+        """
+        key = self.make_key(preamble)
+        path = self.cache_dir / f"{key}.fmt"
+        if path.exists():
+            return path
+        if key in self._failed:
+            return None
+        with self._lock:
+            if path.exists():
+                return path
+            if self._build(key, preamble, path):
+                return path
+            self._failed.add(key)
+            return None
+
+    def discard(self, path: Path):
+        """Forget a format that turned out to be unusable."""
+        self._failed.add(path.stem)
+        path.unlink(missing_ok=True)
+
+    def _build(self, key: str, preamble: str, path: Path) -> bool:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, 'preamble.tex'), 'w') as f:
+                f.write(preamble)
+                f.write('\n\\dump\n')
+            try:
+                subprocess.run(
+                    [PDFLATEX_COMMAND[0], '-ini', *PDFLATEX_COMMAND[1:], f'-jobname={key}', '&pdflatex', 'preamble.tex'],
+                    cwd=temp_dir,
+                    check=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    timeout=self.timeout
+                )
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.warning("Could not build LaTeX format %s: %s", key, e)
+                return False
+
+            built = os.path.join(temp_dir, f"{key}.fmt")
+            if not os.path.exists(built):
+                return False
+            tmp_path = path.with_suffix('.tmp')
+            shutil.move(built, tmp_path)
+            os.replace(tmp_path, path)
+            logger.info("Built LaTeX format %s", path)
+            return True
+
+
+@lru_cache()
+def get_format_cache() -> FormatCache:
+    """Create and cache the process-wide format cache."""
+    settings = get_settings()
+    return FormatCache(settings.latex_format_dir, settings.compile_timeout_seconds)
+
+
+def plan_compile(latex: str, use_format: Optional[bool] = None) -> list[CompileAttempt]:
+    """
+    Return the ways to compile `latex`, fastest first.
+
+    With a usable precompiled preamble the first attempt compiles only the body against it;
+    a plain full compile is always the last resort.
+    """
+    if use_format is None:
+        use_format = get_settings().latex_format_enabled
+
+    cold = CompileAttempt(source=latex, command=[*PDFLATEX_COMMAND, 'document.tex'])
+    parts = split_preamble(latex) if use_format else None
+    if parts is None:
+        return [cold]
+
+    preamble, body = parts
+    format_path = get_format_cache().format_for(preamble)
+    if format_path is None:
+        return [cold]
+    warm = CompileAttempt(
+        source=body,
+        command=[*PDFLATEX_COMMAND, f'-fmt={format_path.stem}', 'document.tex'],
+        format_path=format_path
+    )
+    return [warm, cold]
+
+
+def prepare_attempt(attempt: CompileAttempt, work_dir: str) -> str:
+    """
+    Write the attempt's source (and link its format) into `work_dir`; returns the .tex path.
+    """
+    tex_path = os.path.join(work_dir, 'document.tex')
+    with open(tex_path, 'w') as tex_file:
+        tex_file.write(attempt.source)
+    for name in ('document.pdf', 'document.aux'):
+        # Leftovers from a failed earlier attempt must not leak into this one
+        Path(work_dir, name).unlink(missing_ok=True)
+    if attempt.format_path is not None:
+        link = Path(work_dir, attempt.format_path.name)
+        if not link.exists():
+            link.symlink_to(attempt.format_path.resolve())
+    return tex_path
@@ -0,0 +1,179 @@
+"""
+Cache for LLM responses, used to skip the provider for repeated job description analyses.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.services.llm_handler import get_settings
+
+# Lines matching these are hiring boilerplate that doesn't change the analysis
+_BOILERPLATE_PATTERNS = re.compile(
+    r"equal (employment )?opportunity|affirmative action|\beeo\b|reasonable accommodation"
+    r"|protected veteran|without regard to|e-verify|privacy (policy|notice)"
+    r"|pay transparency|all qualified applicants",
+    re.IGNORECASE
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def is_boilerplate_line(line: str) -> bool:
+    """Whether a job description line is EEO/legal boilerplate."""
+    return bool(_BOILERPLATE_PATTERNS.search(line))
+
+
+def normalize_job_description(job_description: str) -> str:
+    """
+    Reduce a job description to the text that matters for analysis: unicode-normalized,
+    case-folded, whitespace-collapsed and without EEO/legal boilerplate lines.
+    """
+    text = unicodedata.normalize("NFKC", job_description)
+    lines = []
+    for line in text.splitlines():
+        line = _WHITESPACE.sub(" ", line).strip().casefold()
+        if line and not is_boilerplate_line(line):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def make_analysis_key(job_description: str, resume_hash: str, model: str, prompt_version: str) -> str:
+    """
+    Cache key for one analysis of a job description against a resume.
+
+    The session's earlier conversation is not part of the key, so analyses that may be
+    cached must be made without it.
+    """
+    payload = json.dumps(
+        [normalize_job_description(job_description), resume_hash, model, prompt_version],
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class InMemoryLRUBackend:
+    """Process-local backend holding at most `max_entries` responses."""
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple[str, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SQLiteBackend:
+    """On-disk backend, shared by every worker process pointing at the same file."""
+    def __init__(self, path: str, max_entries: int = 10000):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return row
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+
+class ResponseCache:
+    """
+    TTL-bounded response cache over a pluggable backend, with hit-rate counters.
+    """
+    def __init__(self, backend, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.backend.get(key)
+        if entry is not None:
+            value, created_at = entry
+            if time.time() - created_at < self.ttl_seconds:
+                with self._lock:
+                    self.hits += 1
+                return value
+            self.backend.delete(key)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: str):
+        self.backend.set(key, value)
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+
+@lru_cache()
+def get_analysis_cache() -> Optional[ResponseCache]:
+    """
+    Create and cache the job analysis response cache, or None if caching is disabled.
+    """
+    settings = get_settings()
+    if settings.llm_cache_backend == "sqlite":
+        backend = SQLiteBackend(settings.llm_cache_path, settings.llm_cache_max_entries)
+    elif settings.llm_cache_backend == "memory":
+        backend = InMemoryLRUBackend(settings.llm_cache_max_entries)
+    else:
+        return None
+    return ResponseCache(backend, settings.llm_cache_ttl_seconds)
@@ -1,10 +1,12 @@
 import os
+import threading
+import httpx
 from pydantic_settings import BaseSettings
 from typing import Optional
 from functools import lru_cache
 
-from langchain.chat_models import init_chat_model
-from langchain_google_genai import ChatGoogleGenerativeAI
+from app.services.memory import ConversationHistory, summarize_with_model
+from app.services.tracing import LLMMetricsHandler, logger
 
 
 
@@ -16,6 +18,8 @@ class Settings(BaseSettings):
     # OpenAI settings
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     openai_model_name: str = os.getenv("OPENAI_MODEL_NAME", "gpt-4o")
+    # OpenAI-compatible endpoint to use instead of api.openai.com, e.g. the load-test mock server
+    openai_base_url: Optional[str] = os.getenv("OPENAI_BASE_URL")
     
     # Google Gemini settings
     gemini_api_key: Optional[str] = os.getenv("GEMINI_API_KEY")
@@ -28,10 +32,82 @@ class Settings(BaseSettings):
     # Default parameter settings
     max_tokens_default: int = int(os.getenv("MAX_TOKENS_DEFAULT", "1000"))
     temperature_default: float = float(os.getenv("TEMPERATURE_DEFAULT", "0.3"))
+
+    # LLM client connection settings
+    llm_max_connections: int = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+    llm_max_keepalive_connections: int = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    llm_keepalive_expiry_seconds: float = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    llm_timeout_seconds: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    llm_max_retries: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
     
     # System prompt settings
     default_prompt_type: str = os.getenv("DEFAULT_PROMPT_TYPE", "default")
-    
+
+    # Agent execution settings
+    agent_max_concurrency: int = int(os.getenv("AGENT_MAX_CONCURRENCY", "4"))
+    agent_max_queue: int = int(os.getenv("AGENT_MAX_QUEUE", "16"))
+    agent_retry_after_seconds: int = int(os.getenv("AGENT_RETRY_AFTER_SECONDS", "5"))
+
+    # Session settings
+    session_ttl_seconds: int = int(os.getenv("SESSION_TTL_SECONDS", "3600"))
+    session_max_count: int = int(os.getenv("SESSION_MAX_COUNT", "5000"))
+    session_max_bytes: int = int(os.getenv("SESSION_MAX_BYTES", str(256 * 1024 * 1024)))
+    session_max_resume_versions: int = int(os.getenv("SESSION_MAX_RESUME_VERSIONS", "50"))
+
+    # PDF cache settings
+    pdf_cache_dir: str = os.getenv("PDF_CACHE_DIR", "app/uploads/.pdf_cache")
+    pdf_cache_max_bytes: int = int(os.getenv("PDF_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+    # LaTeX compile service settings
+    compile_workers: int = int(os.getenv("COMPILE_WORKERS", "2"))
+    compile_queue_size: int = int(os.getenv("COMPILE_QUEUE_SIZE", "64"))
+    compile_timeout_seconds: float = float(os.getenv("COMPILE_TIMEOUT_SECONDS", "60"))
+    compile_output_dir: str = os.getenv("COMPILE_OUTPUT_DIR", "app/uploads/renders")
+    compile_max_jobs: int = int(os.getenv("COMPILE_MAX_JOBS", "1000"))
+    latex_format_enabled: bool = os.getenv("LATEX_FORMAT_ENABLED", "true").lower() == "true"
+    latex_format_dir: str = os.getenv("LATEX_FORMAT_DIR", "app/uploads/.fmt_cache")
+
+    # Template settings; an empty bytecode cache dir disables the on-disk cache
+    template_bytecode_cache_dir: str = os.getenv("TEMPLATE_BYTECODE_CACHE_DIR", "app/uploads/.jinja_cache")
+
+    # Upload settings
+    upload_dir: str = os.getenv("UPLOAD_DIR", "app/uploads/files")
+    upload_max_bytes: int = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+    upload_chunk_size: int = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+    extraction_cache_dir: str = os.getenv("EXTRACTION_CACHE_DIR", "app/uploads/.extract_cache")
+    extraction_cache_max_bytes: int = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    resume_cache_dir: str = os.getenv("RESUME_CACHE_DIR", "app/uploads/.resume_cache")
+    ingest_max_chars: int = int(os.getenv("INGEST_MAX_CHARS", "20000"))
+    ingest_max_tokens: int = int(os.getenv("INGEST_MAX_TOKENS", "6000"))
+
+    # Document parser settings; a max page count of 0 reads every page
+    parse_workers: int = int(os.getenv("PARSE_WORKERS", "2"))
+    parse_timeout_seconds: float = float(os.getenv("PARSE_TIMEOUT_SECONDS", "15"))
+    parse_max_memory_mb: int = int(os.getenv("PARSE_MAX_MEMORY_MB", "512"))
+    parse_max_pages: int = int(os.getenv("PARSE_MAX_PAGES", "50"))
+
+    # LLM response cache settings; backend is "memory", "sqlite" or "none"
+    llm_cache_backend: str = os.getenv("LLM_CACHE_BACKEND", "memory")
+    llm_cache_path: str = os.getenv("LLM_CACHE_PATH", "app/uploads/.llm_cache.sqlite3")
+    llm_cache_ttl_seconds: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 3600)))
+    llm_cache_max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+
+    # Startup warm-up; /api/ready reports ready once it finishes or times out
+    warmup_enabled: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    warmup_llm: bool = os.getenv("WARMUP_LLM", "true").lower() == "true"
+    warmup_latex: bool = os.getenv("WARMUP_LATEX", "true").lower() == "true"
+    warmup_timeout_seconds: float = float(os.getenv("WARMUP_TIMEOUT_SECONDS", "120"))
+
+    # Conversation memory: turns kept verbatim, token budget, and the rolling summary's size
+    memory_max_turns: int = int(os.getenv("MEMORY_MAX_TURNS", "4"))
+    memory_max_tokens: int = int(os.getenv("MEMORY_MAX_TOKENS", "4000"))
+    memory_summary_max_tokens: int = int(os.getenv("MEMORY_SUMMARY_MAX_TOKENS", "400"))
+    memory_summarize: bool = os.getenv("MEMORY_SUMMARIZE", "true").lower() == "true"
+    agent_memory_max_turns: int = int(os.getenv("AGENT_MEMORY_MAX_TURNS", "10"))
+
+    # Prompt budgets: job descriptions beyond this many tokens are trimmed, least useful sections first
+    prompt_job_max_tokens: int = int(os.getenv("PROMPT_JOB_MAX_TOKENS", "1500"))
+
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8"
@@ -43,44 +119,128 @@ def get_settings() -> Settings:
     return Settings() 
 
 
+_chat_models: dict = {}
+_chat_models_lock = threading.Lock()
+
+SUPPORTED_PROVIDERS = ("openai", "claude", "gemini")
+
+
+def _resolve_provider(provider: Optional[str]) -> str:
+    provider = provider or get_settings().default_llm_provider
+    # Default to OpenAI if provider not recognized
+    return provider if provider in SUPPORTED_PROVIDERS else "openai"
+
+
+def _build_chat_model(provider: str):
+    """
+    Construct the chat model, and its HTTP connection pool, for a provider.
+    Every model carries a metrics handler that times its calls and counts tokens.
+    """
+    settings = get_settings()
+    # Provider SDKs are imported here, so only the configured provider's is ever loaded
+    if provider == "claude":
+        from langchain.chat_models import init_chat_model
+        # ChatAnthropic keeps one pooled httpx client per model instance
+        return init_chat_model(
+            settings.anthropic_model_name,
+            api_key=settings.anthropic_api_key,
+            callbacks=[LLMMetricsHandler(provider, settings.anthropic_model_name)],
+            timeout=settings.llm_timeout_seconds,
+            max_retries=settings.llm_max_retries
+        )
+    if provider == "gemini":
+        # Use ChatGoogleGenerativeAI directly instead of init_chat_model
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(
+            model=settings.gemini_model_name,
+            google_api_key=settings.gemini_api_key,
+            callbacks=[LLMMetricsHandler(provider, settings.gemini_model_name)],
+            timeout=settings.llm_timeout_seconds,
+            max_retries=settings.llm_max_retries
+        )
+
+    from langchain.chat_models import init_chat_model
+    limits = httpx.Limits(
+        max_connections=settings.llm_max_connections,
+        max_keepalive_connections=settings.llm_max_keepalive_connections,
+        keepalive_expiry=settings.llm_keepalive_expiry_seconds
+    )
+    timeout = httpx.Timeout(settings.llm_timeout_seconds)
+    return init_chat_model(
+        settings.openai_model_name,
+        api_key=settings.openai_api_key,
+        base_url=settings.openai_base_url,
+        callbacks=[LLMMetricsHandler(provider, settings.openai_model_name)],
+        # Ask for token usage on streamed replies too, so streamed calls are counted
+        stream_usage=True,
+        http_client=httpx.Client(limits=limits, timeout=timeout),
+        http_async_client=httpx.AsyncClient(limits=limits, timeout=timeout),
+        timeout=settings.llm_timeout_seconds,
+        max_retries=settings.llm_max_retries
+    )
+
+
+def get_chat_model(provider: Optional[str] = None):
+    """
+    Return the shared chat model for `provider` (the configured default if omitted).
+
+    Models are built on first use and then reused by every handler, tool and request,
+    so each provider has a single keep-alive connection pool per process.
+    """
+    provider = _resolve_provider(provider)
+    model = _chat_models.get(provider)
+    if model is None:
+        with _chat_models_lock:
+            model = _chat_models.get(provider)
+            if model is None:
+                logger.info("Initializing %s chat model", provider)
+                model = _build_chat_model(provider)
+                _chat_models[provider] = model
+    return model
+
+
 class LLMHandler:
     """
     Handler for LLM interactions using LangChain with support for multiple providers.
     """
     def __init__(self, provider: Optional[str] = None):
         self.settings = get_settings()
-        self.provider = provider or self.settings.default_llm_provider
-        print(f"Using {self.provider} as LLM provider")
-        self._initialize_model()
+        self.provider = _resolve_provider(provider)
+        logger.info("Using %s as LLM provider", self.provider)
         # Initialize conversation history
-        self.conversation_history = []
+        self.conversation_history = self.new_history()
         # self._initialize_tokenizer()
-    
-    def _initialize_model(self):
-        """Initialize the appropriate LLM model based on settings."""
-        if self.provider == "openai":
-            self.model = init_chat_model(
-                self.settings.openai_model_name,
-                api_key=self.settings.openai_api_key
-            )
-        elif self.provider == "claude":
-            self.model = init_chat_model(
-                self.settings.anthropic_model_name,
-                api_key=self.settings.anthropic_api_key
-            )
-        elif self.provider == "gemini":
-            # Use ChatGoogleGenerativeAI directly instead of init_chat_model
-            self.model = ChatGoogleGenerativeAI(
-                model=self.settings.gemini_model_name,
-                google_api_key=self.settings.gemini_api_key
-            )
-        else:
-            # Default to OpenAI if provider not recognized
-            self.provider = "openai"  # Set to default
-            self.model = init_chat_model(
-                self.settings.openai_model_name,
-                api_key=self.settings.openai_api_key
-            )
+
+    def new_history(self) -> ConversationHistory:
+        """
+        A token-budgeted conversation history whose older turns are summarized by this
+        handler's model in the background.
+        """
+        settings = self.settings
+        summarizer = None
+        if settings.memory_summarize:
+            def summarizer(previous_summary: str, messages: list) -> str:
+                return summarize_with_model(self.model, previous_summary, messages, settings.memory_summary_max_tokens)
+        return ConversationHistory(
+            max_turns=settings.memory_max_turns,
+            max_tokens=settings.memory_max_tokens,
+            summary_max_tokens=settings.memory_summary_max_tokens,
+            summarizer=summarizer
+        )
+
+    @property
+    def model(self):
+        """The provider's shared chat model."""
+        return get_chat_model(self.provider)
+
+    @property
+    def model_name(self) -> str:
+        """Name of the configured model for this handler's provider."""
+        if self.provider == "claude":
+            return self.settings.anthropic_model_name
+        if self.provider == "gemini":
+            return self.settings.gemini_model_name
+        return self.settings.openai_model_name
     
     def add_to_history(self, role: str, content: str):
         """Add a message to conversation history."""
@@ -88,13 +248,13 @@ class LLMHandler:
     
     def clear_history(self):
         """Clear conversation history."""
-        self.conversation_history = []
+        self.conversation_history.clear()
     
     def get_history(self):
         """Get current conversation history."""
-        return self.conversation_history.copy()
+        return list(self.conversation_history)
     
-    def invoke_with_history(self, system_message: str, user_message: str, add_to_history: bool = False):
+    def invoke_with_history(self, system_message: str, user_message: str, add_to_history: bool = False, history: Optional[ConversationHistory] = None):
         """
         Invoke the model with conversation history.
         
@@ -102,13 +262,18 @@ class LLMHandler:
             system_message: System prompt for the LLM
             user_message: User message to add
             add_to_history: Whether to store this conversation in history
+            history: History to use instead of this handler's own, e.g. a session's; only its
+                recent turns and the summary of older ones are sent
         
         Returns:
             Response from the LLM
         """
+        if history is None:
+            history = self.conversation_history
+
         # Build the full conversation
         messages = [("system", system_message)]
-        messages.extend(self.conversation_history)
+        messages.extend(history)
         messages.append(("user", user_message))
         
         # Invoke the model
@@ -116,9 +281,9 @@ class LLMHandler:
         
         # Optionally add to history
         if add_to_history:
-            self.add_to_history("user", user_message)
+            history.append(("user", user_message))
             response_content = response.content if hasattr(response, "content") else str(response)
-            self.add_to_history("assistant", response_content)
+            history.append(("assistant", response_content))
         
         return response
 
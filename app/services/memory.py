@@ -0,0 +1,172 @@
+"""
+Token-budgeted conversation memory.
+
+The last few turns are kept verbatim; older turns are folded into a rolling summary by
+a background summarizer, so what gets resent to the LLM stays roughly constant in size
+however long a session runs.
+"""
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+
+from app.services.prompt import SUMMARY_PROMPT
+from app.services.tracing import logger
+from app.utils.tokens import count_message_tokens, count_tokens, truncate_to_tokens
+
+# (previous summary, messages to fold in) -> new summary
+Summarizer = Callable[[str, list[tuple[str, str]]], str]
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+# Summaries are produced off the request path; one pool is shared by every session
+_summarizer_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="summarizer")
+
+
+def summarize_with_model(model, previous_summary: str, messages: list[tuple[str, str]], max_tokens: int) -> str:
+    """Ask `model` to fold `messages` into `previous_summary`."""
+    transcript = "\n\n".join(f"{role.upper()}: {content}" for role, content in messages)
+    response = model.invoke([
+        ("system", "You summarize conversations between a user and a resume assistant."),
+        ("user", SUMMARY_PROMPT.format(
+            summary=previous_summary or "(none yet)",
+            transcript=transcript,
+            max_words=max(50, int(max_tokens * 0.7))
+        ))
+    ])
+    return response.content if hasattr(response, "content") else str(response)
+
+
+def _extract(previous_summary: str, messages: list[tuple[str, str]]) -> str:
+    # Used when the summarizer fails: keep the opening line of each message
+    lines = [previous_summary] if previous_summary else []
+    for role, content in messages:
+        first_line = str(content).strip().split("\n", 1)[0]
+        lines.append(f"{role}: {first_line[:200]}")
+    return "\n".join(lines)
+
+
+class ConversationHistory:
+    """
+    A chat history of (role, content) messages with a token budget.
+
+    Iterating yields what should be sent to the model: the rolling summary (as a system
+    message), turns evicted but not yet summarized, and the most recent turns verbatim.
+    A turn starts at each "user" message. After every append, the oldest turns are
+    evicted while there are more than `max_turns` of them or they exceed `max_tokens`;
+    the latest turn is always kept whole. Without a summarizer, evicted turns are kept
+    as short extracts instead.
+    """
+    def __init__(
+        self,
+        max_turns: int = 4,
+        max_tokens: int = 4000,
+        summary_max_tokens: int = 400,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        self.max_turns = max(1, max_turns)
+        self.max_tokens = max_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.summarizer = summarizer
+        self.summary = ""
+        self.summarized_turns = 0
+        self._messages: list[tuple[str, str]] = []
+        self._pending: list[tuple[str, str]] = []
+        self._summarizing = False
+        self._lock = threading.RLock()
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        return iter(self.messages())
+
+    def __len__(self) -> int:
+        return len(self.messages())
+
+    def __bool__(self) -> bool:
+        return bool(self.summary or self._pending or self._messages)
+
+    def messages(self) -> list[tuple[str, str]]:
+        with self._lock:
+            summary = [("system", SUMMARY_PREFIX + self.summary)] if self.summary else []
+            return summary + self._pending + self._messages
+
+    def append(self, message: tuple[str, str]):
+        with self._lock:
+            self._messages.append(message)
+            if message[0] != "user":
+                self._trim()
+
+    def extend(self, messages):
+        for message in messages:
+            self.append(message)
+
+    def clear(self):
+        with self._lock:
+            self._messages.clear()
+            self._pending.clear()
+            self.summary = ""
+            self.summarized_turns = 0
+
+    def token_count(self) -> int:
+        """Tokens the history adds to a prompt."""
+        return count_message_tokens(self.messages())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "verbatim_turns": len(self._turn_starts()),
+                "pending_messages": len(self._pending),
+                "summarized_turns": self.summarized_turns,
+                "summary_tokens": count_tokens(self.summary),
+                "tokens": self.token_count(),
+            }
+
+    def _turn_starts(self) -> list[int]:
+        return [index for index, (role, _) in enumerate(self._messages) if role == "user"] or ([0] if self._messages else [])
+
+    def _trim(self):
+        evicted = []
+        while True:
+            starts = self._turn_starts()
+            if len(starts) <= 1:
+                break
+            if len(starts) <= self.max_turns and count_message_tokens(self._messages) <= self.max_tokens:
+                break
+            evicted.extend(self._messages[:starts[1]])
+            del self._messages[:starts[1]]
+        if not evicted:
+            return
+
+        if self.summarizer is None:
+            self.summary = truncate_to_tokens(_extract(self.summary, evicted), self.summary_max_tokens, keep="tail")
+            self.summarized_turns += sum(1 for role, _ in evicted if role == "user")
+            return
+
+        self._pending.extend(evicted)
+        # Until the summarizer catches up, evicted turns still count against the budget
+        while len(self._pending) > 1 and count_message_tokens(self._pending) > self.max_tokens:
+            self.summary = truncate_to_tokens(_extract(self.summary, [self._pending.pop(0)]), self.summary_max_tokens, keep="tail")
+        if not self._summarizing:
+            self._summarizing = True
+            # Copy the context so the summary's LLM usage is attributed to this session
+            _summarizer_pool.submit(contextvars.copy_context().run, self._summarize)
+
+    def _summarize(self):
+        while True:
+            with self._lock:
+                batch = list(self._pending)
+                previous = self.summary
+                if not batch:
+                    self._summarizing = False
+                    return
+            try:
+                summary = self.summarizer(previous, batch)
+            except Exception as e:
+                logger.warning("Conversation summary failed, keeping extracts instead: %s", e)
+                summary = _extract(previous, batch)
+            with self._lock:
+                # clear() may have run meanwhile; only fold in messages that are still pending
+                if self._pending[:len(batch)] == batch:
+                    del self._pending[:len(batch)]
+                    self.summary = truncate_to_tokens(summary, self.summary_max_tokens, keep="tail")
+                    self.summarized_turns += sum(1 for role, _ in batch if role == "user")
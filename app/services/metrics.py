@@ -0,0 +1,192 @@
+"""
+In-process metrics registry rendered in the Prometheus text exposition format.
+
+Counters and histograms are updated directly by the code they measure; components that
+already keep their own counters (caches, the command router, the document parser)
+are read at scrape time through collectors instead of being duplicated.
+"""
+
+import math
+import threading
+from typing import Callable, Iterable, Optional
+
+# Latency buckets in seconds, spanning template renders (ms) to LLM calls and compiles (tens of s)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# (metric name, labels, value)
+Sample = tuple[str, dict, float]
+
+
+def _escape(text: str, quote: bool = True) -> str:
+    text = text.replace("\\", "\\\\").replace("\n", "\\n")
+    return text.replace('"', '\\"') if quote else text
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[Sample]:
+        with self._lock:
+            return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, plus their count and sum."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def samples(self) -> list[Sample]:
+        samples = []
+        with self._lock:
+            for key, state in self._values.items():
+                labels = dict(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, count in zip((*self.buckets, math.inf), state[:-1]):
+                    cumulative += count
+                    samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+                samples.append((f"{self.name}_count", labels, cumulative))
+                samples.append((f"{self.name}_sum", labels, state[-1]))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Named metrics plus scrape-time collectors, rendered together by `render()`.
+    """
+    def __init__(self, namespace: str = ""):
+        self.namespace = namespace
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[tuple[str, str, Callable[[], Optional[dict]]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                # Registering the same metric twice (e.g. on module reload) returns the original
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered with a different type or labels")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def _full_name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(self._full_name(name), help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self._full_name(name), help, labelnames, buckets))
+
+    def register_stats(self, prefix: str, help: str, stats: Callable[[], Optional[dict]]):
+        """
+        Export every numeric value of a component's `stats()` dict as a gauge named
+        `<namespace>_<prefix>_<key>`, read at scrape time. `stats` may return None when
+        the component is disabled.
+        """
+        with self._lock:
+            self._collectors.append((self._full_name(prefix), help, stats))
+
+    def _collect(self) -> list[tuple[str, str, str, list[Sample]]]:
+        families = []
+        for prefix, help, stats in self._collectors:
+            try:
+                values = stats() or {}
+            except Exception as e:
+                # Imported here: tracing imports this module
+                from app.services.tracing import logger
+                logger.warning("Metrics collector %s failed: %s", prefix, e)
+                continue
+            for key, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                # e.g. the router's "fast_path:Change Name" -> fast_path_change_name
+                name = f"{prefix}_" + "".join(c if c.isalnum() else "_" for c in key.lower()).strip("_")
+                families.append((name, "gauge", f"{help} ({key})", [(name, {}, value)]))
+        return families
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        families = [(metric.name, metric.kind, metric.help, metric.samples()) for metric in metrics]
+        families += self._collect()
+
+        lines = []
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {_escape(help, quote=False)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Create a singleton instance
+metrics = MetricsRegistry(namespace="resume_bot")
@@ -0,0 +1,237 @@
+"""
+Batch resume patches: apply a whole set of edits in one pass, all or nothing.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.models.resume import ExperienceEntry, Resume, TechnicalSkillEntry
+
+SET = "SET"
+SKILLS = "SKILLS"
+ADD_SKILL = "ADD_SKILL"
+DELETE_CATEGORY = "DELETE_CATEGORY"
+DELETE_SKILL = "DELETE_SKILL"
+EXPERIENCE = "EXPERIENCE"
+
+# Normalized field name -> Resume attribute, for SET operations
+SETTABLE_FIELDS = {
+    "name": "name",
+    "location": "location",
+    "phone": "phone",
+    "email": "email",
+    "linkedin": "linkedinUrl",
+    "linkedinurl": "linkedinUrl",
+    "github": "githubUrl",
+    "githuburl": "githubUrl",
+}
+
+# Operations in the pipe format are separated by newlines or ";;"
+_OPERATION_SEPARATOR = re.compile(r"\n|;;")
+
+
+class PatchError(Exception):
+    """Raised when a patch cannot be parsed or applied; nothing is changed."""
+
+
+@dataclass
+class PatchOperation:
+    """A single edit: `op` applied to the field, category or company named by `target`."""
+    op: str
+    target: str
+    values: list[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        values = [",".join(self.values)] if self.op == SKILLS else self.values
+        return "|".join([self.op, self.target, *values])
+
+
+@dataclass
+class PatchResult:
+    """The patched resume and a description of each applied operation."""
+    resume: Resume
+    applied: list[str]
+
+
+def normalize_name(name: str) -> str:
+    return re.sub(r"[^a-z0-9+#]+", " ", name.lower()).strip()
+
+
+class NameIndex:
+    """
+    Maps normalized names to list positions.
+
+    Lookups are exact on the normalized name, falling back to a containment match only
+    when exactly one indexed name qualifies.
+    """
+    def __init__(self, names: list[str]):
+        self._positions: dict[str, int] = {}
+        for position, name in enumerate(names):
+            self._positions.setdefault(normalize_name(name), position)
+
+    def find(self, name: str) -> Optional[int]:
+        key = normalize_name(name)
+        if not key:
+            return None
+        if key in self._positions:
+            return self._positions[key]
+        candidates = {position for indexed, position in self._positions.items() if key in indexed or indexed in key}
+        return candidates.pop() if len(candidates) == 1 else None
+
+    def add(self, name: str, position: int):
+        self._positions.setdefault(normalize_name(name), position)
+
+    def remove(self, position: int):
+        self._positions = {key: value for key, value in self._positions.items() if value != position}
+
+
+def parse_patch(text: str) -> list[PatchOperation]:
+    """
+    Parse operations written one per line (or separated by ";;") in the pipe format:
+
+        SET|field|value
+        SKILLS|category|skill1,skill2
+        ADD_SKILL|category|skill
+        DELETE_CATEGORY|category
+        DELETE_SKILL|category|skill
+        EXPERIENCE|company|bullet_point_1|bullet_point_2
+    """
+    operations = []
+    for line in _OPERATION_SEPARATOR.split(text or ""):
+        line = line.strip()
+        if not line:
+            continue
+        parts = [part.strip() for part in line.split("|")]
+        op = parts[0].upper()
+        args = parts[1:]
+        if op == SET and len(args) == 2:
+            operations.append(PatchOperation(op, args[0], [args[1]]))
+        elif op == SKILLS and len(args) == 2:
+            operations.append(PatchOperation(op, args[0], [item.strip() for item in args[1].split(",") if item.strip()]))
+        elif op in (ADD_SKILL, DELETE_SKILL) and len(args) == 2:
+            operations.append(PatchOperation(op, args[0], [args[1]]))
+        elif op == DELETE_CATEGORY and len(args) == 1:
+            operations.append(PatchOperation(op, args[0]))
+        elif op == EXPERIENCE and len(args) >= 2:
+            operations.append(PatchOperation(op, args[0], [bullet for bullet in args[1:] if bullet]))
+        else:
+            raise PatchError(f"Invalid operation: {line}")
+    if not operations:
+        raise PatchError("No operations given")
+    return operations
+
+
+def parse_optimization_suggestions(content: str) -> Optional[list[PatchOperation]]:
+    """
+    Turn the JSON object in an auto-optimize LLM response into patch operations.
+
+    Returns None when the response holds no JSON object; malformed JSON raises
+    json.JSONDecodeError.
+    """
+    json_start = content.find('{')
+    json_end = content.rfind('}') + 1
+    if json_start == -1 or json_end <= json_start:
+        return None
+    parsed_data = json.loads(content[json_start:json_end])
+
+    operations = []
+    # The prompt example capitalizes the keys, so accept either spelling
+    for skill_category in parsed_data.get("technicalSkills", parsed_data.get("TechnicalSkills", [])):
+        if skill_category.get("category") and skill_category.get("items"):
+            operations.append(PatchOperation(SKILLS, skill_category["category"], list(skill_category["items"])))
+    for exp_item in parsed_data.get("experience", parsed_data.get("Experience", [])):
+        if exp_item.get("company") and exp_item.get("description"):
+            operations.append(PatchOperation(EXPERIENCE, exp_item["company"], list(exp_item["description"])))
+    return operations
+
+
+def apply_patch(resume: Resume, operations: list[PatchOperation]) -> PatchResult:
+    """
+    Apply every operation to `resume` and return the patched copy.
+
+    The input resume is never modified, so if any operation fails a PatchError is raised
+    and the caller keeps the original: the batch commits or rolls back as a whole.
+    """
+    skills: list[Optional[TechnicalSkillEntry]] = list(resume.technicalSkills)
+    experience = list(resume.experience)
+    skill_index = NameIndex([skill.category for skill in skills])
+    experience_index = NameIndex([entry.company for entry in experience])
+    fields: dict[str, str] = {}
+    skills_changed = experience_changed = False
+    applied = []
+
+    for number, operation in enumerate(operations, start=1):
+        op, target, values = operation.op, operation.target, operation.values
+        if not target:
+            raise PatchError(f"Operation {number} ({operation.describe()}): missing target")
+
+        if op == SET:
+            attribute = SETTABLE_FIELDS.get(normalize_name(target).replace(" ", ""))
+            if attribute is None:
+                raise PatchError(f"Operation {number} ({operation.describe()}): unknown field '{target}'")
+            fields[attribute] = values[0]
+
+        elif op in (SKILLS, ADD_SKILL):
+            if not values:
+                raise PatchError(f"Operation {number} ({operation.describe()}): no skills given")
+            position = skill_index.find(target)
+            if position is None:
+                skill_index.add(target, len(skills))
+                skills.append(TechnicalSkillEntry(category=target, items=tuple(values)))
+            elif op == SKILLS:
+                skills[position] = skills[position].model_copy(update={"category": target, "items": tuple(values)})
+            else:
+                skill = skills[position]
+                if NameIndex(skill.items).find(values[0]) is None:
+                    skills[position] = skill.model_copy(update={"items": (*skill.items, values[0])})
+            skills_changed = True
+
+        elif op == DELETE_CATEGORY:
+            position = skill_index.find(target)
+            if position is None:
+                raise PatchError(f"Operation {number} ({operation.describe()}): category '{target}' not found")
+            skills[position] = None
+            skill_index.remove(position)
+            skills_changed = True
+
+        elif op == DELETE_SKILL:
+            position = skill_index.find(target)
+            if position is None:
+                raise PatchError(f"Operation {number} ({operation.describe()}): category '{target}' not found")
+            skill = skills[position]
+            item_position = NameIndex(skill.items).find(values[0])
+            if item_position is None:
+                raise PatchError(f"Operation {number} ({operation.describe()}): '{values[0]}' not found in '{skill.category}'")
+            items = skill.items[:item_position] + skill.items[item_position + 1:]
+            if items:
+                skills[position] = skill.model_copy(update={"items": items})
+            else:
+                # An emptied category is removed entirely
+                skills[position] = None
+                skill_index.remove(position)
+            skills_changed = True
+
+        elif op == EXPERIENCE:
+            if not values:
+                raise PatchError(f"Operation {number} ({operation.describe()}): no bullet points given")
+            position = experience_index.find(target)
+            if position is None:
+                experience_index.add(target, len(experience))
+                experience.append(ExperienceEntry(company=target, description=tuple(values)))
+            else:
+                experience[position] = experience[position].model_copy(update={"description": tuple(values)})
+            experience_changed = True
+
+        else:
+            raise PatchError(f"Operation {number}: unknown operation '{op}'")
+        applied.append(operation.describe())
+
+    update = dict(fields)
+    if skills_changed:
+        update["technicalSkills"] = tuple(skill for skill in skills if skill is not None)
+    if experience_changed:
+        update["experience"] = tuple(experience)
+    # Untouched lists and entries are shared with the input resume
+    return PatchResult(resume=resume.model_copy(update=update) if update else resume, applied=applied)
@@ -0,0 +1,119 @@
+"""
+Content-addressed on-disk cache of compiled resume PDFs.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+from app.services.llm_handler import get_settings
+
+
+class PdfCache:
+    """
+    Stores compiled PDFs under the hash of the LaTeX source and template version.
+
+    Entries are evicted least-recently-used first once the store exceeds `max_bytes`.
+    """
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._load_index()
+
+    @staticmethod
+    def make_key(latex: str, template_version: str) -> str:
+        """Cache key for a rendered LaTeX document and the template it came from."""
+        digest = hashlib.sha256()
+        digest.update(template_version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(latex.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pdf"
+
+    def _load_index(self):
+        # Rebuild LRU order from what is already on disk, oldest access first
+        entries = []
+        for path in self.cache_dir.glob("*.pdf"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def copy_to(self, key: str, dest_path) -> bool:
+        """
+        Copy the cached PDF for `key` to `dest_path`; returns False on a miss.
+
+        The copy happens under the lock, so a concurrent put can't evict the file
+        midway through it.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return False
+            path = self._path(key)
+            try:
+                shutil.copyfile(path, dest_path)
+            except FileNotFoundError:
+                # Removed behind our back
+                self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return False
+            self._entries.move_to_end(key)
+            self.hits += 1
+            os.utime(path)
+        return True
+
+    def put(self, key: str, pdf_path: str) -> Path:
+        """Copy a freshly compiled PDF into the cache and return its cached path."""
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(pdf_path, tmp_path)
+        os.replace(tmp_path, path)
+        size = path.stat().st_size
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+        return path
+
+    def _evict(self):
+        while self._entries and self._total_bytes > self.max_bytes:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+        }
+
+
+@lru_cache()
+def get_pdf_cache() -> PdfCache:
+    """Create and cache the process-wide PDF cache."""
+    settings = get_settings()
+    return PdfCache(settings.pdf_cache_dir, settings.pdf_cache_max_bytes)
@@ -0,0 +1,81 @@
+"""
+Single-pass "analyze + optimize" pipeline: one structured LLM call, no agent routing.
+"""
+
+from app.models.optimization import ResumeChange, ResumeOptimization
+from app.models.resume import Resume
+from app.services.llm_handler import llm_handler
+from app.services.prompt import OPTIMIZATION_PROMPT
+from app.services.patch import EXPERIENCE, SKILLS, NameIndex, PatchOperation, apply_patch
+from app.services.prompt_builder import build_prompt, fit_job_description
+from app.services.session import Session
+from app.services.tracing import logger
+
+
+def diff_resumes(before: Resume, after: Resume) -> list[ResumeChange]:
+    """
+    List the technical skill categories and experience bullets that differ between two resumes.
+
+    Categories and companies are matched the way patches match them (see NameIndex), so
+    a respelled name is reported as a change to the existing entry, not as a new one.
+    """
+    changes = []
+
+    skill_index = NameIndex([skill.category for skill in before.technicalSkills])
+    for skill in after.technicalSkills:
+        position = skill_index.find(skill.category)
+        old_items = None if position is None else before.technicalSkills[position].items
+        if old_items != skill.items:
+            changes.append(ResumeChange(
+                section="technicalSkills", key=skill.category, before=old_items or [], after=skill.items
+            ))
+
+    experience_index = NameIndex([exp.company for exp in before.experience])
+    for exp in after.experience:
+        position = experience_index.find(exp.company)
+        old_description = None if position is None else before.experience[position].description
+        if old_description != exp.description:
+            changes.append(ResumeChange(
+                section="experience", key=exp.company, before=old_description or [], after=exp.description
+            ))
+
+    return changes
+
+
+def optimize_resume(session: Session, job_description: str) -> tuple[ResumeOptimization, list[ResumeChange]]:
+    """
+    Score the session's resume against a job description and apply the suggested
+    changes, all from a single structured-output LLM call.
+    """
+    snapshot = session.snapshot
+    prompt = build_prompt(
+        "optimize",
+        OPTIMIZATION_PROMPT,
+        {"job_description": fit_job_description(job_description), "resume": snapshot.compact_json},
+        originals={"job_description": job_description, "resume": snapshot.json}
+    ).text
+    structured_model = llm_handler.model.with_structured_output(ResumeOptimization)
+    logger.info("Single-pass optimization LLM call invoked")
+    optimization = structured_model.invoke([
+        ("system", "You are a resume optimization expert."),
+        ("user", prompt)
+    ])
+    logger.info("Single-pass optimization LLM call completed")
+
+    # Applied as one patch, matched like the chat's auto-optimize; edits are
+    # copy-on-write, so the snapshot still holds the "before" version
+    operations = [
+        PatchOperation(SKILLS, skill.category, list(skill.items))
+        for skill in optimization.technicalSkills if skill.category and skill.items
+    ] + [
+        PatchOperation(EXPERIENCE, exp.company, list(exp.description))
+        for exp in optimization.experience if exp.company and exp.description
+    ]
+    resume = apply_patch(snapshot.resume, operations).resume
+    session.resume = resume
+
+    # Record the analysis so follow-up chat tools can build on it
+    session.analysis_history.append(("user", prompt))
+    session.analysis_history.append(("assistant", optimization.model_dump_json()))
+
+    return optimization, diff_resumes(snapshot.resume, resume)
@@ -2,6 +2,7 @@
 System prompts configuration for different LLM behaviors.
 """
 
+from app.services.tracing import logger
 
 
 SYSTEM_PROMPTS = {
@@ -63,6 +64,8 @@ IMPORTANT TOOL USAGE INSTRUCTIONS:
 - Example: "Programming Languages|Python,JavaScript,Java"
 - When using the "Update All Technical Skills" tool for multiple categories, use the format: category1|skill1,skill2;category2|skill3,skill4;category3|skill5,skill6
 - Example: "Programming Languages|Python,JavaScript;Frontend|React,NextJs;Backend|NodeJs,Express"
+- When the user asks for several different changes at once, use the "Apply Resume Patch" tool with one operation per line, e.g.
+  SET|email|jane@example.com;;DELETE_SKILL|Frontend|HTML5;;EXPERIENCE|Toddle|bullet_point_1|bullet_point_2
 - For job description analysis, use "Analyze Job Description" tool to get recommendations
 - For automatic optimization, use "Auto-Optimize Resume for Job" tool to make intelligent changes
 - Do NOT use JSON format, use the pipe-separated format shown above
@@ -77,47 +80,124 @@ Always follow the exact format specified in each tool's description."""
 
 
 EXTRACTION_PROMPT = """
-You are an information extraction assistant. Given a LaTeX resume, extract the following fields as accurately as possible:
-- Name
-- Location
-- Phone Number
-
-Return your answer in this JSON format:
-
-{{
-  "name": "",
-  "location": "",
-  "phone": "",
-  "email": "",
-  "linkedinUrl": "",
-  "githubUrl": "",
-
-  "education": [
-    {{
-      "degree": "",
-      "school": "",
-      "startDate": "",
-      "endDate": "",
-      "gpa": ""
-    }}
-  ],
-  "experience": [
-    {{
-      "company": "",
-      "position": "",
-      "location": "",
-      "title": "",
-      "startDate": "",
-      "endDate": "",
-      "description": ""
-    }}
-    ]
-}}
-
-Here is the LaTeX resume:
+You are an information extraction assistant. Given a resume (LaTeX source or text extracted from a PDF or Word document), extract the following fields as accurately as possible:
+- Name, location, phone number, email, LinkedIn URL and GitHub URL
+- Education: degree, school, start date, end date and GPA
+- Experience: company, position, location, title, start date, end date and the bullet points as a list
+- Projects: name, start date, end date, technologies used and the bullet points as a list
+- Technical skills: each category with its list of items
+
+Copy the text as written, as plain text: drop LaTeX commands and escapes.
+Leave fields that are not present in the resume empty; do not invent anything.
+
+Here is the resume:
+----------------------
+{resume}
+----------------------
+"""
+
+
+OPTIMIZATION_PROMPT = """
+Review this resume against the job description and optimize it in a single pass.
+
+JOB DESCRIPTION:
+----------------------
+{job_description}
+----------------------
+
+CURRENT RESUME:
 ----------------------
 {resume}
 ----------------------
+
+1. Score from 0-100 how well the current resume matches the job description.
+2. List the key skills from the job description that are missing from the resume.
+3. Give specific, actionable recommendations.
+4. Provide the technical skill categories to add or replace, each with its full list of items.
+5. Provide rewritten bullet points for the experience entries that should change, using the company names from the resume.
+
+Only suggest changes that genuinely improve the match with the job requirements.
+Do not invent experience the candidate does not have.
+Do not highlight keywords in **KEYWORD** format.
+Omit sections and entries that need no changes.
+"""
+
+
+ANALYSIS_PROMPT = """
+Analyze this job description and current resume to provide specific recommendations:
+
+JOB DESCRIPTION:
+{job_description}
+
+CURRENT RESUME:
+{resume}
+
+Please provide:
+1. Key skills mentioned in job description that are missing from resume
+2. Give a score from 0-100 of how well the resume matches the job description.
+3. Technical skills to add or emphasize.
+4. Experience descriptions that could be improved to match job requirements
+5. Specific action items for resume improvement
+
+Format your response as actionable recommendations.
+"""
+
+
+# Shared by both auto-optimize prompts; braces are doubled for str.format
+_SUGGESTION_FORMAT = """
+Please provide response in JSON format similar to the resume:
+
+Example:
+{{"TechnicalSkills": [{{"category": "Programming Languages", "items": ["Python", "JavaScript/TypeScript", "Java", "Go", "C/C++"]}}],
+"Experience": [{{"company": "Company Name", "position": "Position", "location": "Location", "startDate": "Start Date", "endDate": "End Date", "description": ["Bullet Point 1", "Bullet Point 2", "Bullet Point 3"]}}]}}
+"""
+
+
+AUTO_OPTIMIZE_FROM_HISTORY_PROMPT = """
+Based on our previous job description analysis conversation, suggest specific technical skills to add/update and experience improvements for this resume:
+
+CURRENT RESUME:
+{resume}
+""" + _SUGGESTION_FORMAT + """
+Only suggest changes that would genuinely improve the match with the job requirements from our previous analysis.
+DO NOT SUGGEST CHANGES TO THE RESUME THAT ARE NOT MENTIONED IN THE ANALYSIS RESPONSE.
+DO NOT HIGHLIGHT ANY SPECIFIC KEYWORD in **KEYWORD** format.
+If no changes are needed for a section, omit that section.
+Use the insights from our previous analysis to make targeted recommendations.
+"""
+
+
+AUTO_OPTIMIZE_PROMPT = """
+Based on this job description analysis, suggest specific technical skills to add/update and experience improvements:
+
+ANALYSIS RESPONSE:
+{analysis}
+
+CURRENT RESUME:
+{resume}
+""" + _SUGGESTION_FORMAT + """
+Only suggest changes that would genuinely improve the match with the job requirements.
+If no changes are needed for a section, omit that section.
+"""
+
+
+SUMMARY_PROMPT = """
+Update the running summary of a conversation about a candidate's resume with the new messages below.
+
+Keep what later requests may need: the target job's title, company and key requirements, the
+match score, missing skills, the recommendations made, and the changes the user accepted or rejected.
+Drop pleasantries, repeated resume contents and anything already superseded.
+Answer with the updated summary only, in at most {max_words} words.
+
+CURRENT SUMMARY:
+----------------------
+{summary}
+----------------------
+
+NEW MESSAGES:
+----------------------
+{transcript}
+----------------------
 """
 
 
@@ -132,5 +212,5 @@ def get_system_prompt(prompt_type="default"):
     Returns:
         String containing the system prompt
     """
-    print(f"Getting system prompt for: {prompt_type}")
+    logger.debug("Getting system prompt for: %s", prompt_type)
     return SYSTEM_PROMPTS.get(prompt_type, SYSTEM_PROMPTS["default"]) 
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+Token-aware prompt assembly.
+
+Prompts embed the resume as compact JSON without empty fields (see ResumeSnapshot)
+and job descriptions and uploaded documents cut to a token budget. Each prompt is
+measured against what the uncompacted inputs would have cost, and the tokens saved
+are logged and counted in the metrics registry.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from app.services.llm_cache import is_boilerplate_line
+from app.services.llm_handler import get_settings
+from app.services.metrics import metrics
+from app.services.tracing import logger
+from app.utils.tokens import count_tokens, truncate_to_tokens
+
+TRUNCATION_MARKER = "\n[...truncated]"
+
+# Section headings of job descriptions whose content rarely matters for matching a
+# resume; their sections are dropped first when a description is over budget
+_LOW_PRIORITY_HEADINGS = re.compile(
+    r"^(about (us|the company|the team)|who we are|our (company|mission|story|values|culture)|company overview"
+    r"|benefits|perks|what we offer|why (join|work)|compensation|salary|pay range|how to apply|life at)\b",
+    re.IGNORECASE
+)
+_HEADING_CHARS = "#*-_=: \t"
+_MAX_HEADING_LENGTH = 40
+_SPACES = re.compile(r"[ \t\u00a0]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+prompt_tokens = metrics.counter("prompt_tokens_total", "Tokens in prompts built by the prompt builder", ["prompt"])
+prompt_tokens_saved = metrics.counter("prompt_tokens_saved_total", "Tokens saved by compact prompt encoding", ["prompt"])
+
+
+def squeeze_whitespace(text: str) -> str:
+    """Strip indentation and trailing spaces, collapse runs of spaces and of blank lines."""
+    lines = (_SPACES.sub(" ", line).strip() for line in text.splitlines())
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _is_heading(line: str) -> bool:
+    # Markdown headings, "Requirements:" and short lines that don't read as a sentence or bullet
+    stripped = line.strip()
+    if stripped.startswith("#"):
+        return True
+    if not stripped or len(stripped) > _MAX_HEADING_LENGTH or stripped[0] in "-*•":
+        return False
+    return stripped.endswith(":") or stripped[-1] not in ".!?,;"
+
+
+def _is_low_priority_heading(line: str) -> bool:
+    heading = line.strip(_HEADING_CHARS)
+    return len(heading) <= _MAX_HEADING_LENGTH and bool(_LOW_PRIORITY_HEADINGS.match(heading))
+
+
+def _split_sections(lines: list[str]) -> list[tuple[bool, list[str]]]:
+    # (low priority, lines) for each run of lines under one heading
+    sections = [(False, [])]
+    for line in lines:
+        if _is_heading(line):
+            sections.append((_is_low_priority_heading(line), []))
+        sections[-1][1].append(line)
+    return [section for section in sections if section[1]]
+
+
+def fit_job_description(job_description: str, max_tokens: Optional[int] = None) -> str:
+    """
+    Fit a job description into `max_tokens` tokens (PROMPT_JOB_MAX_TOKENS by default).
+
+    Whitespace and EEO/legal boilerplate lines are always removed. If it is still over
+    budget, sections such as "About us" and "Benefits" are dropped, last first, and
+    only then is the text cut, keeping its beginning. What remains always has content
+    when the description does.
+    """
+    if max_tokens is None:
+        max_tokens = get_settings().prompt_job_max_tokens
+    lines = [line for line in squeeze_whitespace(job_description).splitlines() if not is_boilerplate_line(line)]
+    text = "\n".join(lines)
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    sections = _split_sections(lines)
+    for index in reversed(range(len(sections))):
+        if sections[index][0]:
+            del sections[index]
+            remaining = "\n".join(line for _, section in sections for line in section).strip()
+            if not remaining:
+                break
+            text = remaining
+            if count_tokens(text) <= max_tokens:
+                return text
+    return fit_document(text, max_tokens)
+
+
+def fit_document(text: str, max_tokens: int) -> str:
+    """Squeeze whitespace and cut `text` to `max_tokens` tokens, marking the cut."""
+    text = squeeze_whitespace(text)
+    if count_tokens(text) <= max_tokens:
+        return text
+    return truncate_to_tokens(text, max_tokens - count_tokens(TRUNCATION_MARKER)) + TRUNCATION_MARKER
+
+
+@dataclass(frozen=True)
+class CompactPrompt:
+    """A built prompt and its token cost compared with the uncompacted inputs."""
+    name: str
+    text: str
+    tokens: int
+    baseline_tokens: int
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.baseline_tokens - self.tokens
+
+    def __str__(self) -> str:
+        return self.text
+
+
+def build_prompt(name: str, template: str, fields: dict[str, str], originals: Optional[dict[str, str]] = None) -> CompactPrompt:
+    """
+    Fill `template` with the compacted `fields` and squeeze its whitespace.
+
+    `originals` holds the uncompacted value of any field that was shortened (e.g. the
+    full job description); the prompt they would have produced is the baseline the
+    saving is measured against.
+    """
+    text = squeeze_whitespace(template.format(**fields))
+    tokens = count_tokens(text)
+    baseline_tokens = count_tokens(template.format(**{**fields, **(originals or {})}))
+    prompt = CompactPrompt(name=name, text=text, tokens=tokens, baseline_tokens=max(tokens, baseline_tokens))
+
+    prompt_tokens.inc(prompt.tokens, prompt=name)
+    prompt_tokens_saved.inc(prompt.saved_tokens, prompt=name)
+    logger.info("prompt %s: %d tokens, %d saved by compaction (%d uncompacted)",
+                name, prompt.tokens, prompt.saved_tokens, prompt.baseline_tokens)
+    return prompt
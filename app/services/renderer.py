@@ -0,0 +1,106 @@
+"""
+Process-wide Jinja2 renderer for the LaTeX resume templates.
+"""
+
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import quote
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+from app.services.llm_handler import get_settings
+from app.utils.util import escape_latex_special_chars
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), '../uploads')
+TEMPLATE_NAME = 'main.tex'
+
+
+# Characters kept as they are in \href targets; everything else is percent-encoded
+_URL_SAFE_CHARS = ":/?&=#~_-.+,;@!$'()*%"
+
+
+def latex_filter(value) -> str:
+    """Jinja `latex` filter: escape a value for LaTeX (None and undefined values render empty)."""
+    if value is None:
+        return ""
+    return escape_latex_special_chars(str(value))
+
+
+def url_filter(value) -> str:
+    """
+    Jinja `url` filter, for \\href targets: hyperref takes the URL verbatim, so it is
+    percent-encoded instead of text-escaped, and only % and # get a backslash.
+    """
+    if value is None:
+        return ""
+    url = quote(str(value), safe=_URL_SAFE_CHARS)
+    return url.replace("%", "\\%").replace("#", "\\#")
+
+
+class LatexRenderer:
+    """
+    Compiles each LaTeX template once and reuses it for every render.
+
+    Templates are reloaded only when their file's mtime changes, and with a bytecode
+    cache directory the compiled code is shared across worker processes and restarts.
+    """
+    def __init__(self, template_dir: str = TEMPLATE_DIR, bytecode_cache_dir: Optional[str] = None):
+        self.template_dir = template_dir
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            block_start_string='\\BLOCK{',
+            block_end_string='}',
+            variable_start_string='\\VAR{',
+            variable_end_string='}',
+            comment_start_string='\\#{',
+            comment_end_string='}',
+            autoescape=False,
+            auto_reload=True,
+            bytecode_cache=bytecode_cache
+        )
+        # Resume fields hold raw text; templates escape them with `|latex` at render time
+        self.env.filters['latex'] = latex_filter
+        self.env.filters['url'] = url_filter
+        self._versions: dict[str, tuple[int, str]] = {}
+        self._lock = threading.Lock()
+
+    def list_templates(self) -> list[str]:
+        """Names of the available LaTeX templates."""
+        return self.env.list_templates(extensions=['tex'])
+
+    def get_template(self, template_name: str = TEMPLATE_NAME) -> Template:
+        """Return the compiled template, recompiling it only if the file changed."""
+        return self.env.get_template(template_name)
+
+    def render(self, template_name: str = TEMPLATE_NAME, **context) -> str:
+        return self.get_template(template_name).render(**context)
+
+    def template_version(self, template_name: str = TEMPLATE_NAME) -> str:
+        """
+        Return a short hash of the template source, used to key rendered output caches.
+        """
+        path = os.path.join(self.template_dir, template_name)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._versions.get(template_name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'rb') as f:
+            version = hashlib.sha256(f.read()).hexdigest()[:16]
+        with self._lock:
+            self._versions[template_name] = (mtime, version)
+        return version
+
+
+@lru_cache()
+def get_renderer() -> LatexRenderer:
+    """Create and cache the process-wide renderer."""
+    settings = get_settings()
+    return LatexRenderer(bytecode_cache_dir=settings.template_bytecode_cache_dir)
@@ -1,10 +1,14 @@
 
 from app.models.resume import Resume, TechnicalSkillEntry, ExperienceEntry
-from jinja2 import Environment, FileSystemLoader
 import os
+import shutil
 import tempfile
 import subprocess
-from app.utils.util import escape_latex_special_chars, escape_data
+from typing import Optional
+from app.services.pdf_cache import PdfCache, get_pdf_cache
+from app.services.renderer import TEMPLATE_NAME, get_renderer
+from app.services.latex_format import get_format_cache, plan_compile, prepare_attempt
+from app.services.tracing import logger, span
 
 RESUME = {
   "name": "Anish Hegde",
@@ -122,149 +126,123 @@ RESUME = {
 
 
 def get_default_resume_content():
-    escaped_resume_data = escape_data(RESUME)
-    resume = Resume.model_validate(escaped_resume_data)
+    resume = Resume.model_validate(RESUME)
     return resume
 
 
-resume_info = get_default_resume_content()
+def _matches(a: str, b: str) -> bool:
+    # Exact match or partial match in either direction, ignoring case
+    a, b = a.lower(), b.lower()
+    return a == b or a in b or b in a
 
 
-def change_technical_skills(category: str, items: list[str]):
-    # Escape LaTeX special characters in each item and category
-    escaped_items = [escape_latex_special_chars(item) for item in items]
-    escaped_category = escape_latex_special_chars(category)
-    escaped_category_lower = escaped_category.lower()
+# Edit functions are copy-on-write: they return a new Resume built with model_copy and
+# never mutate their input, which may be shared with earlier resume versions.
 
-    for skill in resume_info.technicalSkills:
-        # Compare escaped versions for accurate matching
-        skill_category_lower = skill.category.lower()
-        if (skill_category_lower == escaped_category_lower or 
-            skill_category_lower in escaped_category_lower or 
-            escaped_category_lower in skill_category_lower):
-            skill.category = escaped_category
-            skill.items = escaped_items
-            print(f"Changed technical skills for {category}")
-            return
+def change_technical_skills(resume_info: Resume, category: str, items: list[str]) -> Resume:
+    # Fields hold raw text; LaTeX escaping happens when the template is rendered
+    skills = list(resume_info.technicalSkills)
+    for i, skill in enumerate(skills):
+        if _matches(skill.category, category):
+            skills[i] = skill.model_copy(update={"category": category, "items": tuple(items)})
+            logger.info("Changed technical skills for %s", category)
+            return resume_info.model_copy(update={"technicalSkills": tuple(skills)})
     
     # No match found, add new entry
-    resume_info.technicalSkills.append(TechnicalSkillEntry(
-        category=escaped_category,
-        items=escaped_items
+    skills.append(TechnicalSkillEntry(
+        category=category,
+        items=tuple(items)
     ))
-    print(f"Added new technical skills for {category}")
+    logger.info("Added new technical skills for %s", category)
+    return resume_info.model_copy(update={"technicalSkills": tuple(skills)})
         
-def change_experience_details(company: str, description: list[str]):
-
-    escaped_description = [escape_latex_special_chars(item) for item in description]
-    escaped_company = escape_latex_special_chars(company)
-    escaped_company_lower = escaped_company.lower()
-    
-    for experience in resume_info.experience:
-        # Compare escaped versions for accurate matching
-        experience_company_lower = experience.company.lower()
-        # Check for exact match or partial match in either direction
-        if (escaped_company_lower == experience_company_lower or 
-            escaped_company_lower in experience_company_lower or 
-            experience_company_lower in escaped_company_lower):
-            experience.description = escaped_description
-            print(f"Changed experience details for {company}")
-            return
-    resume_info.experience.append(ExperienceEntry(
-        company=escaped_company,
-        description=escaped_description
+def change_experience_details(resume_info: Resume, company: str, description: list[str]) -> Resume:
+    experience = list(resume_info.experience)
+    for i, entry in enumerate(experience):
+        if _matches(entry.company, company):
+            experience[i] = entry.model_copy(update={"description": tuple(description)})
+            logger.info("Changed experience details for %s", company)
+            return resume_info.model_copy(update={"experience": tuple(experience)})
+    experience.append(ExperienceEntry(
+        company=company,
+        description=tuple(description)
     ))
-    print(f"Added new experience details for {company}")
+    logger.info("Added new experience details for %s", company)
+    return resume_info.model_copy(update={"experience": tuple(experience)})
 
 
-def change_email( new_email):
-    resume_info.email = new_email
+def change_email(resume_info: Resume, new_email) -> Resume:
+    return resume_info.model_copy(update={"email": new_email})
 
 
-def change_name(new_name):
-    resume_info.name = new_name
+def change_name(resume_info: Resume, new_name) -> Resume:
+    return resume_info.model_copy(update={"name": new_name})
 
-def change_location(new_location):
-    resume_info.location = new_location
+def change_location(resume_info: Resume, new_location) -> Resume:
+    return resume_info.model_copy(update={"location": new_location})
 
 
-def delete_technical_skill_category(category: str):
+def delete_technical_skill_category(resume_info: Resume, category: str) -> Optional[Resume]:
     """
     Delete an entire technical skill category from the resume.
+    Returns the updated resume, or None if the category was not found.
     """
-    escaped_category = escape_latex_special_chars(category)
-    escaped_category_lower = escaped_category.lower()
-    
     # Find and remove the category
     for i, skill in enumerate(resume_info.technicalSkills):
-        skill_category_lower = skill.category.lower()
-        if (skill_category_lower == escaped_category_lower or 
-            skill_category_lower in escaped_category_lower or 
-            escaped_category_lower in skill_category_lower):
-            removed_category = resume_info.technicalSkills.pop(i)
-            print(f"Deleted technical skill category: {removed_category.category}")
-            return True
+        if _matches(skill.category, category):
+            skills = resume_info.technicalSkills[:i] + resume_info.technicalSkills[i + 1:]
+            logger.info("Deleted technical skill category: %s", skill.category)
+            return resume_info.model_copy(update={"technicalSkills": skills})
     
-    print(f"Category '{category}' not found")
-    return False
+    logger.info("Category '%s' not found", category)
+    return None
 
 
-def delete_technical_skill_item(category: str, item: str):
+def delete_technical_skill_item(resume_info: Resume, category: str, item: str) -> Optional[Resume]:
     """
     Delete a specific technical skill item from a category.
+    Returns the updated resume, or None if the category or item was not found.
     """
-    escaped_category = escape_latex_special_chars(category)
-    escaped_item = escape_latex_special_chars(item)
-    escaped_category_lower = escaped_category.lower()
-    escaped_item_lower = escaped_item.lower()
-    
     # Find the category
-    for skill in resume_info.technicalSkills:
-        skill_category_lower = skill.category.lower()
-        if (skill_category_lower == escaped_category_lower or 
-            skill_category_lower in escaped_category_lower or 
-            escaped_category_lower in skill_category_lower):
+    for i, skill in enumerate(resume_info.technicalSkills):
+        if _matches(skill.category, category):
             
             # Find and remove the item
-            for i, skill_item in enumerate(skill.items):
-                skill_item_lower = skill_item.lower()
-                if (skill_item_lower == escaped_item_lower or 
-                    skill_item_lower in escaped_item_lower or 
-                    escaped_item_lower in skill_item_lower):
-                    removed_item = skill.items.pop(i)
-                    print(f"Deleted '{removed_item}' from '{skill.category}' category")
+            for j, skill_item in enumerate(skill.items):
+                if _matches(skill_item, item):
+                    items = skill.items[:j] + skill.items[j + 1:]
+                    logger.info("Deleted '%s' from '%s' category", skill_item, skill.category)
+                    skills = list(resume_info.technicalSkills)
                     
                     # If category becomes empty, remove it entirely
-                    if not skill.items:
-                        resume_info.technicalSkills.remove(skill)
-                        print(f"Category '{skill.category}' was empty and has been removed")
+                    if not items:
+                        del skills[i]
+                        logger.info("Category '%s' was empty and has been removed", skill.category)
+                    else:
+                        skills[i] = skill.model_copy(update={"items": items})
                     
-                    return True
+                    return resume_info.model_copy(update={"technicalSkills": tuple(skills)})
             
-            print(f"Item '{item}' not found in category '{skill.category}'")
-            return False
+            logger.info("Item '%s' not found in category '%s'", item, skill.category)
+            return None
     
-    print(f"Category '{category}' not found")
-    return False
+    logger.info("Category '%s' not found", category)
+    return None
 
 
-def resume_to_latex() -> str:
+def get_template_version(template_name: str = TEMPLATE_NAME) -> str:
     """
-    Render the Resume model as a LaTeX string using the uploads/main.tex template.
+    Return a short hash of the template source, used to key rendered output caches.
     """
-    env = Environment(
-        loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), '../uploads')),
-        block_start_string='\BLOCK{',
-        block_end_string='}',
-        variable_start_string='\VAR{',
-        variable_end_string='}',
-        comment_start_string='\#{',
-        comment_end_string='}',
-        autoescape=False
-    )
+    return get_renderer().template_version(template_name)
 
-    template = env.get_template('main.tex')
-    return template.render(resume=resume_info)
+
+def resume_to_latex(resume_info: Resume, template_name: str = TEMPLATE_NAME) -> str:
+    """
+    Render the Resume model as a LaTeX string using a template from uploads/ (main.tex by default).
+    """
+    with span("resume_to_latex"):
+        return get_renderer().render(template_name, resume=resume_info)
 
 
 def write_latex_resume(latex: str, output_path: str = 'app/uploads/main2.tex'):
@@ -276,35 +254,48 @@ def write_latex_resume(latex: str, output_path: str = 'app/uploads/main2.tex'):
 
 
 
-def latex_to_pdf(latex_str, output_path='output.pdf'):
-    # Create a temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        tex_path = os.path.join(temp_dir, 'document.tex')
-
-        # Write LaTeX string to a .tex file
-        with open(tex_path, 'w') as tex_file:
-            tex_file.write(latex_str)
-
-        # Run pdflatex to generate the PDF
-        try:
-            subprocess.run(
-                ['pdflatex', '-interaction=nonstopmode', tex_path],
-                cwd=temp_dir,
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-        except subprocess.CalledProcessError as e:
-            print("LaTeX compilation failed:")
-            print(e.stdout.decode())
-            print(e.stderr.decode())
-            raise RuntimeError("LaTeX compilation failed.")
-
-        # Move the resulting PDF to the desired location
-        generated_pdf = os.path.join(temp_dir, 'document.pdf')
-        os.replace(generated_pdf, output_path)
-        print(f"PDF generated at: {output_path}")
-
-
+def latex_to_pdf(latex_str, output_path='output.pdf', use_cache: bool = True, use_format: Optional[bool] = None):
+    """
+    Compile a LaTeX string to a PDF at `output_path`.
 
+    Unchanged documents are served from the content-addressed PDF cache instead of
+    running pdflatex again, and the preamble is precompiled into a format file when possible.
+    """
+    with span("latex_to_pdf"):
+        cache = get_pdf_cache() if use_cache else None
+        cache_key = PdfCache.make_key(latex_str, get_template_version()) if cache else None
+        if cache and cache.copy_to(cache_key, output_path):
+            logger.info("PDF served from cache at: %s", output_path)
+            return
 
+        # Create a temporary directory
+        with tempfile.TemporaryDirectory() as temp_dir:
+            attempts = plan_compile(latex_str, use_format=use_format)
+            for attempt in attempts:
+                # Write LaTeX string (or just its body, for a precompiled preamble) to a .tex file
+                prepare_attempt(attempt, temp_dir)
+
+                # Run pdflatex to generate the PDF
+                try:
+                    subprocess.run(
+                        attempt.command,
+                        cwd=temp_dir,
+                        check=True,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE
+                    )
+                    break
+                except subprocess.CalledProcessError as e:
+                    if attempt.format_path is not None:
+                        logger.warning("Compile against %s failed, retrying without it", attempt.format_path.name)
+                        get_format_cache().discard(attempt.format_path)
+                        continue
+                    logger.error("LaTeX compilation failed:\n%s\n%s", e.stdout.decode(errors="ignore"), e.stderr.decode(errors="ignore"))
+                    raise RuntimeError("LaTeX compilation failed.")
+
+            # Move the resulting PDF to the desired location
+            generated_pdf = os.path.join(temp_dir, 'document.pdf')
+            if cache:
+                cache.put(cache_key, generated_pdf)
+            shutil.move(generated_pdf, output_path)
+            logger.info("PDF generated at: %s", output_path)
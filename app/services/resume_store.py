@@ -0,0 +1,95 @@
+"""
+Versioned, immutable resume snapshots.
+
+Edits never mutate a Resume in place: the edit functions in app.services.resume return
+a new Resume built with model_copy, sharing every unchanged entry with the previous
+version. Each committed version is wrapped in a snapshot that serializes and hashes it
+once, so prompts and cache keys reuse that work instead of redoing it.
+"""
+
+import hashlib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from app.models.resume import Resume
+from app.services.resume import get_default_resume_content
+
+
+@dataclass(frozen=True)
+class ResumeSnapshot:
+    """
+    One immutable version of a resume.
+
+    The wrapped Resume is shared with later versions and must never be mutated.
+    """
+    version: int
+    resume: Resume
+    json: str
+    content_hash: str
+    compact_json: str
+    created_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def create(cls, resume: Resume, version: int = 0) -> "ResumeSnapshot":
+        serialized = resume.model_dump_json()
+        return cls(
+            version=version,
+            resume=resume,
+            json=serialized,
+            content_hash=hashlib.sha256(serialized.encode("utf-8")).hexdigest(),
+            # What prompts embed: empty fields add tokens but tell the model nothing
+            compact_json=resume.model_dump_json(exclude_defaults=True)
+        )
+
+
+class ResumeStore:
+    """
+    Version history of one session's resume, keeping at most `max_versions` snapshots.
+    """
+    def __init__(self, initial: ResumeSnapshot, max_versions: int = 50):
+        self._versions: deque[ResumeSnapshot] = deque([initial], maxlen=max(1, max_versions))
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> ResumeSnapshot:
+        """The latest snapshot."""
+        return self._versions[-1]
+
+    def commit(self, resume: Resume) -> ResumeSnapshot:
+        """Record `resume` as the newest version; committing the current resume is a no-op."""
+        with self._lock:
+            current = self._versions[-1]
+            if resume is current.resume:
+                return current
+            snapshot = ResumeSnapshot.create(resume, version=current.version + 1)
+            if snapshot.content_hash == current.content_hash:
+                return current
+            self._versions.append(snapshot)
+            return snapshot
+
+    def get(self, version: int) -> ResumeSnapshot:
+        """Return the snapshot for `version`, if it is still in the history."""
+        for snapshot in self._versions:
+            if snapshot.version == version:
+                return snapshot
+        raise KeyError(version)
+
+    def revert(self, version: int) -> ResumeSnapshot:
+        """Make an earlier version current again, as a new version."""
+        return self.commit(self.get(version).resume.model_copy())
+
+    def history(self) -> list[ResumeSnapshot]:
+        """Snapshots still held, oldest first."""
+        return list(self._versions)
+
+
+@lru_cache()
+def get_default_snapshot() -> ResumeSnapshot:
+    """
+    The bundled default resume, validated and serialized once and shared by every
+    session. Resume models are frozen, so no session can alter it in place.
+    """
+    return ResumeSnapshot.create(get_default_resume_content())
@@ -0,0 +1,241 @@
+"""
+Per-user session state: each session owns its resume history, agent memory and analysis history.
+"""
+
+import re
+import time
+import asyncio
+import uuid
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from app.models.resume import Resume
+from app.services.memory import ConversationHistory
+from app.services.resume_store import ResumeSnapshot, ResumeStore, get_default_snapshot
+
+SESSION_HEADER = "X-Session-Id"
+SESSION_COOKIE = "session_id"
+
+_SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+@dataclass
+class TokenUsage:
+    """LLM tokens spent on behalf of one session."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_calls: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.llm_calls += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.prompt_tokens + self.completion_tokens,
+            "llm_calls": self.llm_calls,
+        }
+
+
+@dataclass
+class Session:
+    """State belonging to a single user of the bot."""
+    session_id: str
+    resumes: ResumeStore
+    analysis_history: ConversationHistory = field(default_factory=ConversationHistory)
+    usage: TokenUsage = field(default_factory=TokenUsage)
+    agent_factory: Optional[Callable[[], Any]] = None
+    created_at: float = field(default_factory=time.monotonic)
+    last_access: float = field(default_factory=time.monotonic)
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+    # Queues the session's agent runs on the event loop, before they take a runner slot
+    agent_lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    _agent: Any = field(default=None, repr=False)
+
+    @property
+    def snapshot(self) -> ResumeSnapshot:
+        """The current version of the session's resume."""
+        return self.resumes.current
+
+    @property
+    def resume(self) -> Resume:
+        """The current resume. Treat it as read-only; assign a new Resume to make an edit."""
+        return self.resumes.current.resume
+
+    @resume.setter
+    def resume(self, resume: Resume):
+        self.resumes.commit(resume)
+
+    @property
+    def agent(self):
+        """The session's agent, built on first use so idle sessions stay cheap."""
+        with self.lock:
+            if self._agent is None and self.agent_factory is not None:
+                self._agent = self.agent_factory()
+            return self._agent
+
+    @property
+    def memory(self):
+        """The agent's conversation memory, if the agent has been built."""
+        return getattr(self._agent, "memory", None)
+
+    def approx_size(self) -> int:
+        """Rough number of bytes held by this session's user data."""
+        size = len(self.snapshot.json)
+        size += sum(len(str(content)) for _, content in self.analysis_history)
+        memory = self.memory
+        if memory is not None:
+            size += sum(len(str(message.content)) for message in memory.chat_memory.messages)
+        return size
+
+
+class SessionStore:
+    """
+    In-process session store with LRU eviction, idle TTL and a memory cap.
+    """
+    def __init__(
+        self,
+        snapshot_factory: Callable[[], ResumeSnapshot] = get_default_snapshot,
+        agent_factory: Optional[Callable[[], Any]] = None,
+        history_factory: Callable[[], ConversationHistory] = ConversationHistory,
+        ttl_seconds: float = 3600,
+        max_sessions: int = 5000,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_resume_versions: int = 50,
+    ):
+        self.snapshot_factory = snapshot_factory
+        self.agent_factory = agent_factory
+        self.history_factory = history_factory
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.max_resume_versions = max_resume_versions
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get_or_create(self, session_id: Optional[str] = None) -> Session:
+        """
+        Return the session for `session_id`, creating a fresh one if it is unknown,
+        expired or not a valid id.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id) if session_id else None
+            if session is None:
+                if not session_id or not _SESSION_ID_PATTERN.match(session_id):
+                    session_id = uuid.uuid4().hex
+                session = Session(
+                    session_id=session_id,
+                    resumes=ResumeStore(self.snapshot_factory(), self.max_resume_versions),
+                    analysis_history=self.history_factory(),
+                    agent_factory=self.agent_factory
+                )
+                self._sessions[session_id] = session
+            else:
+                self._sessions.move_to_end(session_id)
+            session.last_access = now
+            self._resize(session)
+            self._evict(keep=session_id)
+            return session
+
+    def update_size(self, session: Session):
+        """
+        Re-measure `session` after a request has used it, so edits and new history count
+        toward `max_bytes` right away, evicting other sessions if the store is now over.
+        """
+        with self._lock:
+            if self._sessions.get(session.session_id) is not session:
+                return
+            self._resize(session)
+            self._evict(keep=session.session_id)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._remove(session_id)
+
+    def _resize(self, session: Session):
+        size = session.approx_size()
+        self._total_bytes += size - self._sizes.get(session.session_id, 0)
+        self._sizes[session.session_id] = size
+
+    def _remove(self, session_id: str):
+        if self._sessions.pop(session_id, None) is not None:
+            self._total_bytes -= self._sizes.pop(session_id, 0)
+
+    def _expire(self, now: float):
+        # Sessions are kept in access order, so expired ones are at the front
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_access < self.ttl_seconds:
+                break
+            self._remove(session_id)
+
+    def _evict(self, keep: str):
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions or self._total_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._sessions))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+
+
+_current_session: ContextVar[Optional[Session]] = ContextVar("current_session", default=None)
+_default_session: Optional[Session] = None
+_default_session_lock = threading.Lock()
+
+
+@contextmanager
+def use_session(session: Session):
+    """Bind `session` as the current session for the enclosed code."""
+    token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(token)
+
+
+def get_current_session() -> Session:
+    """
+    Return the session bound to the current request.
+
+    Outside a request (scripts, the REPL) a process-wide default session is used.
+    """
+    session = _current_session.get()
+    if session is not None:
+        return session
+
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = Session(session_id="default", resumes=ResumeStore(get_default_snapshot()))
+        return _default_session
+
+
+def record_token_usage(prompt_tokens: int, completion_tokens: int):
+    """Charge an LLM call's tokens to the session bound to the current request, if any."""
+    session = _current_session.get()
+    if session is not None:
+        session.usage.record(prompt_tokens, completion_tokens)
@@ -0,0 +1,70 @@
+"""
+Server-Sent Events support for streaming agent runs to the browser.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Iterator, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class StreamingCallbackHandler(BaseCallbackHandler):
+    """
+    Forwards agent progress from the worker thread to an asyncio queue as (event, data) pairs.
+
+    Events:
+        status: free-text progress, e.g. "Thinking..."
+        tool:   the agent picked a tool ({"tool", "input"})
+        token:  an LLM token; `source` is "tool" for tokens of the answer a tool is
+                producing and "agent" for the agent's own reasoning
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        self._loop = loop
+        self._queue = queue
+        self._tool_runs: set[UUID] = set()
+        self._tool_llm_runs: set[UUID] = set()
+
+    def _emit(self, event: str, data: Any):
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (event, data))
+
+    # Having these two methods makes LangChain chat models stream tokens to this
+    # handler even when they are called with plain invoke()
+    def tap_output_iter(self, run_id: UUID, output: Iterator) -> Iterator:
+        return output
+
+    def tap_output_aiter(self, run_id: UUID, output: AsyncIterator) -> AsyncIterator:
+        return output
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs):
+        if parent_run_id in self._tool_runs:
+            self._tool_llm_runs.add(run_id)
+        else:
+            self._emit("status", "Thinking...")
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs):
+        if token:
+            source = "tool" if run_id in self._tool_llm_runs else "agent"
+            self._emit("token", {"text": token, "source": source})
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        self._tool_llm_runs.discard(run_id)
+
+    def on_agent_action(self, action, **kwargs):
+        self._emit("tool", {"tool": action.tool, "input": str(action.tool_input)[:200]})
+
+    def on_tool_start(self, serialized, input_str: str, *, run_id: UUID, **kwargs):
+        self._tool_runs.add(run_id)
+        self._emit("status", f"Running {serialized.get('name', 'tool')}...")
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs):
+        self._tool_runs.discard(run_id)
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs):
+        self._tool_runs.discard(run_id)
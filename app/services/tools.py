@@ -3,16 +3,40 @@ LangChain tools for resume editing and analysis.
 """
 
 import json
-from langchain.agents import tool
-from app.services.llm_handler import LLMHandler
+from langchain_core.tools import tool
+from app.services.llm_handler import llm_handler
 from app.services.resume import (
     change_email, change_name, change_location, change_technical_skills, 
-    resume_to_latex, latex_to_pdf, get_default_resume_content, change_experience_details,
+    resume_to_latex, latex_to_pdf, change_experience_details,
     delete_technical_skill_category, delete_technical_skill_item
 )
-from app.services.prompt import get_system_prompt
+from app.services.prompt import ANALYSIS_PROMPT, AUTO_OPTIMIZE_FROM_HISTORY_PROMPT, AUTO_OPTIMIZE_PROMPT, get_system_prompt
+from app.services.prompt_builder import build_prompt, fit_job_description
+from app.services.patch import PatchError, apply_patch, parse_optimization_suggestions, parse_patch
+from app.services.session import Session, get_current_session
+from app.services.compiler import get_compile_service
+from app.services.llm_cache import get_analysis_cache, make_analysis_key
+from app.services.memory import ConversationHistory
+from app.services.tracing import logger
 
-llm_handler = LLMHandler()
+# Bump when the analysis prompt changes so cached analyses are not reused
+ANALYSIS_PROMPT_VERSION = "3"
+
+
+
+def _render_resume(session: Session) -> str:
+    """
+    Render the session's resume and queue it on the compile service.
+    Returns a short message telling the user where to fetch the PDF.
+    """
+    latex = resume_to_latex(session.resume)
+    compile_service = get_compile_service()
+    if not compile_service.running:
+        # No event loop to hand the job to (e.g. running outside the API), compile inline
+        latex_to_pdf(latex, "app/uploads/resume.pdf")
+        return "PDF generated at app/uploads/resume.pdf"
+    job = compile_service.submit_threadsafe(latex, owner=session.session_id)
+    return f"[Download PDF](/api/render/{job.job_id}/pdf)"
 
 
 @tool("Change Technical Skills", return_direct=True)
@@ -22,8 +46,7 @@ def tool_change_technical_skills(input_data: str):
     Input format: category_name|skill1,skill2,skill3
     Example: Programming Languages|Python,JavaScript,Java
     """
-    print(f"Received input_data: {repr(input_data)}")
-    print(f"Input type: {type(input_data)}")
+    logger.debug("Received input_data: %r", input_data)
     
     try:
         # Parse the pipe-separated format
@@ -43,9 +66,10 @@ def tool_change_technical_skills(input_data: str):
         if not category or not items:
             return f"Invalid input: Missing category or skills. Category: '{category}', Skills: {items}"
             
-        print(f"Changing skills - Category: {category}, Items: {items}")
+        logger.info("Changing skills - Category: %s, Items: %s", category, items)
         
-        change_technical_skills(category, items)
+        session = get_current_session()
+        session.resume = change_technical_skills(session.resume, category, items)
         return f"Technical skills updated successfully. Category: {category}, Items: {items}"
         
     except Exception as e:
@@ -58,12 +82,14 @@ def tool_update_all_technical_skills(skills_data: str):
     Input format: category1|skill1,skill2;category2|skill3,skill4;category3|skill5,skill6
     Example: Programming Languages|Python,JavaScript;Frontend|React,NextJs;Backend|NodeJs,Express
     """
-    print(f"Received skills_data: {repr(skills_data)}")
+    logger.debug("Received skills_data: %r", skills_data)
     
     try:
         if not skills_data or ";" not in skills_data:
             return "Invalid format. Use: category1|skill1,skill2;category2|skill3,skill4"
         
+        session = get_current_session()
+        resume = session.resume
         updated_categories = []
         errors = []
         
@@ -95,11 +121,13 @@ def tool_update_all_technical_skills(skills_data: str):
                 continue
             
             try:
-                change_technical_skills(category, items)
+                resume = change_technical_skills(resume, category, items)
                 updated_categories.append(f"{category} ({len(items)} skills)")
             except Exception as e:
                 errors.append(f"Error updating {category}: {e}")
         
+        # All categories land in a single new resume version
+        session.resume = resume
         if errors:
             return f"Partially updated. Success: {updated_categories}. Errors: {errors}"
         else:
@@ -116,8 +144,7 @@ def tool_change_experience_details(experience_input: str):
     Input format: company|bullet_point_1|bullet_point_2|bullet_point_3
     Example: Weekday|Enhanced platform functionality by delivering multiple end-to-end features|Reduced average time to hire candidates by 2 weeks|Boosted candidate engagement and response rates by 25%
     """
-    print(f"Received experience_input: {repr(experience_input)}")
-    print(f"Input type: {type(experience_input)}")
+    logger.debug("Received experience_input: %r", experience_input)
     
     try:
         if not experience_input or "|" not in experience_input:
@@ -136,7 +163,8 @@ def tool_change_experience_details(experience_input: str):
         if not description_points:
             return "At least one description point is required"
                 
-        change_experience_details(company, description_points)
+        session = get_current_session()
+        session.resume = change_experience_details(session.resume, company, description_points)
         return f"Experience details updated for {company} with {len(description_points)} bullet points"
         
     except Exception as e:
@@ -145,8 +173,9 @@ def tool_change_experience_details(experience_input: str):
 @tool("Change Email", return_direct=True)
 def tool_change_email(email: str):
     """Change email in resume. Input should be: new_email"""
-    print("email", email)
-    change_email(email)
+    logger.debug("Received email: %r", email)
+    session = get_current_session()
+    session.resume = change_email(session.resume, email)
     return "Email Id changed in resume"
 
 @tool("Change Name", return_direct=True)
@@ -156,13 +185,15 @@ def tool_change_name(name: str):
     Input should be: new_name
     Only use this tool if the user explicitly asks to update or change the name in their resume document.
     """
-    change_name(name)
+    session = get_current_session()
+    session.resume = change_name(session.resume, name)
     return "Name changed in resume"
 
 @tool("Change Location", return_direct=True)
 def tool_change_location(location: str):
     """Change location in resume. Input should be: new_location"""
-    change_location(location)
+    session = get_current_session()
+    session.resume = change_location(session.resume, location)
     return "Location changed in resume"
 
 @tool("Chat", return_direct=True)
@@ -173,9 +204,9 @@ def tool_chat(message: str):
     """
     system_prompt = get_system_prompt("default")
     input_message = [("system", system_prompt), ("user", message)]
-    print("Resume review LLM call invoked ")
+    logger.info("Resume review LLM call invoked")
     response = llm_handler.model.invoke(input_message)
-    print("Resume review LLM call completed")
+    logger.info("Resume review LLM call completed")
     
     # Extract content from response
     if hasattr(response, "content"):
@@ -191,7 +222,7 @@ def tool_clear_analysis_history(message: str):
     Clears the conversation history from previous job description analyses.
     Use this when the user wants to start a fresh analysis or switch to analyzing a different job.
     """
-    llm_handler.clear_history()
+    get_current_session().analysis_history.clear()
     return "Analysis history cleared. You can now start a fresh job description analysis."
 
 @tool("Get Updated Resume", return_direct=True)
@@ -200,9 +231,8 @@ def tool_get_updated_resume(message: str):
     Return the updated resume in LaTeX format using the latest Resume model data. 
     Accepts a single string argument (user message) as required by ChatAgent.
     """
-    latex = resume_to_latex()
-    latex_to_pdf(latex, "app/uploads/resume.pdf")
-    return "Resume updated and PDF generated successfully"
+    download = _render_resume(get_current_session())
+    return f"Resume updated and PDF generation started. {download}"
 
 @tool("Analyze Job Description", return_direct=True)
 def tool_analyze_job_description(job_description: str):
@@ -211,45 +241,53 @@ def tool_analyze_job_description(job_description: str):
     Input should be the complete job description text.
     This tool will analyze the job requirements and suggest specific changes to make the resume more aligned.
     """
-    print(f"Analyzing job description: {job_description[:100]}...")
+    logger.info("Analyzing job description: %s...", job_description[:100])
     
     try:
-        # Get current resume info
-        resume_content = get_default_resume_content()
-        if not resume_content:
-            return "No resume found. Please upload a resume first before analyzing job descriptions."
-        
-        # Create analysis prompt
-        analysis_prompt = f"""
-        Analyze this job description and current resume to provide specific recommendations:
-        
-        JOB DESCRIPTION:
-        {job_description}
-        
-        CURRENT RESUME:
-        {json.dumps(resume_content.dict(), indent=2)}
-        
-        Please provide:
-        1. Key skills mentioned in job description that are missing from resume
-        2. Give a score from 0-100 of how well the resume matches the job description.
-        3. Technical skills to add or emphasize.
-        4. Experience descriptions that could be improved to match job requirements
-        5. Specific action items for resume improvement
-
-
-    
-        Format your response as actionable recommendations.
-        """
-        
-        response = llm_handler.invoke_with_history(
-            system_message="You are a resume optimization expert.",
-            user_message=analysis_prompt,
-            add_to_history=True  # Store this analysis in conversation history
-        )
-        
-        if hasattr(response, "content"):
-            return f"JOB DESCRIPTION ANALYSIS:\n\n{response.content}"
-        return f"JOB DESCRIPTION ANALYSIS:\n\n{str(response)}"
+        # The session's current resume version, already serialized and hashed
+        session = get_current_session()
+        snapshot = session.snapshot
+        
+        # Compact resume JSON and a job description trimmed to the token budget
+        analysis_prompt = build_prompt(
+            "analyze",
+            ANALYSIS_PROMPT,
+            {"job_description": fit_job_description(job_description), "resume": snapshot.compact_json},
+            originals={"job_description": job_description, "resume": snapshot.json}
+        ).text
+        
+        history = session.analysis_history
+        cache = get_analysis_cache()
+        cache_key = make_analysis_key(job_description, snapshot.content_hash, llm_handler.model_name, ANALYSIS_PROMPT_VERSION)
+        cached = cache.get(cache_key) if cache else None
+        if cached is not None:
+            logger.info("Job description analysis served from cache")
+            # Keep the history as if the model had answered, so auto-optimize still sees it
+            history.append(("user", analysis_prompt))
+            history.append(("assistant", cached))
+            return f"JOB DESCRIPTION ANALYSIS:\n\n{cached}"
+        
+        if cache:
+            # The cache key doesn't cover the conversation, so an analysis that may be
+            # cached is made without it; it still goes into the history afterwards
+            response = llm_handler.invoke_with_history(
+                system_message="You are a resume optimization expert.",
+                user_message=analysis_prompt,
+                history=ConversationHistory()
+            )
+            content = response.content if hasattr(response, "content") else str(response)
+            history.append(("user", analysis_prompt))
+            history.append(("assistant", content))
+            cache.set(cache_key, content)
+        else:
+            response = llm_handler.invoke_with_history(
+                system_message="You are a resume optimization expert.",
+                user_message=analysis_prompt,
+                add_to_history=True,  # Store this analysis in conversation history
+                history=history
+            )
+            content = response.content if hasattr(response, "content") else str(response)
+        return f"JOB DESCRIPTION ANALYSIS:\n\n{content}"
         
     except Exception as e:
         return f"Error analyzing job description: {e}"
@@ -261,109 +299,47 @@ def tool_auto_optimize_resume(analysis_response: str):
     Use response from the tool_analyze_job_description tool to apply the changes to the resume.
     If analysis_response is "AUTO", it will use the conversation history from the previous analysis.
     """
-    print(f"Auto-optimizing resume for job...")
+    logger.info("Auto-optimizing resume for job...")
+    session = get_current_session()
     
     try:
-        # Get current resume info
-        resume_content = get_default_resume_content()
-        if not resume_content:
-            return "No resume found. Please upload a resume first."
+        # The session's current resume version, already serialized
+        snapshot = session.snapshot
         
         # Determine if we should use conversation history or provided analysis
         use_history = analysis_response.strip().upper() == "AUTO"
         
         if use_history:
             # Check if we have conversation history
-            history = llm_handler.get_history()
+            history = session.analysis_history
             if not history:
                 return "No previous analysis found in conversation history. Please run job description analysis first or provide the analysis response directly."
             
             # Create optimization prompt that references conversation history
-            optimization_prompt = f"""
-            Based on our previous job description analysis conversation, suggest specific technical skills to add/update and experience improvements for this resume:
-            
-            CURRENT RESUME:
-            {json.dumps(resume_content.dict(), indent=2)}
-            
-            Please provide ONLY actionable changes in this format:
-
-                         Please provide response in JSON format similar to the resume :
-
-             Example:
-
-             {{
-                 "TechnicalSkills": [
-                     {{
-                         "category": "Programming Languages",
-                         "items": ["Python", "JavaScript/TypeScript", "Java", "Go", "C/C++"]
-                     }}
-                 ],
-                 "Experience": [
-                     {{
-                         "company": "Company Name",
-                         "position": "Position",
-                         "location": "Location",
-                         "startDate": "Start Date",
-                         "endDate": "End Date",
-                         "description": ["Bullet Point 1", "Bullet Point 2", "Bullet Point 3"]
-                     }}
-                 ]
-             }}
-            
-
-            
-            Only suggest changes that would genuinely improve the match with the job requirements from our previous analysis.
-            DO NOT SUGGEST CHANGES TO THE RESUME THAT ARE NOT MENTIONED IN THE ANALYSIS RESPONSE.
-            DO NOT HIGHLIGHT ANY SPECIFIC KEYWORD in **KEYWORD** format.
-            If no changes are needed for a section, omit that section.
-            Use the insights from our previous analysis to make targeted recommendations.
-            """
+            optimization_prompt = build_prompt(
+                "auto_optimize",
+                AUTO_OPTIMIZE_FROM_HISTORY_PROMPT,
+                {"resume": snapshot.compact_json},
+                originals={"resume": snapshot.json}
+            ).text
             
             response = llm_handler.invoke_with_history(
                 system_message="You are a resume optimization expert. Provide only specific, actionable changes based on the previous job analysis conversation.",
                 user_message=optimization_prompt,
-                add_to_history=False  # Don't store optimization results in history
+                add_to_history=False,  # Don't store optimization results in history
+                history=session.analysis_history
             )
             
             content = response.content if hasattr(response, "content") else str(response)
             
         else:
             # Use the provided analysis response to generate optimization suggestions
-            optimization_prompt = f"""
-            Based on this job description analysis, suggest specific technical skills to add/update and experience improvements:
-            
-            ANALYSIS RESPONSE:
-            {analysis_response}
-            
-            CURRENT RESUME:
-            {json.dumps(resume_content.dict(), indent=2)}
-            
-                         Please provide response in JSON format similar to the resume :
-
-             Example:
-
-             {{
-                 "TechnicalSkills": [
-                     {{
-                         "category": "Programming Languages",
-                         "items": ["Python", "JavaScript/TypeScript", "Java", "Go", "C/C++"]
-                     }}
-                 ],
-                 "Experience": [
-                     {{
-                         "company": "Company Name",
-                         "position": "Position",
-                         "location": "Location",
-                         "startDate": "Start Date",
-                         "endDate": "End Date",
-                         "description": ["Bullet Point 1", "Bullet Point 2", "Bullet Point 3"]
-                     }}
-                 ]
-             }}
-            
-            Only suggest changes that would genuinely improve the match with the job requirements.
-            If no changes are needed for a section, omit that section.
-            """
+            optimization_prompt = build_prompt(
+                "auto_optimize",
+                AUTO_OPTIMIZE_PROMPT,
+                {"analysis": analysis_response, "resume": snapshot.compact_json},
+                originals={"resume": snapshot.json}
+            ).text
             
             response = llm_handler.model.invoke([
                 ("system", "You are a resume optimization expert. Provide only specific, actionable changes."),
@@ -373,57 +349,25 @@ def tool_auto_optimize_resume(analysis_response: str):
             content = response.content if hasattr(response, "content") else str(response)
         
         # Parse and apply changes from JSON response
-        changes_made = []
-        
         try:
-            # Try to extract JSON from the response
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
+            operations = parse_optimization_suggestions(content)
+            if operations is None:
+                return f"Could not extract valid JSON from response. Raw response:\n\n{content}"
+            if not operations:
+                return f"No applicable changes found in the optimization suggestions:\n\n{content}"
             
-            if json_start != -1 and json_end > json_start:
-                json_content = content[json_start:json_end]
-                parsed_data = json.loads(json_content)
-                print(f"Parsed data: {parsed_data}")
-                # Handle Technical Skills
-                if "technicalSkills" in parsed_data:
-                    for skill_category in parsed_data["technicalSkills"]:
-                        if "category" in skill_category and "items" in skill_category:
-                            category = skill_category["category"]
-                            items = skill_category["items"]
-                            
-                            # Convert to pipe format for existing function
-                            skill_line = f"{category}|{','.join(items)}"
-                            try:
-                                change_technical_skills(category, items)
-                                changes_made.append(f"Skills: {skill_line}")
-                            except Exception as e:
-                                changes_made.append(f"Skills error: {e}")
-                
-                # Handle Experience Updates
-                if "experience" in parsed_data:
-                    for exp_item in parsed_data["experience"]:
-                        if "company" in exp_item and "description" in exp_item:
-                            company = exp_item["company"]
-                            description_points = exp_item["description"]
-                            
-                            # Convert to pipe format for existing function
-                            exp_line = f"{company}|{'|'.join(description_points)}"
-                            try:
-                                change_experience_details(company, description_points)
-                                changes_made.append(f"Experience: {exp_line}")
-                            except Exception as e:
-                                changes_made.append(f"Experience error: {e}")
-                
-                # Generate LaTeX and PDF
-                latex = resume_to_latex()
-                latex_to_pdf(latex, "app/uploads/resume.pdf")
-                print("Resume pdf generated")
-                
-                return f"RESUME AUTO-OPTIMIZATION COMPLETE:\n\n OPTIMIZATION SUGGESTIONS:\n{content}"
-
+            # Apply every suggested change in one pass and commit them as one new resume version
+            try:
+                result = apply_patch(snapshot.resume, operations)
+            except PatchError as e:
+                return f"Optimization suggestions were not applied: {e}. Raw response:\n\n{content}"
+            session.resume = result.resume
             
-            else:
-                return f"Could not extract valid JSON from response. Raw response:\n\n{content}"
+            # Generate LaTeX and queue the PDF build
+            download = _render_resume(session)
+            logger.info("Resume pdf queued")
+            
+            return f"RESUME AUTO-OPTIMIZATION COMPLETE:\n\n OPTIMIZATION SUGGESTIONS:\n{content}\n\n{download}"
                 
         except json.JSONDecodeError as e:
             return f"Error parsing JSON response: {e}. Raw response:\n\n{content}"
@@ -448,7 +392,7 @@ def tool_delete_technical_skills(delete_input: str):
        Example: "ITEM|Frontend|HTML"
        Example: "ITEM|Programming Languages|Java"
     """
-    print(f"Received delete_input: {repr(delete_input)}")
+    logger.debug("Received delete_input: %r", delete_input)
     
     try:
         if not delete_input or "|" not in delete_input:
@@ -469,8 +413,10 @@ def tool_delete_technical_skills(delete_input: str):
             if not category:
                 return "Category name is required"
             
-            success = delete_technical_skill_category(category)
-            if success:
+            session = get_current_session()
+            updated = delete_technical_skill_category(session.resume, category)
+            if updated is not None:
+                session.resume = updated
                 return f"Successfully deleted entire '{category}' skill category from resume"
             else:
                 return f"Category '{category}' not found in resume"
@@ -485,8 +431,10 @@ def tool_delete_technical_skills(delete_input: str):
             if not category or not item:
                 return "Both category name and skill name are required"
             
-            success = delete_technical_skill_item(category, item)
-            if success:
+            session = get_current_session()
+            updated = delete_technical_skill_item(session.resume, category, item)
+            if updated is not None:
+                session.resume = updated
                 return f"Successfully deleted '{item}' from '{category}' category"
             else:
                 return f"Either category '{category}' or skill '{item}' not found in resume"
@@ -498,6 +446,33 @@ def tool_delete_technical_skills(delete_input: str):
         return f"Error deleting technical skills: {e}. Input was: {repr(delete_input)}"
 
 
+@tool("Apply Resume Patch", return_direct=True)
+def tool_apply_resume_patch(patch: str):
+    """
+    Applies several resume edits in one step; either all of them are applied or none are.
+    Use this tool when the user asks for more than one change at once.
+    Input: one operation per line, or operations separated by ;;
+    SET|field|value (field: name, email, location, phone, linkedinUrl, githubUrl)
+    SKILLS|category|skill1,skill2 (replace or add a skill category)
+    ADD_SKILL|category|skill
+    DELETE_CATEGORY|category
+    DELETE_SKILL|category|skill
+    EXPERIENCE|company|bullet_point_1|bullet_point_2
+    Example: SET|email|jane@example.com;;DELETE_SKILL|Frontend|HTML5;;SKILLS|Backend|Go,gRPC
+    """
+    logger.debug("Received patch: %r", patch)
+    
+    try:
+        operations = parse_patch(patch)
+        session = get_current_session()
+        result = apply_patch(session.resume, operations)
+        session.resume = result.resume
+        return f"Applied {len(result.applied)} changes: {result.applied}"
+    except PatchError as e:
+        return f"No changes applied. {e}"
+    except Exception as e:
+        return f"Error applying resume patch: {e}. Input was: {repr(patch)}"
+
 # Export all tools for easy import
 ALL_TOOLS = [
     tool_change_email,
@@ -511,5 +486,6 @@ ALL_TOOLS = [
     tool_change_experience_details,
     tool_analyze_job_description,
     tool_auto_optimize_resume,
-    tool_delete_technical_skills
+    tool_delete_technical_skills,
+    tool_apply_resume_patch
 ] 
\ No newline at end of file
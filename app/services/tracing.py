@@ -0,0 +1,194 @@
+"""
+Per-request trace ids and timed spans for the agent, its tools, LLM calls and rendering.
+
+The trace id lives in a context variable, so it follows a request into the agent thread
+pool and asyncio.to_thread workers, and is stamped on every log record through
+TraceIdFilter. Spans record their durations into the metrics registry.
+"""
+
+import contextvars
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from app.services.metrics import metrics
+
+TRACE_HEADER = "X-Trace-Id"
+
+_trace_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("trace_id", default=None)
+
+logger = logging.getLogger("resume_bot")
+
+span_duration = metrics.histogram("span_duration_seconds", "Duration of instrumented spans", ["span"])
+span_errors = metrics.counter("span_errors_total", "Spans that ended with an exception", ["span"])
+agent_iterations = metrics.histogram("agent_iteration_duration_seconds", "One agent reasoning step: the LLM call and the tool it picked")
+agent_runs = metrics.counter("agent_runs_total", "Agent runs, by how they ended", ["outcome"])
+tool_duration = metrics.histogram("tool_duration_seconds", "Tool invocation duration", ["tool"])
+tool_errors = metrics.counter("tool_errors_total", "Tool invocations that raised", ["tool"])
+llm_duration = metrics.histogram("llm_call_duration_seconds", "LLM call duration", ["provider", "model"])
+llm_errors = metrics.counter("llm_errors_total", "LLM calls that raised", ["provider", "model"])
+llm_tokens = metrics.counter("llm_tokens_total", "Tokens used by LLM calls", ["provider", "model", "kind"])
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+
+def get_trace_id() -> Optional[str]:
+    """The current request's trace id, if any."""
+    return _trace_id.get()
+
+
+@contextmanager
+def use_trace_id(trace_id: Optional[str]):
+    """Bind `trace_id` for the duration of the block."""
+    token = _trace_id.set(trace_id)
+    try:
+        yield trace_id
+    finally:
+        _trace_id.reset(token)
+
+
+class TraceIdFilter(logging.Filter):
+    """Adds the current trace id to log records as `trace_id` ("-" outside a request)."""
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = _trace_id.get() or "-"
+        return True
+
+
+def configure_logging(level: int = logging.INFO):
+    """Log through a handler that prefixes every line with the request's trace id."""
+    if any(isinstance(f, TraceIdFilter) for handler in logger.handlers for f in handler.filters):
+        return
+    handler = logging.StreamHandler()
+    handler.addFilter(TraceIdFilter())
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [trace=%(trace_id)s] %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+@contextmanager
+def span(name: str):
+    """Time a block as span `name`, counting it as an error if it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        span_errors.inc(span=name)
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        span_duration.observe(duration, span=name)
+        logger.debug("span %s took %.1f ms", name, duration * 1000)
+
+
+def _token_usage(response) -> tuple[int, int]:
+    """(prompt, completion) tokens of an LLMResult, from message usage metadata or llm_output."""
+    prompt = completion = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt += usage.get("input_tokens", 0)
+                completion += usage.get("output_tokens", 0)
+    if not prompt and not completion:
+        usage = (response.llm_output or {}).get("token_usage") or (response.llm_output or {}).get("usage") or {}
+        prompt = usage.get("prompt_tokens", usage.get("input_tokens", 0)) or 0
+        completion = usage.get("completion_tokens", usage.get("output_tokens", 0)) or 0
+    return prompt, completion
+
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """
+    Attached to each shared chat model, so every call is timed and its tokens counted,
+    whether it comes from the agent, a tool or the optimize/ingest pipelines.
+    """
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self._starts: dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        self._starts[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs):
+        self._starts[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        # Imported here: session -> resume_store -> resume imports this module
+        from app.services.session import record_token_usage
+
+        start = self._starts.pop(run_id, None)
+        prompt, completion = _token_usage(response)
+        record_token_usage(prompt, completion)
+        llm_tokens.inc(prompt, provider=self.provider, model=self.model, kind="prompt")
+        llm_tokens.inc(completion, provider=self.provider, model=self.model, kind="completion")
+        if start is not None:
+            duration = time.perf_counter() - start
+            llm_duration.observe(duration, provider=self.provider, model=self.model)
+            logger.info("llm %s/%s took %.1f ms (%d prompt + %d completion tokens)",
+                        self.provider, self.model, duration * 1000, prompt, completion)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        start = self._starts.pop(run_id, None)
+        llm_errors.inc(provider=self.provider, model=self.model)
+        if start is not None:
+            llm_duration.observe(time.perf_counter() - start, provider=self.provider, model=self.model)
+
+
+class AgentMetricsHandler(BaseCallbackHandler):
+    """
+    Passed to each agent run: times every reasoning step (the agent's LLM call plus the
+    tool it picked) and every tool invocation.
+    """
+    def __init__(self):
+        self._root: Optional[UUID] = None
+        self._iteration_start: Optional[float] = None
+        self._tool_starts: dict[UUID, tuple[str, float]] = {}
+
+    def _end_iteration(self):
+        if self._iteration_start is not None:
+            agent_iterations.observe(time.perf_counter() - self._iteration_start)
+            self._iteration_start = None
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs):
+        if parent_run_id is None:
+            self._root = run_id
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs):
+        # A model call that is not inside a tool starts the agent's next reasoning step
+        if not self._tool_starts:
+            self._end_iteration()
+            self._iteration_start = time.perf_counter()
+
+    def on_tool_start(self, serialized, input_str: str, *, run_id: UUID, **kwargs):
+        self._tool_starts[run_id] = (serialized.get("name", "tool"), time.perf_counter())
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs):
+        name, start = self._tool_starts.pop(run_id, ("tool", None))
+        if start is not None:
+            duration = time.perf_counter() - start
+            tool_duration.observe(duration, tool=name)
+            logger.info("tool %s took %.1f ms", name, duration * 1000)
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs):
+        name, start = self._tool_starts.pop(run_id, ("tool", None))
+        tool_errors.inc(tool=name)
+        if start is not None:
+            tool_duration.observe(time.perf_counter() - start, tool=name)
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs):
+        if run_id == self._root:
+            self._end_iteration()
+            agent_runs.inc(outcome="ok")
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs):
+        if run_id == self._root:
+            self._end_iteration()
+            agent_runs.inc(outcome="error")
@@ -0,0 +1,212 @@
+"""
+Content-addressed storage for uploaded files.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import aiofiles
+from fastapi import UploadFile
+
+_SAFE_SUFFIX = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured maximum size."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File exceeds the maximum upload size of {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class StoredUpload:
+    """An uploaded file saved under the SHA-256 of its content."""
+    file_id: str
+    filename: str
+    path: Path
+    size: int
+    deduplicated: bool = False
+
+
+def _safe_suffix(filename: Optional[str]) -> str:
+    # Keep the extension so the content extractor can detect the file type
+    suffix = Path(filename or "").suffix.lower()
+    return suffix if _SAFE_SUFFIX.match(suffix) else ""
+
+
+class UploadIndex:
+    """
+    Upload history of a directory, oldest first, persisted next to the files.
+
+    Re-uploading existing content moves it to the end, so the newest upload is
+    always last regardless of directory listing order. Several worker processes may
+    share a directory: updates hold an exclusive lock on a lock file and re-read the
+    index first, and reads reload it when another process has rewritten it.
+    """
+    INDEX_NAME = ".index.json"
+    LOCK_NAME = ".index.lock"
+
+    def __init__(self, upload_dir: Path):
+        self.upload_dir = Path(upload_dir)
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.upload_dir / self.INDEX_NAME
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._version: Optional[tuple[int, int]] = None
+        self._lock = threading.Lock()
+        with self._lock, self._file_lock():
+            self._load()
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self.upload_dir / self.LOCK_NAME, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _index_version(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            # No usable index yet: rebuild it from what is on disk, oldest first
+            files = [path for path in self.upload_dir.iterdir() if path.is_file() and not path.name.startswith(".")]
+            entries = [
+                {"file_id": path.stem, "filename": path.name, "name": path.name, "size": path.stat().st_size, "uploaded_at": path.stat().st_mtime}
+                for path in sorted(files, key=lambda path: path.stat().st_mtime)
+            ]
+        self._entries = OrderedDict((entry["file_id"], entry) for entry in entries)
+        self._version = self._index_version()
+
+    def _refresh(self):
+        # Pick up entries other workers have recorded since we last read the index
+        if self._index_version() != self._version:
+            with self._file_lock():
+                self._load()
+
+    def _save(self):
+        fd, tmp_path = tempfile.mkstemp(dir=self.upload_dir, prefix=".index-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(list(self._entries.values()), f)
+        os.replace(tmp_path, self.path)
+        self._version = self._index_version()
+
+    def record(self, upload: "StoredUpload"):
+        """Mark `upload` as the most recent upload."""
+        with self._lock, self._file_lock():
+            self._load()
+            self._entries.pop(upload.file_id, None)
+            self._entries[upload.file_id] = {
+                "file_id": upload.file_id,
+                "filename": upload.filename,
+                "name": upload.path.name,
+                "size": upload.size,
+                "uploaded_at": time.time()
+            }
+            self._save()
+
+    def latest(self) -> Optional[Path]:
+        """Path of the most recently uploaded file that still exists."""
+        with self._lock:
+            self._refresh()
+            for entry in reversed(self._entries.values()):
+                path = self.upload_dir / entry["name"]
+                if path.is_file():
+                    return path
+        return None
+
+    def entries(self) -> list[dict]:
+        """All indexed uploads, oldest first."""
+        with self._lock:
+            self._refresh()
+            return list(self._entries.values())
+
+
+@lru_cache()
+def _get_upload_index(upload_dir: str) -> UploadIndex:
+    return UploadIndex(Path(upload_dir))
+
+
+def get_upload_index(upload_dir) -> UploadIndex:
+    """Return the shared index for an upload directory."""
+    return _get_upload_index(str(Path(upload_dir).resolve()))
+
+
+def _record_upload(upload_dir: Path, upload: StoredUpload):
+    get_upload_index(upload_dir).record(upload)
+
+
+def find_upload(upload_dir: Path, file_id: str) -> Optional[Path]:
+    """Return the stored path for `file_id`, if it exists."""
+    if not re.fullmatch(r"[0-9a-f]{64}", file_id):
+        return None
+    for path in upload_dir.glob(f"{file_id}*"):
+        if path.is_file():
+            return path
+    return None
+
+
+async def save_upload(file: UploadFile, upload_dir: Path, max_bytes: int, chunk_size: int = 64 * 1024) -> StoredUpload:
+    """
+    Stream `file` to disk in chunks, hashing as it goes, and store it as `<sha256><ext>`.
+
+    The file is read from Starlette's spooled copy, so this check only enforces
+    `max_bytes` on the file itself; RequestSizeLimitMiddleware (app.api.middleware)
+    keeps oversized request bodies from being spooled at all. Uploading identical
+    content again, under any file name, reuses the stored file. Lookups, the move into
+    place and the index update run in threads, since the index takes a file lock.
+    """
+    await asyncio.to_thread(upload_dir.mkdir, parents=True, exist_ok=True)
+    temp_path = upload_dir / f".upload-{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(chunk)
+                await out.write(chunk)
+
+        file_id = digest.hexdigest()
+        # One file per content: a re-upload with another extension keeps the first one's
+        existing = await asyncio.to_thread(find_upload, upload_dir, file_id)
+        deduplicated = existing is not None
+        path = existing if deduplicated else upload_dir / f"{file_id}{_safe_suffix(file.filename)}"
+        if not deduplicated:
+            await asyncio.to_thread(os.replace, temp_path, path)
+        stored = StoredUpload(
+            file_id=file_id,
+            filename=file.filename or path.name,
+            path=path,
+            size=size,
+            deduplicated=deduplicated
+        )
+        await asyncio.to_thread(_record_upload, upload_dir, stored)
+        return stored
+    finally:
+        await asyncio.to_thread(temp_path.unlink, missing_ok=True)
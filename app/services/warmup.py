@@ -0,0 +1,189 @@
+"""
+Startup warm-up, so the first real request doesn't pay for cold caches and connections.
+
+Warm-up runs in the background once the app has started: /api/health answers at once,
+while /api/ready reports not-ready until every step has finished (or the warm-up timed
+out). Steps are best effort: a failed or timed-out step doesn't keep the worker out of
+rotation, since the request that needs it would fail or warm it up anyway, but the worker
+reports itself "degraded" instead of "ready" so the failure is visible.
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Union
+
+from app.services.llm_handler import get_chat_model, get_settings
+from app.services.renderer import TEMPLATE_NAME, get_renderer
+from app.services.resume import latex_to_pdf, resume_to_latex
+from app.services.resume_store import get_default_snapshot
+from app.services.tracing import logger
+from app.utils.tokens import DEFAULT_ENCODING, count_tokens
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+TIMED_OUT = "timed_out"
+CANCELLED = "cancelled"
+
+
+@dataclass(frozen=True)
+class Skipped:
+    """Returned by a warm-up step that had nothing to warm, with the reason why."""
+    reason: str
+
+
+# A step returns a short description of what it warmed, or why it was skipped
+StepResult = Union[str, Skipped]
+
+
+@dataclass
+class WarmupStep:
+    """Outcome of one warm-up step."""
+    status: str = PENDING
+    duration_ms: Optional[float] = None
+    detail: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {"status": self.status, "duration_ms": self.duration_ms, "detail": self.detail}
+
+
+@dataclass
+class WarmupState:
+    """Progress of the warm-up, shared with the readiness endpoint."""
+    steps: dict[str, WarmupStep] = field(default_factory=dict)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None
+
+    def count(self, *statuses: str) -> int:
+        return sum(1 for step in self.steps.values() if step.status in statuses)
+
+    @property
+    def status(self) -> str:
+        """Readiness as reported by /api/ready: warming_up, then degraded or ready."""
+        if not self.ready:
+            return "warming_up"
+        return "degraded" if self.count(FAILED, TIMED_OUT) else "ready"
+
+    def to_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "status": self.status,
+            "failed_steps": self.count(FAILED),
+            "timed_out_steps": self.count(TIMED_OUT),
+            "duration_ms": round((self.finished_at - self.started_at) * 1000, 1) if self.ready and self.started_at else None,
+            "steps": {name: step.to_dict() for name, step in self.steps.items()},
+        }
+
+    def stats(self) -> dict:
+        return {
+            "ready": int(self.ready),
+            "degraded": int(self.status == "degraded"),
+            "failed_steps": self.count(FAILED, TIMED_OUT),
+        }
+
+
+def warm_template() -> StepResult:
+    """Compile the resume template and render the default resume once."""
+    get_renderer().get_template(TEMPLATE_NAME)
+    resume_to_latex(get_default_snapshot().resume)
+    return TEMPLATE_NAME
+
+
+def warm_agent() -> StepResult:
+    """Build (and discard) an agent, paying for the deferred langchain.agents imports."""
+    from app.services.chatbot import get_agent
+    get_agent()
+    return "agent built"
+
+
+def warm_tokenizer() -> StepResult:
+    """Load the tokenizer used for memory budgets (tiktoken may download its encoding)."""
+    count_tokens("warm up")
+    return DEFAULT_ENCODING
+
+
+def warm_llm_pool() -> StepResult:
+    """
+    Build the configured chat model and open its pooled connections with a free
+    request (listing models), so the TLS handshake is done before the first chat.
+
+    Only OpenAI-compatible models expose the pooled client this needs; for Claude and
+    Gemini the model is built but its first connection is still made by a real request.
+    """
+    model = get_chat_model()
+    client = getattr(model, "root_client", None)
+    if client is None:
+        return Skipped(f"{type(model).__name__} built; it has no pooled client to prime")
+    client.models.list()
+    return f"connected to {client.base_url}"
+
+
+def warm_latex() -> StepResult:
+    """Run a throwaway compile of the default resume: builds the preamble format and warms TeX's file caches."""
+    if shutil.which("pdflatex") is None:
+        return Skipped("pdflatex not found")
+    latex = resume_to_latex(get_default_snapshot().resume)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        latex_to_pdf(latex, os.path.join(temp_dir, "warmup.pdf"), use_cache=False)
+    return "compiled"
+
+
+async def _run_step(state: WarmupState, name: str, func: Callable[[], StepResult]):
+    step = state.steps[name]
+    start = time.perf_counter()
+    try:
+        result = await asyncio.to_thread(func)
+        if isinstance(result, Skipped):
+            step.status, step.detail = SKIPPED, result.reason
+        else:
+            step.status, step.detail = DONE, result
+    except Exception as e:
+        step.status, step.detail = FAILED, str(e) or type(e).__name__
+        logger.warning("Warm-up step %s failed: %s", name, step.detail)
+    finally:
+        step.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+
+async def run_warmup(state: WarmupState):
+    """Run every enabled warm-up step, marking the state ready when done or timed out."""
+    settings = get_settings()
+    state.started_at = time.time()
+    steps = {"template": warm_template, "agent": warm_agent, "tokenizer": warm_tokenizer}
+    if settings.warmup_llm:
+        steps["llm_pool"] = warm_llm_pool
+    if settings.warmup_latex:
+        steps["latex"] = warm_latex
+    state.steps = {name: WarmupStep() for name in steps}
+
+    tasks = [asyncio.create_task(_run_step(state, name, func)) for name, func in steps.items()]
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=settings.warmup_timeout_seconds)
+        if pending:
+            _mark_pending(state, TIMED_OUT)
+            logger.warning("Warm-up timed out after %gs, reporting ready anyway", settings.warmup_timeout_seconds)
+    except asyncio.CancelledError:
+        _mark_pending(state, CANCELLED)
+        raise
+    finally:
+        # Steps still running in threads finish on their own; their tasks are dropped
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        state.finished_at = time.time()
+    logger.info("Warm-up finished in %.0f ms: %s", (state.finished_at - state.started_at) * 1000,
+                ", ".join(f"{name}={step.status}" for name, step in state.steps.items()))
+
+
+def _mark_pending(state: WarmupState, status: str):
+    for step in state.steps.values():
+        if step.status == PENDING:
+            step.status = status
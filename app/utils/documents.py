@@ -0,0 +1,92 @@
+"""
+Streaming text readers for PDF, Word and CSV documents.
+
+Kept free of app imports so parser worker processes only load what they need.
+"""
+
+import mimetypes
+import PyPDF2
+import docx
+import csv
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+TEXT_MIME_TYPES = ['text/plain', 'text/markdown', 'application/json', 'text/html', 'text/css', 'text/javascript']
+TEXT_SUFFIXES = ['.txt', '.md', '.json', '.html', '.css', '.js', '.py', '.java', '.c', '.cpp', '.h', '.ts', '.tsx', '.jsx', '.tex']
+
+def _iter_pdf_pages(file_path: str) -> Iterator[str]:
+    with open(file_path, 'rb') as f:
+        pdf_reader = PyPDF2.PdfReader(f)
+        for page in pdf_reader.pages:
+            yield page.extract_text()
+
+def _iter_docx_paragraphs(file_path: str) -> Iterator[str]:
+    doc = docx.Document(file_path)
+    for para in doc.paragraphs:
+        yield para.text
+
+def _iter_csv_rows(file_path: str) -> Iterator[str]:
+    with open(file_path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            yield ",".join(row)
+
+def _join_until(chunks: Iterable[str], separator: str, max_length: int) -> tuple[str, bool]:
+    """
+    Join chunks until the text reaches `max_length`, without pulling any further chunks.
+
+    Returns:
+        The joined text and whether every chunk was consumed
+    """
+    parts = []
+    length = 0
+    for chunk in chunks:
+        if parts:
+            length += len(separator)
+        parts.append(chunk)
+        length += len(chunk)
+        if length >= max_length:
+            return separator.join(parts)[:max_length], False
+    return separator.join(parts), True
+
+def read_pdf_file_content(file_path: str, max_length: int, max_pages: Optional[int] = None) -> tuple[str, bool]:
+    pages = _iter_pdf_pages(file_path)
+    if max_pages is None:
+        return _join_until(pages, "\n\n", max_length)
+    # Read one page past the cap to tell whether the document was cut short
+    text, complete = _join_until(islice(pages, max_pages), "\n\n", max_length)
+    if complete and next(pages, None) is not None:
+        complete = False
+    pages.close()
+    return text, complete
+
+def read_docx_file_content(file_path: str, max_length: int, max_pages: Optional[int] = None) -> tuple[str, bool]:
+    return _join_until(_iter_docx_paragraphs(file_path), "\n", max_length)
+
+def read_csv_file_content(file_path: str, max_length: int, max_pages: Optional[int] = None) -> tuple[str, bool]:
+    return _join_until(_iter_csv_rows(file_path), "\n", max_length)
+
+# Parsed document types: reader and label used in error messages
+DOCUMENT_READERS = {
+    'pdf': (read_pdf_file_content, 'PDF'),
+    'docx': (read_docx_file_content, 'Word document'),
+    'csv': (read_csv_file_content, 'CSV'),
+}
+
+def detect_file_kind(file_path: Path) -> tuple[Optional[str], Optional[str]]:
+    """
+    Classify a file as 'text', 'pdf', 'docx' or 'csv' from its mime type and suffix.
+
+    Returns:
+        The kind (None for unsupported files) and the guessed mime type
+    """
+    mime_type, _ = mimetypes.guess_type(file_path)
+    if mime_type in TEXT_MIME_TYPES or file_path.suffix in TEXT_SUFFIXES:
+        return 'text', mime_type
+    elif mime_type == 'application/pdf' or file_path.suffix == '.pdf':
+        return 'pdf', mime_type
+    elif mime_type in ['application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'] or file_path.suffix in ['.doc', '.docx']:
+        return 'docx', mime_type
+    elif mime_type == 'text/csv' or file_path.suffix == '.csv':
+        return 'csv', mime_type
+    return None, mime_type
@@ -1,79 +1,102 @@
-import mimetypes
-import PyPDF2
-import docx
-import csv
+import asyncio
 from pathlib import Path
-import os
+from typing import Optional
 
-def _read_simple_file_content(file_path: str) -> str:
+from app.services.document_parser import get_document_parser
+from app.services.extraction_cache import get_extraction_cache
+from app.services.llm_handler import get_settings
+from app.services.uploads import get_upload_index
+from app.utils.documents import DOCUMENT_READERS, detect_file_kind
+
+def _read_simple_file_content(file_path: str, max_length: Optional[int] = None) -> str:
     with open(file_path, 'r', errors='ignore') as f:
-            content = f.read()
+            content = f.read(max_length if max_length is not None else -1)
             return content
-    
-def _read_pdf_file_content(file_path: str) -> str:
-    with open(file_path, 'rb') as f:
-        pdf_reader = PyPDF2.PdfReader(f)
-        return "\n\n".join([page.extract_text() for page in pdf_reader.pages])
-
-def _read_docx_file_content(file_path: str) -> str:
-    doc = docx.Document(file_path)
-    return "\n".join([para.text for para in doc.paragraphs])
-
-def _read_csv_file_content(file_path: str) -> str:
-    with open(file_path, 'r', newline='', encoding='utf-8') as f:
-        csv_reader = csv.reader(f)
-        return "\n".join([",".join(row) for row in csv_reader])
 
+def _unsupported_file_message(file_path: Path, mime_type: Optional[str]) -> str:
+    return f"[File content not extracted: {file_path.name} is a {mime_type or 'binary'} file]"
 
 
-def extract_file_content(file_path: str, max_length: int = 10000) -> str:
+def extract_file_content(file_path: str, max_length: int = 10000, use_cache: bool = True) -> str:
     """
     Extract content from a file based on its type.
-    
+
+    PDFs, Word documents and CSVs are read page by page (or paragraph/row by row) and
+    parsing stops once `max_length` characters are collected. Their text is cached on
+    disk by content hash, so repeated reads of the same file skip parsing.
+
     Args:
         file_path: Path to the file
         max_length: Maximum length of content to extract
-        
+        use_cache: Whether to read and populate the extraction cache
+
     Returns:
         String containing the extracted content
     """
     file_path = Path(file_path)
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
-    
-    mime_type, _ = mimetypes.guess_type(file_path)
-    
+
+    kind, mime_type = detect_file_kind(file_path)
+
     # Text files (including .tex)
-    if mime_type in ['text/plain', 'text/markdown', 'application/json', 'text/html', 'text/css', 'text/javascript'] or file_path.suffix in ['.txt', '.md', '.json', '.html', '.css', '.js', '.py', '.java', '.c', '.cpp', '.h', '.ts', '.tsx', '.jsx', '.tex']:
-        return _read_simple_file_content(file_path)[:max_length]
-    
-    # PDF files
-    elif mime_type == 'application/pdf' or file_path.suffix == '.pdf':
-        try:
-            return _read_pdf_file_content(file_path)[:max_length]
-        except Exception as e:
-            return f"Error extracting PDF content: {str(e)}"
-    
-    # Word documents
-    elif mime_type in ['application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'] or file_path.suffix in ['.doc', '.docx']:
-        try:
-            return _read_docx_file_content(file_path)[:max_length]
-        except Exception as e:
-            return f"Error extracting Word document content: {str(e)}"
-    
-    # CSV files
-    elif mime_type == 'text/csv' or file_path.suffix == '.csv':
-        try:
-            return _read_csv_file_content(file_path)[:max_length]
-        except Exception as e:
-            return f"Error extracting CSV content: {str(e)}"
-    
+    if kind == 'text':
+        return _read_simple_file_content(file_path, max_length)
+
     # Images and other binary files
-    else:
-        return f"[File content not extracted: {file_path.name} is a {mime_type or 'binary'} file]"
+    if kind is None:
+        return _unsupported_file_message(file_path, mime_type)
+
+    # PDF files, Word documents and CSV files
+    reader, label = DOCUMENT_READERS[kind]
+    cache = get_extraction_cache() if use_cache else None
+    content_hash = cache.content_hash(file_path) if cache else None
+    if cache:
+        cached = cache.get(content_hash, max_length)
+        if cached is not None:
+            return cached
+    try:
+        text, complete = reader(file_path, max_length, get_settings().parse_max_pages or None)
+    except Exception as e:
+        return f"Error extracting {label} content: {str(e)}"
+    if cache:
+        cache.put(content_hash, text, complete)
+    return text
+
+async def extract_file_content_async(file_path: str, max_length: int = 10000, use_cache: bool = True, content_hash: Optional[str] = None) -> str:
+    """
+    Async variant of extract_file_content for request handlers, e.g. resume ingestion.
+
+    Documents are parsed in the worker process pool, under its timeout, memory and
+    page limits, so a large or malformed file never blocks the event loop. Their text
+    goes through the same extraction cache, keyed by `content_hash` when the caller
+    already knows it (e.g. an upload's file id). Unlike extract_file_content, a
+    document that can't be parsed raises DocumentParseError.
+    """
+    file_path = Path(file_path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    kind, mime_type = detect_file_kind(file_path)
+    if kind == 'text':
+        return await asyncio.to_thread(_read_simple_file_content, file_path, max_length)
+    if kind is None:
+        return _unsupported_file_message(file_path, mime_type)
+
+    cache = get_extraction_cache() if use_cache else None
+    if cache and content_hash is None:
+        content_hash = await asyncio.to_thread(cache.content_hash, file_path)
+    if cache:
+        cached = await asyncio.to_thread(cache.get, content_hash, max_length)
+        if cached is not None:
+            return cached
+    result = await get_document_parser().parse(file_path, max_length)
+    if cache:
+        await asyncio.to_thread(cache.put, content_hash, result.text, result.complete)
+    return result.text
 
-def get_latest_uploaded_file_content(upload_dir="app/uploads"):
-    files = [f for f in os.listdir(upload_dir) if os.path.isfile(os.path.join(upload_dir, f))]
-    if not files:
+def get_latest_uploaded_file_content(upload_dir=None):
+    latest = get_upload_index(upload_dir or get_settings().upload_dir).latest()
+    if latest is None:
         return None
-    return extract_file_content(os.path.join(upload_dir, files[-1]))
\ No newline at end of file
+    return extract_file_content(latest)
@@ -0,0 +1,64 @@
+"""
+Token counting for prompt budgeting.
+
+Uses tiktoken when it is installed and its encoding files are available (they are
+downloaded once, or read from TIKTOKEN_CACHE_DIR); otherwise falls back to a
+characters-per-token estimate, which is close enough for budgeting English prose.
+"""
+
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from app.services.tracing import logger
+
+DEFAULT_ENCODING = "o200k_base"
+
+# Average characters per token for English text with OpenAI's tokenizers
+CHARS_PER_TOKEN = 4
+
+# Framing tokens the chat format adds around each message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@lru_cache()
+def _get_encoding(name: str):
+    # Resolved once per process: a missing or offline tokenizer falls back for good
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning("tiktoken encoding %s unavailable (%s), estimating token counts", name, type(e).__name__)
+        return None
+
+
+def count_tokens(text: str, encoding: str = DEFAULT_ENCODING) -> int:
+    """Number of tokens in `text`, exact with tiktoken and estimated without it."""
+    if not text:
+        return 0
+    encoder = _get_encoding(encoding)
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return max(1, -(-len(text) // CHARS_PER_TOKEN))
+
+
+def count_message_tokens(messages: Iterable[tuple[str, str]], encoding: str = DEFAULT_ENCODING) -> int:
+    """Tokens used by (role, content) chat messages, including per-message framing."""
+    return sum(count_tokens(str(content), encoding) + MESSAGE_OVERHEAD_TOKENS for _, content in messages)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, encoding: str = DEFAULT_ENCODING, keep: str = "head") -> str:
+    """
+    Cut `text` down to at most `max_tokens` tokens, keeping its beginning ("head")
+    or its end ("tail").
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, encoding) <= max_tokens:
+        return text
+    encoder: Optional[object] = _get_encoding(encoding)
+    if encoder is not None:
+        tokens = encoder.encode(text, disallowed_special=())
+        kept = tokens[:max_tokens] if keep == "head" else tokens[-max_tokens:]
+        return encoder.decode(kept)
+    limit = max_tokens * CHARS_PER_TOKEN
+    return text[:limit] if keep == "head" else text[-limit:]
@@ -1,49 +1,43 @@
 
+import re
+
+# LaTeX special characters and their escaped versions
+LATEX_SPECIAL_CHARS = {
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '^': r'\^{}',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+}
+
+_LATEX_ESCAPE_PATTERN = re.compile("[" + re.escape("".join(LATEX_SPECIAL_CHARS)) + "]")
+_LATEX_UNESCAPE_PATTERN = re.compile(
+    "|".join(re.escape(escaped) for escaped in sorted(LATEX_SPECIAL_CHARS.values(), key=len, reverse=True))
+)
+_LATEX_UNESCAPES = {escaped: char for char, escaped in LATEX_SPECIAL_CHARS.items()}
+
+
 def escape_latex_special_chars(text: str) -> str:
     """
     Escape special characters in text for LaTeX formatting.
-    Replaces special characters with their escaped versions using backslashes.
-    """
-    # Dictionary of LaTeX special characters and their escaped versions
-    latex_special_chars = {
-        '&': r'\&',
-        '%': r'\%',
-        '$': r'\$',
-        '#': r'\#',
-        '^': r'\^{}',
-        '_': r'\_',
-        '{': r'\{',
-        '}': r'\}',
-    }
-    
-    # Replace each special character with its escaped version
-    for char, escaped in latex_special_chars.items():
-        text = text.replace(char, escaped)
-    
-    return text
+    Replaces every special character with its escaped version in a single pass.
+    """
+    # Most resume strings contain no special characters at all
+    if _LATEX_ESCAPE_PATTERN.search(text) is None:
+        return text
+    return _LATEX_ESCAPE_PATTERN.sub(lambda match: LATEX_SPECIAL_CHARS[match.group(0)], text)
 
 
 def unescape_latex_special_chars(text: str) -> str:
     """
     Unescape LaTeX special characters back to normal text.
     """
-    # Dictionary of escaped LaTeX characters and their unescaped versions
-    latex_escaped_chars = {
-        r'\&': '&',
-        r'\%': '%',
-        r'\$': '$',
-        r'\#': '#',
-        r'\^{}': '^',
-        r'\_': '_',
-        r'\{': '{',
-        r'\}': '}',
-    }
-    
-    # Replace each escaped character with its unescaped version
-    for escaped, char in latex_escaped_chars.items():
-        text = text.replace(escaped, char)
-    
-    return text
+    return _LATEX_UNESCAPE_PATTERN.sub(lambda match: _LATEX_UNESCAPES[match.group(0)], text)
 
 
 def escape_data(data):
@@ -59,4 +53,18 @@ def escape_data(data):
         return escape_latex_special_chars(data)
     else:
         # Return other types (int, float, bool, None) unchanged
-        return data
\ No newline at end of file
+        return data
+
+
+def unescape_data(data):
+    """
+    Recursively unescape LaTeX special characters in all string fields of the data.
+    """
+    if isinstance(data, dict):
+        return {key: unescape_data(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [unescape_data(item) for item in data]
+    elif isinstance(data, str):
+        return unescape_latex_special_chars(data)
+    else:
+        return data
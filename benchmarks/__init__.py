@@ -0,0 +1,3 @@
+"""
+Offline benchmarks for the resume bot. Run a module with `poetry run python -m benchmarks.<name>`.
+"""
@@ -0,0 +1,122 @@
+"""
+Synthetic, deterministic fixtures for the benchmarks: resumes, documents and LLM responses
+at several sizes, generated locally so nothing needs the network.
+"""
+
+import csv
+import json
+import random
+from pathlib import Path
+
+from docx import Document
+
+from app.services.resume import RESUME
+
+# Size name -> multiplier applied to the bundled resume's entries and to document length
+SIZES = {"small": 1, "medium": 10, "large": 50}
+
+_WORDS = (
+    "python fastapi react kubernetes latency throughput pipeline service cache distributed "
+    "designed implemented reduced improved migrated scaled deployed monitored automated built "
+    "team customers requests database queries streaming events platform infrastructure api"
+).split()
+
+
+def make_resume_data(scale: int) -> dict:
+    """The bundled resume with its experience, projects and skills repeated `scale` times."""
+    data = dict(RESUME)
+    for key in ("experience", "projects", "technicalSkills"):
+        data[key] = [
+            {**entry, "company": f"{entry['company']} #{i}"} if key == "experience" else dict(entry)
+            for i in range(scale) for entry in RESUME[key]
+        ]
+    return data
+
+
+def make_sentences(count: int, seed: int = 0) -> list[str]:
+    """`count` pseudo-random resume-like sentences, including LaTeX special characters."""
+    rng = random.Random(seed)
+    sentences = []
+    for i in range(count):
+        words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 20))]
+        sentences.append(f"{' '.join(words).capitalize()} by {rng.randint(5, 95)}% & saved ${rng.randint(1, 900)}k #{i}")
+    return sentences
+
+
+def make_optimization_response(scale: int) -> str:
+    """An auto-optimize LLM reply: prose wrapped around the JSON suggestions."""
+    sentences = make_sentences(scale * 8, seed=scale)
+    suggestions = {
+        "technicalSkills": [
+            {"category": f"Category {i}", "items": [f"Skill {i}.{j}" for j in range(8)]} for i in range(scale * 2)
+        ],
+        "experience": [
+            {"company": f"Company {i}", "position": "Engineer", "description": sentences[i * 4:i * 4 + 4]}
+            for i in range(scale * 2)
+        ],
+    }
+    return f"Here are the suggested changes:\n\n```json\n{json.dumps(suggestions, indent=2)}\n```\n\nThese align the resume with the role."
+
+
+def _pdf_string(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: Path, pages: int, lines_per_page: int = 40) -> Path:
+    """Write a plain-text PDF with `pages` pages of generated sentences."""
+    sentences = make_sentences(pages * lines_per_page, seed=pages)
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    page_ids = []
+    for page in range(pages):
+        page_id, content_id = 4 + page * 2, 5 + page * 2
+        lines = sentences[page * lines_per_page:(page + 1) * lines_per_page]
+        stream = "BT /F1 9 Tf 12 TL 40 800 Td " + " ".join(f"({_pdf_string(line)}) '" for line in lines) + " ET"
+        objects[page_id] = f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        objects[content_id] = f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream"
+        page_ids.append(page_id)
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>"
+
+    body = b"%PDF-1.4\n"
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(body)
+        body += f"{number} 0 obj\n{objects[number]}\nendobj\n".encode("latin-1")
+    xref_offset = len(body)
+    xref = f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    xref += "".join(f"{offsets[number]:010d} 00000 n \n" for number in sorted(objects))
+    body += (xref + f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n").encode("latin-1")
+    path.write_bytes(body)
+    return path
+
+
+def write_docx(path: Path, paragraphs: int) -> Path:
+    """Write a Word document with `paragraphs` generated paragraphs."""
+    document = Document()
+    for sentence in make_sentences(paragraphs, seed=paragraphs):
+        document.add_paragraph(sentence)
+    document.save(path)
+    return path
+
+
+def write_csv(path: Path, rows: int) -> Path:
+    """Write a CSV of `rows` generated job-history rows."""
+    sentences = make_sentences(rows, seed=rows)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["company", "title", "start", "end", "summary"])
+        for i, sentence in enumerate(sentences):
+            writer.writerow([f"Company {i}", "Software Engineer", f"Jan {2000 + i % 25}", "Present", sentence])
+    return path
+
+
+def write_documents(directory: Path, scale: int) -> dict[str, Path]:
+    """One PDF, DOCX and CSV fixture for `scale`, keyed by document kind."""
+    directory.mkdir(parents=True, exist_ok=True)
+    return {
+        "pdf": write_pdf(directory / f"resume-{scale}.pdf", pages=scale),
+        "docx": write_docx(directory / f"resume-{scale}.docx", paragraphs=scale * 40),
+        "csv": write_csv(directory / f"resume-{scale}.csv", rows=scale * 40),
+    }
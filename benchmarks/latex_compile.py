@@ -0,0 +1,66 @@
+"""
+Compare cold and warm (precompiled preamble) pdflatex renders of the bundled template.
+
+    poetry run python -m benchmarks.latex_compile --runs 5
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+import os
+
+from app.services.latex_format import get_format_cache, split_preamble
+from app.services.resume import get_default_resume_content, latex_to_pdf, resume_to_latex
+
+
+def _time_renders(latex: str, runs: int, use_format: bool) -> list[float]:
+    timings = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, "resume.pdf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            latex_to_pdf(latex, output_path, use_cache=False, use_format=use_format)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(label: str, timings: list[float]):
+    print(
+        f"{label:<6} runs={len(timings)} "
+        f"min={min(timings) * 1000:.0f}ms "
+        f"median={statistics.median(timings) * 1000:.0f}ms "
+        f"max={max(timings) * 1000:.0f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="renders per mode")
+    args = parser.parse_args()
+
+    if shutil.which("pdflatex") is None:
+        print("pdflatex not found on PATH, skipping")
+        return
+
+    latex = resume_to_latex(get_default_resume_content())
+
+    # Build the format up front so the warm timings measure steady state only
+    start = time.perf_counter()
+    format_path = get_format_cache().format_for(split_preamble(latex)[0])
+    build_time = time.perf_counter() - start
+    if format_path is None:
+        print("Could not build a format for the template preamble, warm mode unavailable")
+        return
+    print(f"format build: {build_time * 1000:.0f}ms ({format_path})")
+
+    cold = _time_renders(latex, args.runs, use_format=False)
+    warm = _time_renders(latex, args.runs, use_format=True)
+    _report("cold", cold)
+    _report("warm", warm)
+    print(f"speedup: {statistics.median(cold) / statistics.median(warm):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compare the single-pass LaTeX escaper with the previous str.replace-chain implementation
+on synthetic resumes of increasing size.
+
+    poetry run python -m benchmarks.latex_escape --scales 1 10 100
+"""
+
+import argparse
+import timeit
+
+from app.models.resume import Resume
+from app.services.resume import resume_to_latex
+from app.utils.util import escape_latex_special_chars
+from benchmarks.fixtures import make_resume_data
+
+
+def legacy_escape_latex_special_chars(text: str) -> str:
+    # Previous implementation: one str.replace pass per special character
+    latex_special_chars = {
+        '&': r'\&',
+        '%': r'\%',
+        '$': r'\$',
+        '#': r'\#',
+        '^': r'\^{}',
+        '_': r'\_',
+        '{': r'\{',
+        '}': r'\}',
+    }
+    for char, escaped in latex_special_chars.items():
+        text = text.replace(char, escaped)
+    return text
+
+
+def legacy_escape_data(data):
+    if isinstance(data, dict):
+        return {key: legacy_escape_data(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [legacy_escape_data(item) for item in data]
+    elif isinstance(data, str):
+        return legacy_escape_latex_special_chars(data)
+    return data
+
+
+def _strings(data) -> list[str]:
+    if isinstance(data, dict):
+        return [s for value in data.values() for s in _strings(value)]
+    if isinstance(data, list):
+        return [s for item in data for s in _strings(item)]
+    return [data] if isinstance(data, str) else []
+
+
+def _best_ms(func, number: int, repeat: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="resume size multipliers")
+    parser.add_argument("--number", type=int, default=20, help="calls per timing")
+    parser.add_argument("--repeat", type=int, default=5, help="timings per measurement (best is reported)")
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        data = make_resume_data(scale)
+        strings = _strings(data)
+        resume = Resume.model_validate(data)
+        chars = sum(len(s) for s in strings)
+
+        legacy_strings = _best_ms(lambda: [legacy_escape_latex_special_chars(s) for s in strings], args.number, args.repeat)
+        single_pass = _best_ms(lambda: [escape_latex_special_chars(s) for s in strings], args.number, args.repeat)
+        legacy_load = _best_ms(lambda: Resume.model_validate(legacy_escape_data(data)), args.number, args.repeat)
+        raw_load = _best_ms(lambda: Resume.model_validate(data), args.number, args.repeat)
+        render = _best_ms(lambda: resume_to_latex(resume), args.number, args.repeat)
+
+        print(f"scale={scale} strings={len(strings)} chars={chars}")
+        print(f"  escape strings  legacy={legacy_strings:.3f}ms single-pass={single_pass:.3f}ms ({legacy_strings / single_pass:.2f}x)")
+        print(f"  load resume     escape_data+validate={legacy_load:.3f}ms validate={raw_load:.3f}ms ({legacy_load / raw_load:.2f}x)")
+        print(f"  render (|latex) {render:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
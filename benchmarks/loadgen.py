@@ -0,0 +1,233 @@
+"""
+Drive a running app with concurrent simulated users and report throughput, latency
+percentiles and error rates per endpoint and per tool.
+
+Point the app at the mock LLM server (see benchmarks/mock_llm.py) so no provider is paid for:
+
+    poetry run python -m benchmarks.mock_llm --port 8100 &
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=mock poetry run uvicorn app.main:app --port 8000 &
+    poetry run python -m benchmarks.loadgen --scenario mixed --concurrency 16 --duration 30 --output mixed.json
+
+Each simulated user keeps its own session cookie. Requests are labelled by endpoint and
+by the tool they are meant to exercise; 429 responses are counted as rejections, other
+4xx/5xx responses and transport failures as errors.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from docx import Document
+
+from app.services.resume import get_default_resume_content, resume_to_latex
+from benchmarks.mock_llm import CANNED_ACTIONS
+from benchmarks.suite import percentile
+
+# Edits the command router handles without an LLM call, labelled by the tool they reach
+FAST_PATH_COMMANDS = {
+    "Change Name": "change my name to Jane Doe",
+    "Change Email": "update my email to jane.doe@example.com",
+    "Change Technical Skills": "set my Backend skills to Go, gRPC, PostgreSQL",
+    "Delete Technical Skills": "remove HTML5 from Frontend",
+}
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    tool: str
+    status: Optional[int]
+    latency_ms: float
+    error: Optional[str] = None
+
+
+class Request:
+    """One simulated request: which endpoint and tool it exercises and how to send it."""
+    def __init__(self, endpoint: str, tool: str, send: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]):
+        self.endpoint = endpoint
+        self.tool = tool
+        self.send = send
+
+
+def _chat(tool: str, message: str) -> Request:
+    return Request("/api/chat", tool, lambda client, n: client.post("/api/chat", json={"message": message}))
+
+
+def _chat_stream(tool: str, message: str) -> Request:
+    async def send(client: httpx.AsyncClient, n: int) -> httpx.Response:
+        response = await client.post("/api/chat/stream", json={"message": message})
+        # A stream that ends in an error event is a failure even though the status was 200
+        if response.status_code == 200 and "event: error" in response.text:
+            response.status_code = 502
+        return response
+    return Request("/api/chat/stream", tool, send)
+
+
+def _upload_tex() -> Request:
+    base = get_default_resume_content()
+
+    async def send(client: httpx.AsyncClient, n: int) -> httpx.Response:
+        # A distinct name per request keeps the ingestion cache from serving every upload
+        latex = resume_to_latex(base.model_copy(update={"name": f"Load Test {n}"}))
+        files = {"file": (f"resume-{n}.tex", latex.encode("utf-8"), "application/x-tex")}
+        return await client.post("/api/upload", files=files)
+    return Request("/api/upload", "ingest:template", send)
+
+
+def _upload_docx() -> Request:
+    async def send(client: httpx.AsyncClient, n: int) -> httpx.Response:
+        document = Document()
+        document.add_paragraph(f"Load Test {n}")
+        document.add_paragraph("Software Engineer at Toddle, 2021 - Present. Built backend services in Python.")
+        buffer = io.BytesIO()
+        document.save(buffer)
+        files = {"file": (f"resume-{n}.docx", buffer.getvalue(), "application/vnd.openxmlformats-officedocument.wordprocessingml.document")}
+        return await client.post("/api/upload", files=files)
+    return Request("/api/upload", "ingest:llm", send)
+
+
+def build_scenarios() -> dict[str, list[tuple[float, Request]]]:
+    """Scenario name -> weighted requests to draw from."""
+    fast_path = [(1, _chat(f"fast:{tool}", message)) for tool, message in FAST_PATH_COMMANDS.items()]
+    agent = [(1, _chat(tool, message)) for tool, (message, _) in CANNED_ACTIONS.items()]
+    stream = [(1, _chat_stream(tool, message)) for tool, (message, _) in CANNED_ACTIONS.items()]
+    upload = [(3, _upload_tex()), (1, _upload_docx())]
+    return {
+        "fast-path": fast_path,
+        "agent": agent,
+        "stream": stream,
+        "upload": upload,
+        "mixed": (
+            [(4 * w, r) for w, r in fast_path] + [(2 * w, r) for w, r in agent]
+            + [(w, r) for w, r in stream] + [(2 * w, r) for w, r in upload]
+        ),
+    }
+
+
+async def _user(base_url: str, requests: list[tuple[float, Request]], deadline: float, budget: list[int],
+                samples: list[Sample], rng: random.Random, timeout: float):
+    weights = [weight for weight, _ in requests]
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        while time.perf_counter() < deadline and budget[0] > 0:
+            budget[0] -= 1
+            number = budget[1] = budget[1] + 1
+            request = rng.choices(requests, weights=weights)[0][1]
+            start = time.perf_counter()
+            try:
+                response = await request.send(client, number)
+                status, error = response.status_code, None
+            except httpx.HTTPError as e:
+                status, error = None, type(e).__name__
+            samples.append(Sample(request.endpoint, request.tool, status, (time.perf_counter() - start) * 1000, error))
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict:
+    """Throughput, latency percentiles and error rates for a group of samples."""
+    latencies = sorted(sample.latency_ms for sample in samples)
+    rejected = sum(1 for sample in samples if sample.status == 429)
+    errors = sum(1 for sample in samples if sample.status is None or (sample.status >= 400 and sample.status != 429))
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "errors": errors,
+        "rejected": rejected,
+        "error_rate": round(errors / len(samples), 4),
+    }
+
+
+def _print_table(title: str, groups: dict[str, dict]):
+    print(f"\n{title}")
+    for name, stats in sorted(groups.items()):
+        print(
+            f"  {name:<36} n={stats['requests']:<6} {stats['throughput_rps']:>7.2f} rps "
+            f"p50={stats['p50_ms']:>8.1f}ms p95={stats['p95_ms']:>8.1f}ms p99={stats['p99_ms']:>8.1f}ms "
+            f"errors={stats['error_rate']:.1%} rejected={stats['rejected']}"
+        )
+
+
+async def run(args) -> dict:
+    scenarios = build_scenarios()
+    requests = scenarios[args.scenario]
+    samples: list[Sample] = []
+    # Remaining request budget and a running request number, shared by the simulated users
+    budget = [args.requests or float("inf"), 0]
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(
+        _user(args.url, requests, deadline, budget, samples, random.Random(rng.random()), args.timeout)
+        for _ in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    by_endpoint, by_tool = defaultdict(list), defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample.endpoint].append(sample)
+        by_tool[sample.tool].append(sample)
+    errors = defaultdict(int)
+    for sample in samples:
+        if sample.error or (sample.status and sample.status >= 400):
+            errors[sample.error or str(sample.status)] += 1
+
+    return {
+        "scenario": args.scenario,
+        "label": args.label,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {"url": args.url, "concurrency": args.concurrency, "duration": args.duration, "requests": args.requests},
+        "elapsed_seconds": round(elapsed, 2),
+        "overall": summarize(samples, elapsed) if samples else {},
+        "endpoints": {name: summarize(group, elapsed) for name, group in by_endpoint.items()},
+        "tools": {name: summarize(group, elapsed) for name, group in by_tool.items()},
+        "error_kinds": dict(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="base URL of the running app")
+    parser.add_argument("--scenario", choices=list(build_scenarios()), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=8, help="simulated users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run for")
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--timeout", type=float, default=120, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the request mix")
+    parser.add_argument("--label", default="", help="free-form label stored with the results, e.g. the mock latency")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if not report["overall"]:
+        print("No requests completed")
+        return
+
+    overall = report["overall"]
+    print(
+        f"scenario={report['scenario']} concurrency={args.concurrency} elapsed={report['elapsed_seconds']}s "
+        f"requests={overall['requests']} throughput={overall['throughput_rps']} rps "
+        f"p50={overall['p50_ms']}ms p95={overall['p95_ms']}ms p99={overall['p99_ms']}ms "
+        f"errors={overall['error_rate']:.1%} rejected={overall['rejected']}"
+    )
+    _print_table("Per endpoint", report["endpoints"])
+    _print_table("Per tool", report["tools"])
+    if report["error_kinds"]:
+        print(f"\nErrors: {report['error_kinds']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+A local OpenAI-compatible chat-completions server for load tests, so no provider is paid for.
+
+Replies are canned but shaped like the app's real traffic: ReAct tool choices for the
+agent (see CANNED_ACTIONS), JSON suggestions for auto-optimize, schema-valid payloads
+for structured output, and plain text for everything else. Latency is drawn from a
+configurable distribution and streamed replies are sent token by token.
+
+    poetry run python -m benchmarks.mock_llm --port 8100 --latency lognormal:400:0.5 --token-delay constant:15
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=mock poetry run uvicorn app.main:app --port 8000
+
+Distributions are given in milliseconds as constant:MS, uniform:LOW:HIGH, normal:MEAN:STD,
+lognormal:MEDIAN:SIGMA or exponential:MEAN.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Tool -> a user message that the command router leaves to the agent, and the action input
+# the mock answers it with. The load generator sends these messages and labels them by tool.
+CANNED_ACTIONS = {
+    "Change Email": ("Could you put jane.doe@example.com on my resume as the contact address?", "jane.doe@example.com"),
+    "Change Location": ("I have moved, my resume should say I am based in Austin, TX now", "Austin, TX"),
+    "Change Technical Skills": ("My backend skill list should mention Go, gRPC and PostgreSQL", "Backend|Go,gRPC,PostgreSQL"),
+    "Apply Resume Patch": (
+        "Make a few fixes at once: my phone is 555-0100 and drop HTML5 from Frontend",
+        "SET|phone|555-0100;;DELETE_SKILL|Frontend|HTML5"
+    ),
+    "Analyze Job Description": (
+        "How well would I fit this role? Senior backend engineer, Python, Kubernetes, event streaming, 5+ years.",
+        "Senior backend engineer, Python, Kubernetes, event streaming, 5+ years."
+    ),
+    "Auto-Optimize Resume for Job": ("Go ahead and apply the suggestions from that analysis to my resume", "AUTO"),
+    "Get Updated Resume": ("Could I have a fresh copy of my resume as a PDF document please", ""),
+}
+
+# Reply to the auto-optimize prompt, which asks for JSON in the resume's shape
+OPTIMIZATION_SUGGESTIONS = {
+    "technicalSkills": [{"category": "Backend", "items": ["Python", "Go", "Kafka", "Kubernetes"]}],
+    "experience": [{
+        "company": "Toddle",
+        "position": "Software Engineer",
+        "description": [
+            "Built event-driven services on Kafka handling 2M messages per day",
+            "Cut p95 API latency by 40% by caching hot reads",
+        ],
+    }],
+}
+
+# Structured-output payloads by schema name; other schemas get a generated minimal instance
+STRUCTURED_PAYLOADS = {
+    "ResumeOptimization": {
+        "score": 72,
+        "missingSkills": ["Kafka", "Kubernetes"],
+        "recommendations": ["Highlight streaming work", "Quantify latency improvements"],
+        **OPTIMIZATION_SUGGESTIONS,
+    },
+}
+
+ANALYSIS_REPLY = (
+    "1. Missing skills: Kafka, Kubernetes.\n"
+    "2. Match score: 72/100.\n"
+    "3. Emphasize Python and distributed systems experience.\n"
+    "4. Quantify the impact of backend work at Toddle.\n"
+    "5. Add a bullet on production on-call and observability."
+)
+
+CHAT_REPLY = "I can help you edit your resume. Tell me what you would like to change."
+
+
+def parse_distribution(spec: str) -> Callable[[random.Random], float]:
+    """Parse a latency distribution spec into a sampler returning milliseconds (never negative)."""
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(":")] if params else []
+    samplers = {
+        "constant": (1, lambda rng, ms: ms),
+        "uniform": (2, lambda rng, low, high: rng.uniform(low, high)),
+        "normal": (2, lambda rng, mean, std: rng.gauss(mean, std)),
+        # Parameterized by the median, which is what a latency SLO is usually quoted as
+        "lognormal": (2, lambda rng, median, sigma: median * rng.lognormvariate(0, sigma)),
+        "exponential": (1, lambda rng, mean: rng.expovariate(1 / mean) if mean else 0),
+    }
+    if kind not in samplers or len(values) != samplers[kind][0]:
+        raise ValueError(f"Invalid latency distribution: {spec}")
+    sampler = samplers[kind][1]
+    return lambda rng: max(0.0, sampler(rng, *values))
+
+
+@dataclass
+class MockConfig:
+    """How the mock server behaves; distributions are specs accepted by parse_distribution."""
+    latency: str = "constant:0"
+    first_token: str = "constant:0"
+    token_delay: str = "constant:0"
+    error_rate: float = 0.0
+    error_status: int = 500
+    seed: Optional[int] = None
+    rng: random.Random = field(init=False)
+
+    def __post_init__(self):
+        self.rng = random.Random(self.seed)
+        self.sample_latency = parse_distribution(self.latency)
+        self.sample_first_token = parse_distribution(self.first_token)
+        self.sample_token_delay = parse_distribution(self.token_delay)
+
+
+def _text(content) -> str:
+    # Message content is either a string or a list of typed parts
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+def _example_from_schema(schema: dict, definitions: dict):
+    """A minimal instance of a JSON schema, used for structured-output requests."""
+    if "$ref" in schema:
+        return _example_from_schema(definitions[schema["$ref"].split("/")[-1]], definitions)
+    if "anyOf" in schema:
+        return _example_from_schema(schema["anyOf"][0], definitions)
+    if "default" in schema:
+        return schema["default"]
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: _example_from_schema(prop, definitions) for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [_example_from_schema(schema.get("items", {}), definitions)]
+    if kind in ("integer", "number"):
+        return 0
+    if kind == "boolean":
+        return False
+    if kind == "null":
+        return None
+    return "example"
+
+
+def _structured_payload(name: str, schema: dict) -> dict:
+    if name in STRUCTURED_PAYLOADS:
+        return STRUCTURED_PAYLOADS[name]
+    return _example_from_schema(schema, schema.get("$defs", {}))
+
+
+def _agent_reply(question: str) -> str:
+    if "Observation:" in question:
+        return "Thought: I now know the final answer\nFinal Answer: Done."
+    for tool_name, (message, action_input) in CANNED_ACTIONS.items():
+        if message in question:
+            blob = json.dumps({"action": tool_name, "action_input": action_input})
+            return f"Thought: The user wants the {tool_name} tool.\nAction:\n```\n{blob}\n```"
+    return f"Thought: I can answer directly.\nFinal Answer: {CHAT_REPLY}"
+
+
+def build_reply(body: dict) -> dict:
+    """
+    The assistant message for a chat-completions request: either `content` or `tool_calls`.
+    """
+    messages = body.get("messages", [])
+    last_user = next((_text(m.get("content")) for m in reversed(messages) if m.get("role") == "user"), "")
+    response_format = body.get("response_format") or {}
+
+    if response_format.get("type") == "json_schema":
+        json_schema = response_format.get("json_schema", {})
+        return {"content": json.dumps(_structured_payload(json_schema.get("name", ""), json_schema.get("schema", {})))}
+    if body.get("tools"):
+        function = body["tools"][0]["function"]
+        arguments = json.dumps(_structured_payload(function["name"], function.get("parameters", {})))
+        return {"content": None, "tool_calls": [{
+            "id": f"call_{uuid.uuid4().hex[:24]}",
+            "type": "function",
+            "function": {"name": function["name"], "arguments": arguments},
+        }]}
+    if any("$JSON_BLOB" in _text(m.get("content")) for m in messages):
+        return {"content": _agent_reply(last_user)}
+    if "JSON format" in last_user:
+        return {"content": "Suggested changes:\n" + json.dumps(OPTIMIZATION_SUGGESTIONS, indent=2)}
+    return {"content": ANALYSIS_REPLY}
+
+
+def _usage(body: dict, reply: dict) -> dict:
+    # Rough 4-characters-per-token estimate; good enough for load-test accounting
+    prompt_chars = sum(len(_text(m.get("content"))) for m in body.get("messages", []))
+    completion_chars = len(reply.get("content") or "") + sum(len(c["function"]["arguments"]) for c in reply.get("tool_calls", []))
+    prompt_tokens, completion_tokens = prompt_chars // 4 + 1, completion_chars // 4 + 1
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+
+
+def _tokens(content: str) -> list[str]:
+    words = content.split(" ")
+    return [word + " " for word in words[:-1]] + words[-1:]
+
+
+def create_app(config: MockConfig) -> FastAPI:
+    """Build the mock server's FastAPI app."""
+    app = FastAPI()
+    stats = {"requests": 0, "streamed": 0, "errors": 0}
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "mock"}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+        if config.error_rate and config.rng.random() < config.error_rate:
+            stats["errors"] += 1
+            await asyncio.sleep(config.sample_latency(config.rng) / 1000)
+            return JSONResponse(
+                {"error": {"message": "Injected mock failure", "type": "server_error"}},
+                status_code=config.error_status
+            )
+
+        reply = build_reply(body)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model = body.get("model", "mock")
+        finish_reason = "tool_calls" if reply.get("tool_calls") else "stop"
+
+        if not body.get("stream"):
+            await asyncio.sleep(config.sample_latency(config.rng) / 1000)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", **reply}, "finish_reason": finish_reason}],
+                "usage": _usage(body, reply),
+            }
+
+        stats["streamed"] += 1
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+        def chunk(delta: dict, finish: Optional[str] = None, usage: Optional[dict] = None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+            if usage:
+                payload["usage"] = usage
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def stream():
+            await asyncio.sleep(config.sample_first_token(config.rng) / 1000)
+            yield chunk({"role": "assistant", "content": ""})
+            if reply.get("tool_calls"):
+                calls = [{"index": i, **call} for i, call in enumerate(reply["tool_calls"])]
+                yield chunk({"tool_calls": calls})
+            else:
+                for token in _tokens(reply["content"]):
+                    yield chunk({"content": token})
+                    await asyncio.sleep(config.sample_token_delay(config.rng) / 1000)
+            yield chunk({}, finish=finish_reason)
+            if include_usage:
+                yield chunk({}, usage=_usage(body, reply))
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="lognormal:400:0.5", help="latency of non-streamed replies")
+    parser.add_argument("--first-token", default="lognormal:250:0.4", help="time to first token when streaming")
+    parser.add_argument("--token-delay", default="constant:15", help="delay between streamed tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status of injected failures")
+    parser.add_argument("--seed", type=int, help="seed for reproducible latencies and failures")
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency=args.latency,
+        first_token=args.first_token,
+        token_delay=args.token_delay,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
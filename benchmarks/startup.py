@@ -0,0 +1,133 @@
+"""
+Measure cold-start cost: per-module import time of the app and the time of each
+initialization step a new worker goes through, every run in a fresh interpreter.
+
+    poetry run python -m benchmarks.startup --runs 5 --top 15
+
+Runs fully offline: chat models are constructed but never called.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# Initialization steps timed by the child process, in order
+_INIT_SCRIPT = """
+import json, time
+timings = {}
+start = time.perf_counter()
+import app.main
+timings["import app.main"] = time.perf_counter() - start
+
+from app.services.llm_handler import get_chat_model, get_settings
+from app.services.renderer import get_renderer
+from app.services.renderer import TEMPLATE_NAME
+from app.services.chatbot import get_agent
+from app.services.resume_store import get_default_snapshot
+
+steps = [
+    ("settings", get_settings),
+    ("default resume snapshot", get_default_snapshot),
+    ("template compile", lambda: get_renderer().get_template(TEMPLATE_NAME)),
+    ("chat model (first provider SDK import)", get_chat_model),
+    ("agent (first session)", get_agent),
+    ("agent (next session)", get_agent),
+]
+for name, step in steps:
+    start = time.perf_counter()
+    step()
+    timings[name] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+def _child_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "startup-benchmark")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+    return env
+
+
+def import_times(module: str) -> dict[str, tuple[float, float]]:
+    """Module -> (self, cumulative) import time in seconds, from `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=_child_env(), check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us) / 1e6, int(cumulative_us) / 1e6)
+    return times
+
+
+def init_times() -> dict[str, float]:
+    """Seconds spent in each initialization step, measured in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", _INIT_SCRIPT],
+        capture_output=True, text=True, env=_child_env(), check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _median_by_key(runs: list[dict]) -> dict:
+    values = defaultdict(list)
+    for run in runs:
+        for key, value in run.items():
+            values[key].append(value)
+    return {key: statistics.median(samples) for key, samples in values.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="module to profile imports of")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per measurement (median is reported)")
+    parser.add_argument("--top", type=int, default=15, help="modules to list, by cumulative import time")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    import_runs = [import_times(args.module) for _ in range(args.runs)]
+    cumulative = _median_by_key([{name: times[1] for name, times in run.items()} for run in import_runs])
+    self_times = _median_by_key([{name: times[0] for name, times in run.items()} for run in import_runs])
+
+    # Import cost grouped by top-level package, from self times so nothing is counted twice
+    packages = defaultdict(float)
+    for name, seconds in self_times.items():
+        packages[name.split(".")[0]] += seconds
+
+    print(f"Import of {args.module}: {cumulative.get(args.module, 0) * 1000:.0f}ms (median of {args.runs})")
+    print(f"\nSlowest modules (cumulative):")
+    for name, seconds in sorted(cumulative.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {seconds * 1000:>8.1f}ms  {name}")
+    print(f"\nBy package (self time):")
+    for name, seconds in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {seconds * 1000:>8.1f}ms  {name}")
+
+    start = time.perf_counter()
+    init = _median_by_key([init_times() for _ in range(args.runs)])
+    print(f"\nInitialization steps (median of {args.runs}, {time.perf_counter() - start:.1f}s total):")
+    for name, seconds in init.items():
+        print(f"  {seconds * 1000:>8.1f}ms  {name}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "module": args.module,
+                "runs": args.runs,
+                "import_seconds": cumulative.get(args.module, 0),
+                "modules": dict(sorted(cumulative.items(), key=lambda item: -item[1])[:args.top]),
+                "packages": dict(sorted(packages.items(), key=lambda item: -item[1])),
+                "init_seconds": init,
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
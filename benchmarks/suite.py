@@ -0,0 +1,227 @@
+"""
+Offline micro-benchmarks for the non-LLM hot paths, with JSON baselines.
+
+Each case runs on synthetic fixtures at several sizes and reports min/p50/p95/p99
+latency and peak traced memory. Results are compared against a stored baseline, and the
+run fails (exit code 1) when a case gets slower or hungrier than the threshold allows.
+Latency is compared on the fastest of the timed calls, which are interleaved across
+cases in rounds: background load and frequency scaling only ever add time, so the
+minimum is what stays put between runs, where p50 over a few dozen calls routinely
+moved by half.
+
+    poetry run python -m benchmarks.suite --save-baseline     # record benchmarks/baseline.json
+    poetry run python -m benchmarks.suite                     # compare against it
+    poetry run python -m benchmarks.suite --sizes small --cases escape_data resume_to_latex
+
+Baselines are machine specific. The committed benchmarks/baseline.json only shows the
+format and catches gross regressions; for a CI gate, record the baseline in the same job
+on the same runner, from the base branch, and compare the change against it:
+
+    git checkout origin/main && poetry run python -m benchmarks.suite --save-baseline --baseline /tmp/baseline.json
+    git checkout - && poetry run python -m benchmarks.suite --baseline /tmp/baseline.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from app.models.resume import Resume
+from app.services.patch import parse_optimization_suggestions
+from app.services.resume import latex_to_pdf, resume_to_latex
+from app.utils.file import extract_file_content
+from app.utils.util import escape_data
+from benchmarks.fixtures import SIZES, make_optimization_response, make_resume_data, write_documents
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+# Characters read per document, matching extract_file_content's default
+EXTRACT_MAX_LENGTH = 10000
+
+# Cases that shell out to pdflatex are far slower, so they get fewer iterations and warm-ups
+SLOW_CASES = {"latex_to_pdf": 5}
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    index = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def time_calls(func: Callable[[], object], calls: int) -> list[float]:
+    """Milliseconds taken by each of `calls` calls to `func`."""
+    timings = []
+    # A collection landing in one timed call is noise, not a property of the code under test
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(calls):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        gc.enable()
+    return timings
+
+
+def trace_peak_kb(func: Callable[[], object]) -> float:
+    """Peak memory traced during one call to `func`."""
+    # Traced separately: tracemalloc slows allocation-heavy code too much to time under it
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def measure(cases: dict[str, Callable[[], object]], iterations: dict[str, int], warmup: int, rounds: int) -> dict:
+    """
+    Time every case over its `iterations` calls, after up to `warmup` untimed calls, and
+    trace one call's peak memory.
+
+    The timed calls are split into `rounds` that visit the cases in turn, so a stretch of
+    background load slows one round of a few cases instead of every call of one case.
+    """
+    for name, func in cases.items():
+        for _ in range(min(warmup, iterations[name])):
+            func()
+
+    timings: dict[str, list[float]] = {name: [] for name in cases}
+    for round_number in range(rounds):
+        for name, func in cases.items():
+            # Spread the calls evenly, with the remainder going to the first rounds
+            calls = iterations[name] // rounds + (round_number < iterations[name] % rounds)
+            timings[name].extend(time_calls(func, calls))
+
+    results = {}
+    for name, func in cases.items():
+        case_timings = sorted(timings[name])
+        results[name] = {
+            "iterations": len(case_timings),
+            "min_ms": round(case_timings[0], 4),
+            "p50_ms": round(percentile(case_timings, 50), 4),
+            "p95_ms": round(percentile(case_timings, 95), 4),
+            "p99_ms": round(percentile(case_timings, 99), 4),
+            "peak_kb": trace_peak_kb(func),
+        }
+    return results
+
+
+def build_cases(size: str, fixture_dir: Path) -> dict[str, Callable[[], object]]:
+    """The benchmark callables for one fixture size, keyed by case name."""
+    scale = SIZES[size]
+    data = make_resume_data(scale)
+    resume = Resume.model_validate(data)
+    latex = resume_to_latex(resume)
+    response = make_optimization_response(scale)
+    documents = write_documents(fixture_dir / size, scale)
+    pdf_path = str(fixture_dir / size / "output.pdf")
+
+    cases = {
+        "escape_data": lambda: escape_data(data),
+        "model_validate": lambda: Resume.model_validate(data),
+        "resume_to_latex": lambda: resume_to_latex(resume),
+        "optimization_json": lambda: parse_optimization_suggestions(response),
+    }
+    for kind, path in documents.items():
+        cases[f"extract_{kind}"] = lambda path=path: extract_file_content(str(path), EXTRACT_MAX_LENGTH, use_cache=False)
+    if shutil.which("pdflatex") is not None:
+        cases["latex_to_pdf"] = lambda: latex_to_pdf(latex, pdf_path, use_cache=False)
+    return cases
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    """
+    Describe every case whose fastest-call latency or peak memory regressed past
+    `threshold` (a fraction) relative to the baseline. Latency changes below
+    `min_delta_ms` are treated as noise.
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        # Baselines recorded before min_ms was tracked fall back to p50
+        metric = "min_ms" if "min_ms" in previous else "p50_ms"
+        latency, base_latency = current[metric], previous[metric]
+        if latency > base_latency * (1 + threshold) and latency - base_latency > min_delta_ms:
+            regressions.append(
+                f"{key}: {metric[:-3]} {base_latency:.3f}ms -> {latency:.3f}ms (+{(latency / base_latency - 1) * 100:.0f}%)"
+            )
+        peak, base_peak = current["peak_kb"], previous["peak_kb"]
+        if base_peak and peak > base_peak * (1 + threshold):
+            regressions.append(f"{key}: peak {base_peak:.1f}KB -> {peak:.1f}KB (+{(peak / base_peak - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES), help="fixture sizes to run")
+    parser.add_argument("--cases", nargs="+", help="only run these cases")
+    parser.add_argument("--iterations", type=int, default=200, help="timed calls per case")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed calls per case before timing")
+    parser.add_argument("--rounds", type=int, default=10, help="rounds the timed calls of all cases are interleaved over")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--output", type=Path, help="also write the results to this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed regression as a fraction (0.5 = 50%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.2, help="ignore latency regressions smaller than this")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        cases = {
+            f"{name}/{size}": func
+            for size in args.sizes
+            for name, func in build_cases(size, Path(fixture_dir)).items()
+            if not args.cases or name in args.cases
+        }
+        iterations = {key: min(args.iterations, SLOW_CASES.get(key.split("/")[0], args.iterations)) for key in cases}
+        results = measure(cases, iterations, args.warmup, args.rounds)
+
+    for key, stats in results.items():
+        print(
+            f"{key:<28} min={stats['min_ms']:>9.3f}ms p50={stats['p50_ms']:>9.3f}ms "
+            f"p95={stats['p95_ms']:>9.3f}ms p99={stats['p99_ms']:>9.3f}ms peak={stats['peak_kb']:>9.1f}KB"
+        )
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.save_baseline:
+        if args.baseline.exists():
+            # Keep entries for cases and sizes that were not part of this run
+            report["results"] = {**json.loads(args.baseline.read_text())["results"], **results}
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, run with --save-baseline to record one")
+        return
+    regressions = compare(results, json.loads(args.baseline.read_text())["results"], args.threshold, args.min_delta_ms)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
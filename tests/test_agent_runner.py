@@ -0,0 +1,33 @@
+import asyncio
+import threading
+
+from app.services.agent_runner import AgentRunner
+
+
+def test_cancelled_run_keeps_its_slot_until_the_thread_finishes():
+    async def scenario():
+        runner = AgentRunner(max_concurrency=1, max_queue=0, retry_after=1)
+        started, release = threading.Event(), threading.Event()
+
+        def work():
+            started.set()
+            release.wait(5)
+            return "done"
+
+        task = asyncio.create_task(runner.run(work))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        # The caller is gone but the worker thread is still busy
+        assert runner.pending == 1 and runner.full
+
+        release.set()
+        for _ in range(100):
+            if runner.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert runner.pending == 0 and not runner.full
+        assert await runner.run(lambda: "next") == "next"
+        runner.shutdown()
+
+    asyncio.run(scenario())
@@ -0,0 +1,45 @@
+import pytest
+
+from app.services.command_router import command_router
+from app.services.resume_store import get_default_snapshot
+
+
+@pytest.fixture(scope="module")
+def resume():
+    return get_default_snapshot().resume
+
+
+@pytest.mark.parametrize("message, tool_name, tool_input", [
+    ("change my email to jane@example.com", "Change Email", "jane@example.com"),
+    ("please update my name to Jane Doe.", "Change Name", "Jane Doe"),
+    ("change my location to Austin, TX", "Change Location", "Austin, TX"),
+    ("generate my resume", "Get Updated Resume", ""),
+    ("delete the Database category", "Delete Technical Skills", "CATEGORY|Database"),
+    ("remove Java from programming languages", "Delete Technical Skills", "ITEM|Programming Languages|Java"),
+    ("set frontend skills to React, Vue and Svelte", "Change Technical Skills", "Frontend|React,Vue,Svelte"),
+    ("update backend to FastAPI, Django", "Change Technical Skills", "Backend|FastAPI,Django"),
+    ("change Cloud & DevOps to AWS, Google Cloud Platform", "Change Technical Skills", "Cloud & DevOps|AWS,Google Cloud Platform"),
+])
+def test_routes_simple_commands(resume, message, tool_name, tool_input):
+    command = command_router.route(message, resume)
+    assert command is not None
+    assert (command.tool_name, command.tool_input) == (tool_name, tool_input)
+
+
+@pytest.mark.parametrize("message", [
+    "update Frontend to include Vue",
+    "change programming languages to add Rust",
+    "set the backend to match the job description",
+    "update frontend to something more modern",
+    "set backend to whatever fits the role",
+    "change frontend to also cover Angular",
+    "update backend to reflect my work on distributed systems at scale",
+    "change my location to Austin, TX and update Frontend to React",
+    "change my name to Jane Doe and then update my email",
+    "remove Java and update Frontend from programming languages",
+    "change the unknown category to Rust",
+    "optimize my resume for this job",
+    "set frontend to React\nand also Vue",
+])
+def test_leaves_free_form_requests_to_the_agent(resume, message):
+    assert command_router.route(message, resume) is None
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import signal
+import time
+
+import pytest
+
+from app.services import document_parser
+from app.services.document_parser import DocumentParseError, DocumentParser, DocumentParseTimeoutError
+from benchmarks.fixtures import write_csv, write_pdf
+
+
+def _parser(**overrides) -> DocumentParser:
+    options = {"workers": 2, "timeout": 5.0, "max_memory_bytes": 0, "max_pages": None}
+    return DocumentParser(**{**options, **overrides})
+
+
+def _parse(parser: DocumentParser, path, max_length: int = 10_000_000):
+    try:
+        return asyncio.run(parser.parse(path, max_length))
+    finally:
+        parser.shutdown()
+
+
+# Stand-ins for _parse_in_worker, run in the spawned workers
+
+def _stuck_parse(job_id, kind, file_path, max_length, max_pages, timeout):
+    document_parser._started_queue.put((job_id, os.getpid()))
+    # Like a parser stuck in native code: the alarm never interrupts it
+    signal.signal(signal.SIGALRM, signal.SIG_IGN)
+    with open(file_path + ".pid", "w") as f:
+        f.write(str(os.getpid()))
+    time.sleep(60)
+
+
+def _slow_parse(job_id, kind, file_path, max_length, max_pages, timeout):
+    if file_path.endswith("stuck.csv"):
+        return _stuck_parse(job_id, kind, file_path, max_length, max_pages, timeout)
+    if not file_path.endswith("warm.csv"):
+        time.sleep(0.8)
+    return "parsed", True, 0.8
+
+
+def test_page_cap_stops_reading_and_marks_the_text_incomplete(tmp_path):
+    path = write_pdf(tmp_path / "long.pdf", pages=5)
+    full = _parse(_parser(), path)
+    capped = _parse(_parser(max_pages=2), path)
+    assert full.complete and not capped.complete
+    assert 0 < len(capped.text) < len(full.text)
+    assert full.text.startswith(capped.text)
+
+
+def test_bad_document_raises_parse_error(tmp_path):
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"not a pdf at all")
+    parser = _parser()
+    with pytest.raises(DocumentParseError):
+        _parse(parser, path)
+    assert parser.stats()["failures"] == 1
+
+
+def test_unsupported_document_is_rejected_without_a_worker(tmp_path):
+    path = tmp_path / "photo.png"
+    path.write_bytes(b"\x89PNG")
+    with pytest.raises(DocumentParseError, match="Unsupported"):
+        _parse(_parser(), path)
+
+
+def test_alarm_times_out_a_slow_parse(tmp_path):
+    path = write_csv(tmp_path / "big.csv", rows=200_000)
+    parser = _parser(timeout=0.05)
+    with pytest.raises(DocumentParseTimeoutError):
+        _parse(parser, path)
+    assert parser.stats()["timeouts"] == 1
+
+
+def test_stuck_worker_is_killed_without_failing_its_neighbours(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_parser, "_parse_in_worker", _slow_parse)
+    monkeypatch.setattr(document_parser, "_TIMEOUT_GRACE_SECONDS", 0.1)
+    stuck = write_csv(tmp_path / "stuck.csv", rows=1)
+    other = write_csv(tmp_path / "other.csv", rows=1)
+    warm = write_csv(tmp_path / "warm.csv", rows=1)
+    parser = _parser(timeout=2.0)
+
+    async def scenario():
+        # Start both workers first so spawning them doesn't eat into the deadlines
+        await asyncio.gather(parser.parse(warm), parser.parse(warm))
+        stuck_parse = asyncio.create_task(parser.parse(stuck))
+        await asyncio.sleep(1.5)
+        # Still running on the old pool when the stuck worker's deadline passes
+        other_parse = asyncio.create_task(parser.parse(other))
+        return await asyncio.gather(stuck_parse, other_parse, return_exceptions=True)
+
+    try:
+        stuck_result, other_result = asyncio.run(scenario())
+    finally:
+        parser.shutdown()
+    assert isinstance(stuck_result, DocumentParseTimeoutError)
+    assert other_result.text == "parsed"
+
+    pid = int((tmp_path / "stuck.csv.pid").read_text())
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and _is_running(pid):
+        time.sleep(0.1)
+    assert not _is_running(pid)
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # A killed worker may linger as a zombie until its pool reaps it
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,40 @@
+import asyncio
+
+from app.services.extraction_cache import ExtractionCache
+
+
+def test_evicts_least_recently_used_entries_over_the_cap(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=500)
+    cache.put("a", "x" * 200, complete=True)
+    cache.put("b", "y" * 200, complete=True)
+    assert cache.get("a", 1000) == "x" * 200
+    cache.put("c", "z" * 200, complete=True)
+
+    assert cache.get("b", 1000) is None
+    assert cache.get("a", 1000) == "x" * 200
+    assert cache.get("c", 1000) == "z" * 200
+    assert not (tmp_path / "b.json").exists()
+    assert cache.stats()["bytes"] <= 500
+
+
+def test_existing_entries_count_toward_the_cap_on_startup(tmp_path):
+    ExtractionCache(str(tmp_path), max_bytes=10_000).put("a", "x" * 2000, complete=True)
+    cache = ExtractionCache(str(tmp_path), max_bytes=1000)
+    assert cache.stats()["entries"] == 0
+    assert not (tmp_path / "a.json").exists()
+
+
+def test_async_extraction_fills_the_cache_for_later_reads(tmp_path, monkeypatch):
+    from app.utils import file
+    from benchmarks.fixtures import write_docx
+
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(file, "get_extraction_cache", lambda: cache)
+    path = write_docx(tmp_path / "resume.docx", paragraphs=20)
+    content_hash = cache.content_hash(path)
+
+    text = asyncio.run(file.extract_file_content_async(str(path), 5000, content_hash=content_hash))
+    assert text and cache.stats()["misses"] == 1
+
+    assert file.extract_file_content(str(path), 5000) == text
+    assert cache.stats()["hits"] == 1
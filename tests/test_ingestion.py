@@ -0,0 +1,105 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.resume import Resume, TechnicalSkillEntry
+from app.services import ingestion
+from app.services.extraction_cache import ExtractionCache
+from app.services.ingestion import IngestionCache, ResumeIngestionError, ingest_resume
+from app.services.resume import get_default_resume_content, resume_to_latex
+from app.utils import file
+from benchmarks.fixtures import write_docx
+
+
+class StubStructuredModel:
+    """Stands in for llm_handler.model, answering every extraction with `result`."""
+    def __init__(self, result: Resume):
+        self.result = result
+        self.prompts = []
+
+    def with_structured_output(self, schema):
+        return self
+
+    async def ainvoke(self, messages):
+        self.prompts.append(messages[-1][1])
+        return self.result
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingestion, "get_ingestion_cache", lambda: IngestionCache(str(tmp_path / "resumes")))
+    monkeypatch.setattr(file, "get_extraction_cache", lambda: ExtractionCache(str(tmp_path / "text")))
+    stub = StubStructuredModel(Resume(name="Extracted Person"))
+    monkeypatch.setattr(ingestion, "llm_handler", SimpleNamespace(model=stub))
+    return stub
+
+
+def _template_resume() -> Resume:
+    resume = get_default_resume_content()
+    return resume.model_copy(update={
+        "name": "Zoë O'Brien",
+        "technicalSkills": (
+            TechnicalSkillEntry(category="Languages & Tools", items=["C++", "C#", "R&D", "100% test_coverage"]),
+            *resume.technicalSkills,
+        ),
+        # main.tex doesn't render project dates, so they can't come back
+        "projects": tuple(project.model_copy(update={"startDate": "", "endDate": ""}) for project in resume.projects),
+    })
+
+
+def test_template_latex_round_trips_without_the_llm(tmp_path, model):
+    resume = _template_resume()
+    path = tmp_path / "resume.tex"
+    path.write_text(resume_to_latex(resume))
+
+    ingested = asyncio.run(ingest_resume(path))
+
+    assert ingested.source == "template" and not ingested.cached
+    assert ingested.resume.model_dump() == resume.model_dump()
+    assert model.prompts == []
+
+
+def test_same_content_is_served_from_the_cache(tmp_path, model):
+    path = tmp_path / "resume.tex"
+    path.write_text(resume_to_latex(_template_resume()))
+    first = asyncio.run(ingest_resume(path))
+
+    # Another name, same bytes: found by content hash
+    copy = tmp_path / "copy.tex"
+    copy.write_bytes(path.read_bytes())
+    second = asyncio.run(ingest_resume(copy))
+
+    assert second.cached and second.source == "template"
+    assert second.resume == first.resume
+
+
+def test_other_latex_falls_back_to_one_llm_call(tmp_path, model):
+    path = tmp_path / "resume.tex"
+    path.write_text("\\documentclass{article}\\begin{document}Jane Roe, Python developer\\end{document}")
+
+    ingested = asyncio.run(ingest_resume(path))
+    again = asyncio.run(ingest_resume(path))
+
+    assert ingested.source == "llm" and ingested.resume.name == "Extracted Person"
+    assert again.cached
+    assert len(model.prompts) == 1 and "Jane Roe" in model.prompts[0]
+
+
+def test_word_documents_are_parsed_then_extracted(tmp_path, model):
+    path = write_docx(tmp_path / "resume.docx", paragraphs=5)
+
+    ingested = asyncio.run(ingest_resume(path))
+
+    assert ingested.source == "llm"
+    assert len(model.prompts) == 1
+
+
+def test_unsupported_and_empty_files_are_rejected(tmp_path, model):
+    with pytest.raises(ResumeIngestionError, match="Unsupported"):
+        asyncio.run(ingest_resume(tmp_path / "resume.png"))
+    empty = tmp_path / "empty.tex"
+    empty.write_text("   ")
+    with pytest.raises(ResumeIngestionError, match="No text"):
+        asyncio.run(ingest_resume(empty))
+    assert model.prompts == []
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+from app.services import tools
+from app.services.llm_cache import InMemoryLRUBackend, ResponseCache
+from app.services.session import SessionStore, use_session
+
+
+def test_counts_hits_and_misses():
+    cache = ResponseCache(InMemoryLRUBackend(10), ttl_seconds=60)
+    assert cache.get("a") is None
+    cache.set("a", "answer")
+    assert cache.get("a") == "answer"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_cacheable_analysis_is_made_without_the_prior_conversation(monkeypatch):
+    cache = ResponseCache(InMemoryLRUBackend(10), ttl_seconds=60)
+    sent = []
+
+    def invoke_with_history(system_message, user_message, add_to_history=False, history=None):
+        sent.append(list(history))
+        return SimpleNamespace(content="analysis")
+
+    monkeypatch.setattr(tools, "get_analysis_cache", lambda: cache)
+    monkeypatch.setattr(tools.llm_handler, "invoke_with_history", invoke_with_history)
+    session = SessionStore().get_or_create()
+    session.analysis_history.append(("user", "an earlier question"))
+    session.analysis_history.append(("assistant", "an earlier answer"))
+
+    with use_session(session):
+        assert tools.tool_analyze_job_description.func("Python developer").endswith("analysis")
+        assert tools.tool_analyze_job_description.func("Python developer").endswith("analysis")
+
+    assert sent == [[]]
+    assert cache.stats()["hits"] == 1
+    assert ("assistant", "analysis") in list(session.analysis_history)
@@ -0,0 +1,118 @@
+import pytest
+
+from app.services.patch import PatchError, PatchOperation, apply_patch, parse_patch
+from app.services.resume_store import ResumeSnapshot, get_default_snapshot
+
+
+@pytest.fixture(scope="module")
+def resume():
+    return get_default_snapshot().resume
+
+
+def _skills(resume) -> dict[str, tuple]:
+    return {skill.category: skill.items for skill in resume.technicalSkills}
+
+
+@pytest.mark.parametrize("text, operations", [
+    ("SET|name|Jane Doe", [PatchOperation("SET", "name", ["Jane Doe"])]),
+    ("skills|Frontend| React , Vue ,", [PatchOperation("SKILLS", "Frontend", ["React", "Vue"])]),
+    ("ADD_SKILL|Backend|Rust;;DELETE_CATEGORY|Database", [
+        PatchOperation("ADD_SKILL", "Backend", ["Rust"]),
+        PatchOperation("DELETE_CATEGORY", "Database"),
+    ]),
+    ("DELETE_SKILL|Frontend|Redux\n\nEXPERIENCE|Toddle|Shipped A|Shipped B", [
+        PatchOperation("DELETE_SKILL", "Frontend", ["Redux"]),
+        PatchOperation("EXPERIENCE", "Toddle", ["Shipped A", "Shipped B"]),
+    ]),
+])
+def test_parses_operations(text, operations):
+    assert parse_patch(text) == operations
+
+
+@pytest.mark.parametrize("text", [
+    "OP|...;;",
+    "",
+    " ;; \n",
+    "SET|name",
+    "SET|name|Jane|Doe",
+    "SKILLS|Frontend",
+    "DELETE_CATEGORY",
+    "DELETE_CATEGORY|Database|extra",
+    "EXPERIENCE|Toddle",
+    "SET|name|Jane;;RENAME|Frontend|UI",
+])
+def test_rejects_malformed_input(text):
+    with pytest.raises(PatchError):
+        parse_patch(text)
+
+
+@pytest.mark.parametrize("text, category, items", [
+    ("SKILLS|  frontend |Vue,Svelte", "frontend", ("Vue", "Svelte")),
+    ("SKILLS|FRONTEND:|Vue", "FRONTEND:", ("Vue",)),
+    ("ADD_SKILL|cloud  &  devops|Terraform", "Cloud & DevOps", None),
+    ("ADD_SKILL|Programming Languages|python", "Programming Languages", ("Python", "JavaScript/TypeScript", "Java", "Go", "C/C++")),
+])
+def test_matches_category_variants(resume, text, category, items):
+    patched = apply_patch(resume, parse_patch(text)).resume
+    assert len(patched.technicalSkills) == len(resume.technicalSkills)
+    skills = _skills(patched)
+    assert category in skills
+    if items is not None:
+        assert skills[category] == items
+    else:
+        assert skills[category][-1] == "Terraform"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("SKILLS|Testing|pytest,Playwright", {"Testing": ("pytest", "Playwright")}),
+    ("ADD_SKILL|Testing|pytest", {"Testing": ("pytest",)}),
+    ("DELETE_CATEGORY|database", {"Database": None}),
+])
+def test_upserts_and_deletes_categories(resume, text, expected):
+    skills = _skills(apply_patch(resume, parse_patch(text)).resume)
+    for category, items in expected.items():
+        assert skills.get(category) == items
+
+
+def test_deleting_the_last_item_removes_the_category(resume):
+    items = _skills(resume)["Database"]
+    patch = ";;".join(f"DELETE_SKILL|Database|{item}" for item in items)
+    assert "Database" not in _skills(apply_patch(resume, parse_patch(patch)).resume)
+
+
+def test_experience_upserts_by_normalized_company(resume):
+    patched = apply_patch(resume, parse_patch("EXPERIENCE|wave life  sciences|Led X\nEXPERIENCE|New Co|Built Y")).resume
+    companies = [entry.company for entry in patched.experience]
+    assert companies == [entry.company for entry in resume.experience] + ["New Co"]
+    assert patched.experience[0].description == ("Led X",)
+
+
+@pytest.mark.parametrize("text", [
+    "DELETE_SKILL|Frontend|Cobol",
+    "DELETE_SKILL|Mainframes|Cobol",
+    "DELETE_CATEGORY|Mainframes",
+    "SET|favourite colour|blue",
+])
+def test_missing_targets_raise(resume, text):
+    with pytest.raises(PatchError):
+        apply_patch(resume, parse_patch(text))
+
+
+@pytest.mark.parametrize("failing", [
+    "DELETE_SKILL|Frontend|Cobol",
+    "DELETE_CATEGORY|Mainframes",
+    "SET|favourite colour|blue",
+])
+def test_failing_operation_mid_batch_changes_nothing(resume, failing):
+    before = ResumeSnapshot.create(resume)
+    patch = f"SET|name|Jane Doe;;SKILLS|Backend|Rust;;{failing};;EXPERIENCE|Toddle|Rewritten"
+    with pytest.raises(PatchError, match="Operation 3"):
+        apply_patch(resume, parse_patch(patch))
+    assert ResumeSnapshot.create(resume).content_hash == before.content_hash
+    assert resume.name == before.resume.name
+
+
+def test_untouched_entries_are_shared(resume):
+    patched = apply_patch(resume, parse_patch("SKILLS|Backend|Rust")).resume
+    assert patched.experience is resume.experience
+    assert patched.technicalSkills[0] is resume.technicalSkills[0]
@@ -0,0 +1,27 @@
+from app.services.pdf_cache import PdfCache
+
+
+def _pdf(tmp_path, name: str, size: int):
+    path = tmp_path / name
+    path.write_bytes(b"%" * size)
+    return path
+
+
+def test_copy_to_serves_hits_and_misses(tmp_path):
+    cache = PdfCache(str(tmp_path / "cache"), max_bytes=1024)
+    cache.put("a", _pdf(tmp_path, "a.pdf", 100))
+    assert cache.copy_to("a", tmp_path / "out.pdf")
+    assert (tmp_path / "out.pdf").read_bytes() == b"%" * 100
+    assert not cache.copy_to("missing", tmp_path / "other.pdf")
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_evicted_or_deleted_entry_is_a_miss(tmp_path):
+    cache = PdfCache(str(tmp_path / "cache"), max_bytes=150)
+    cache.put("a", _pdf(tmp_path, "a.pdf", 100))
+    cache.put("b", _pdf(tmp_path, "b.pdf", 100))
+    assert not cache.copy_to("a", tmp_path / "out.pdf")
+
+    (tmp_path / "cache" / "b.pdf").unlink()
+    assert not cache.copy_to("b", tmp_path / "out.pdf")
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+from app.models.optimization import ExperienceUpdate, ResumeOptimization
+from app.models.resume import ExperienceEntry, Resume, TechnicalSkillEntry
+from app.services import pipeline
+from app.services.resume_store import ResumeSnapshot
+from app.services.session import SessionStore
+
+
+class StubStructuredModel:
+    def __init__(self, result):
+        self.result = result
+
+    def with_structured_output(self, schema):
+        return self
+
+    def invoke(self, messages):
+        return self.result
+
+
+def _resume() -> Resume:
+    return Resume(
+        name="Jane Doe",
+        technicalSkills=[
+            TechnicalSkillEntry(category="Backend", items=["Python"]),
+            TechnicalSkillEntry(category="Frontend", items=["React"]),
+        ],
+        experience=[ExperienceEntry(company="Acme Corp", description=["Built things"])],
+    )
+
+
+def test_diff_matches_respelled_names_to_existing_entries():
+    before = _resume()
+    after = before.model_copy(update={
+        "technicalSkills": [TechnicalSkillEntry(category="backend ", items=["Python", "Go"]), before.technicalSkills[1]],
+        "experience": [ExperienceEntry(company="ACME corp", description=["Built more things"])],
+    })
+    changes = pipeline.diff_resumes(before, after)
+    assert [(change.key, change.before, change.after) for change in changes] == [
+        ("backend ", ["Python"], ["Python", "Go"]),
+        ("ACME corp", ["Built things"], ["Built more things"]),
+    ]
+
+
+def test_optimize_applies_suggestions_as_a_patch(monkeypatch):
+    optimization = ResumeOptimization(
+        score=70,
+        technicalSkills=[TechnicalSkillEntry(category="BACKEND", items=["Python", "Django"])],
+        experience=[ExperienceUpdate(company="acme corp", description=["Shipped Django services"])],
+    )
+    monkeypatch.setattr(pipeline, "llm_handler", SimpleNamespace(model=StubStructuredModel(optimization)))
+    session = SessionStore(snapshot_factory=lambda: ResumeSnapshot.create(_resume())).get_or_create()
+
+    result, changes = pipeline.optimize_resume(session, "Django developer")
+
+    assert result.score == 70
+    assert [skill.category for skill in session.resume.technicalSkills] == ["BACKEND", "Frontend"]
+    assert list(session.resume.technicalSkills[0].items) == ["Python", "Django"]
+    assert len(session.resume.experience) == 1
+    assert [(change.section, change.before) for change in changes] == [
+        ("technicalSkills", ["Python"]),
+        ("experience", ["Built things"]),
+    ]
@@ -0,0 +1,39 @@
+from app.services.prompt_builder import TRUNCATION_MARKER, fit_document, fit_job_description
+from app.utils.tokens import count_tokens
+
+COMPANY_INTRO = "We are a fast-growing company building tools for hiring teams around the world. " * 120
+
+
+def test_drops_low_priority_section_but_keeps_headings_without_colons():
+    job_description = (
+        f"About the company\n{COMPANY_INTRO}\n\n"
+        "Responsibilities\n- Build APIs with FastAPI\n\n"
+        "## Requirements\n- 5+ years of Python\n- Docker"
+    )
+    fitted = fit_job_description(job_description, max_tokens=1500)
+    assert "Responsibilities" in fitted
+    assert "- Build APIs with FastAPI" in fitted
+    assert "- 5+ years of Python" in fitted
+    assert COMPANY_INTRO.split(".")[0] not in fitted
+
+
+def test_drops_benefits_after_requirements():
+    job_description = (
+        "Senior Python Engineer\n\nRequirements:\n- Python\n- FastAPI\n\n"
+        f"Benefits\n{'Free lunch and many perks every single day. ' * 200}"
+    )
+    fitted = fit_job_description(job_description, max_tokens=200)
+    assert fitted == "Senior Python Engineer\n\nRequirements:\n- Python\n- FastAPI"
+
+
+def test_never_empty_when_only_low_priority_content():
+    job_description = f"About us\n{COMPANY_INTRO}"
+    fitted = fit_job_description(job_description, max_tokens=100)
+    assert fitted == fit_document(job_description, 100)
+    assert fitted.endswith(TRUNCATION_MARKER)
+    assert count_tokens(fitted) <= 100
+
+
+def test_removes_boilerplate_and_whitespace_within_budget():
+    job_description = "  Python   engineer  \n\n\n\nWe are an equal opportunity employer.\n- Django"
+    assert fit_job_description(job_description, max_tokens=1500) == "Python engineer\n\n- Django"
@@ -0,0 +1,23 @@
+from app.models.resume import Resume
+from app.services.renderer import latex_filter, url_filter
+from app.services.resume import resume_to_latex
+
+
+def test_latex_filter_renders_none_as_empty():
+    assert latex_filter(None) == ""
+    assert latex_filter("R&D 100%") == r"R\&D 100\%"
+
+
+def test_url_filter_keeps_urls_intact_for_href():
+    assert url_filter("github.com/jane_doe/~repo#readme") == r"github.com/jane_doe/~repo\#readme"
+    assert url_filter("example.com/a b{c}") == r"example.com/a\%20b\%7Bc\%7D"
+    assert url_filter("example.com/100%25") == r"example.com/100\%25"
+    assert url_filter(None) == ""
+
+
+def test_href_targets_are_not_text_escaped():
+    resume = Resume(name="Jane", email="jane_doe@example.com", linkedinUrl="linkedin.com/in/jane_doe", githubUrl="github.com/jane_doe")
+    latex = resume_to_latex(resume)
+    assert r"\href{mailto:jane_doe@example.com}{\underline{jane\_doe@example.com}}" in latex
+    assert r"\href{https://www.linkedin.com/in/jane_doe}{\underline{linkedin.com/in/jane\_doe}}" in latex
+    assert r"\href{https://www.github.com/jane_doe}" in latex
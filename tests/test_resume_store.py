@@ -0,0 +1,42 @@
+import pytest
+from pydantic import ValidationError
+
+from app.services.patch import apply_patch, parse_patch
+from app.services.resume import change_experience_details, change_name, change_technical_skills
+from app.services.resume_store import ResumeStore, get_default_snapshot
+
+
+def test_default_resume_cannot_be_mutated_in_place():
+    resume = get_default_snapshot().resume
+    with pytest.raises(ValidationError):
+        resume.name = "Someone Else"
+    with pytest.raises(ValidationError):
+        resume.technicalSkills[0].category = "Other"
+
+
+def test_edits_leave_the_shared_default_untouched():
+    default = get_default_snapshot()
+    store = ResumeStore(default)
+    store.commit(change_name(store.current.resume, "Jane Doe"))
+    assert store.current.resume.name == "Jane Doe"
+    assert get_default_snapshot().resume.name == default.resume.name
+    assert get_default_snapshot().content_hash == default.content_hash
+
+
+def test_nested_sequences_are_immutable_too():
+    resume = get_default_snapshot().resume
+    with pytest.raises(AttributeError):
+        resume.technicalSkills.append(resume.technicalSkills[0])
+    with pytest.raises(AttributeError):
+        resume.experience[0].description.append("Invented a bullet")
+
+
+def test_edits_keep_sequences_immutable():
+    resume = get_default_snapshot().resume
+    edited = change_technical_skills(resume, "Cloud", ["AWS", "GCP"])
+    edited = change_experience_details(edited, resume.experience[0].company, ["Rewrote a bullet"])
+    edited = apply_patch(edited, parse_patch("ADD_SKILL|Cloud|Azure\nEXPERIENCE|New Co|Started")).resume
+    assert isinstance(edited.technicalSkills, tuple)
+    assert all(isinstance(skill.items, tuple) for skill in edited.technicalSkills)
+    assert isinstance(edited.experience, tuple)
+    assert all(isinstance(entry.description, tuple) for entry in edited.experience)
@@ -0,0 +1,26 @@
+from app.services.resume import change_name
+from app.services.session import SessionStore
+
+
+def test_update_size_counts_edits_made_during_a_request():
+    store = SessionStore()
+    session = store.get_or_create()
+    before = store.total_bytes
+    session.analysis_history.append(("user", "x" * 10_000))
+    session.analysis_history.append(("assistant", "y" * 10_000))
+    session.resume = change_name(session.resume, "A much longer name than before")
+    assert store.total_bytes == before
+    store.update_size(session)
+    assert store.total_bytes > before + 10_000
+
+
+def test_update_size_evicts_other_sessions_over_the_cap():
+    first = SessionStore().get_or_create().approx_size()
+    store = SessionStore(max_bytes=first * 2 + 1000)
+    old = store.get_or_create()
+    current = store.get_or_create()
+    current.analysis_history.append(("user", "x" * 1500))
+    current.analysis_history.append(("assistant", "ok"))
+    store.update_size(current)
+    assert old.session_id not in store
+    assert current.session_id in store
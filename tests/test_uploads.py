@@ -0,0 +1,63 @@
+import asyncio
+import io
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.api.middleware import RequestSizeLimitMiddleware
+from app.services.uploads import StoredUpload, UploadIndex, find_upload, save_upload
+
+
+def _upload(content: bytes, filename: str) -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename=filename)
+
+
+def test_same_content_with_another_suffix_is_stored_once(tmp_path):
+    first = asyncio.run(save_upload(_upload(b"resume text", "resume.txt"), tmp_path, max_bytes=1024))
+    second = asyncio.run(save_upload(_upload(b"resume text", "resume.tex"), tmp_path, max_bytes=1024))
+    assert second.deduplicated
+    assert second.path == first.path
+    assert [path.name for path in tmp_path.glob(f"{first.file_id}*")] == [first.path.name]
+    assert find_upload(tmp_path, first.file_id) == first.path
+
+
+def _limited_app() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RequestSizeLimitMiddleware, paths={"/upload"}, max_bytes=1024)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return TestClient(app)
+
+
+def test_oversized_request_is_rejected_before_parsing():
+    client = _limited_app()
+    response = client.post("/upload", files={"file": ("big.txt", b"x" * 4096)})
+    assert response.status_code == 413
+    assert client.post("/upload", files={"file": ("small.txt", b"x" * 100)}).json() == {"size": 100}
+
+
+def test_oversized_chunked_request_is_rejected():
+    client = _limited_app()
+
+    def chunks():
+        yield b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"big.txt\"\r\n\r\n"
+        for _ in range(8):
+            yield b"x" * 512
+        yield b"\r\n--b--\r\n"
+
+    response = client.post("/upload", content=chunks(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+
+
+def test_upload_index_shared_by_workers_keeps_every_entry(tmp_path):
+    worker_a, worker_b = UploadIndex(tmp_path), UploadIndex(tmp_path)
+    for index, worker in enumerate([worker_a, worker_b, worker_a]):
+        path = tmp_path / f"{index}.txt"
+        path.write_text(str(index))
+        worker.record(StoredUpload(file_id=str(index), filename=path.name, path=path, size=1))
+
+    assert [entry["file_id"] for entry in worker_b.entries()] == ["0", "1", "2"]
+    assert worker_b.latest() == tmp_path / "2.txt"
@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services import warmup
+from app.services.llm_handler import get_settings
+
+
+@pytest.fixture
+def fast_steps(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "warmup_llm", False)
+    monkeypatch.setattr(settings, "warmup_latex", True)
+    monkeypatch.setattr(warmup, "warm_template", lambda: "main.tex")
+    monkeypatch.setattr(warmup, "warm_agent", lambda: "agent built")
+    monkeypatch.setattr(warmup, "warm_tokenizer", lambda: "o200k_base")
+    monkeypatch.setattr(warmup, "warm_latex", lambda: warmup.Skipped("pdflatex not found"))
+    return settings
+
+
+def test_steps_report_done_skipped_and_failed(fast_steps, monkeypatch):
+    def broken():
+        raise RuntimeError("boom")
+    monkeypatch.setattr(warmup, "warm_agent", broken)
+
+    state = warmup.WarmupState()
+    asyncio.run(warmup.run_warmup(state))
+    steps = state.to_dict()["steps"]
+    assert state.ready
+    assert steps["template"]["status"] == warmup.DONE
+    assert (steps["latex"]["status"], steps["latex"]["detail"]) == (warmup.SKIPPED, "pdflatex not found")
+    assert steps["agent"]["status"] == warmup.FAILED and steps["agent"]["detail"] == "boom"
+
+
+def test_slow_step_times_out_but_reports_ready(fast_steps, monkeypatch):
+    monkeypatch.setattr(fast_steps, "warmup_timeout_seconds", 0.1)
+    monkeypatch.setattr(warmup, "warm_template", lambda: time.sleep(0.5) or "main.tex")
+
+    state = warmup.WarmupState()
+    asyncio.run(warmup.run_warmup(state))
+    assert state.ready
+    assert state.steps["template"].status == warmup.TIMED_OUT
+    assert state.steps["agent"].status == warmup.DONE
+
+
+def test_cancelled_warmup_marks_pending_steps(fast_steps, monkeypatch):
+    monkeypatch.setattr(warmup, "warm_template", lambda: time.sleep(0.5) or "main.tex")
+
+    async def cancel_early(state):
+        task = asyncio.create_task(warmup.run_warmup(state))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    state = warmup.WarmupState()
+    asyncio.run(cancel_early(state))
+    assert state.steps["template"].status == warmup.CANCELLED
+
+
+@pytest.mark.parametrize("template, expected_status, failed_steps", [
+    (lambda: "main.tex", "ready", 0),
+    (lambda: time.sleep(0.5) or "main.tex", "degraded", 1),
+])
+def test_timed_out_steps_degrade_readiness(fast_steps, monkeypatch, template, expected_status, failed_steps):
+    monkeypatch.setattr(fast_steps, "warmup_timeout_seconds", 0.1)
+    monkeypatch.setattr(warmup, "warm_template", template)
+
+    state = warmup.WarmupState()
+    assert state.status == "warming_up"
+    asyncio.run(warmup.run_warmup(state))
+    assert state.status == expected_status
+    assert state.stats()["failed_steps"] == failed_steps
+
+
+def test_every_step_failing_is_degraded_not_ready(fast_steps, monkeypatch):
+    def broken():
+        raise RuntimeError("boom")
+    for name in ("warm_template", "warm_agent", "warm_tokenizer", "warm_latex"):
+        monkeypatch.setattr(warmup, name, broken)
+
+    state = warmup.WarmupState()
+    asyncio.run(warmup.run_warmup(state))
+    body = state.to_dict()
+    assert (body["status"], body["failed_steps"], body["timed_out_steps"]) == ("degraded", 4, 0)
+    assert state.stats() == {"ready": 1, "degraded": 1, "failed_steps": 4}